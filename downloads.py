@@ -0,0 +1,59 @@
+"""
+Botones de descarga servidos por el gestor de archivos de Streamlit, compartidos por las
+aplicaciones del repositorio.
+
+Los archivos no se incrustan en la página como data URI en base64 (un tercio más grandes y
+reenviados en cada ejecución del script): Streamlit los sirve como binario por su propio
+endpoint. Cada botón acepta los bytes ya generados o una función sin argumentos que los
+genera; en ese caso solo se ejecuta cuando el usuario pulsa el botón, así que los archivos
+caros (exportaciones vectoriales, mallas 3D, ZIP) no se calculan si nadie los descarga.
+
+Las aplicaciones viven en subdirectorios del repositorio y añaden su raíz a `sys.path` para
+importar este módulo.
+"""
+import mimetypes
+
+import streamlit as st
+
+# Tipos MIME que `mimetypes` no conoce en todas las plataformas
+EXTRA_MIME_TYPES = {
+    ".3mf": "model/3mf",
+    ".stl": "model/stl",
+    ".yml": "application/x-yaml",
+    ".jsonl": "application/jsonl",
+}
+
+
+def guess_mime(file_name):
+    """Retorna el tipo MIME de un archivo según su extensión (binario genérico si no se conoce)."""
+    extension = "." + file_name.rsplit(".", 1)[-1].lower() if "." in file_name else ""
+    if extension in EXTRA_MIME_TYPES:
+        return EXTRA_MIME_TYPES[extension]
+    return mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+
+def download_button(label, data, file_name, mime=None, key=None, **kwargs):
+    """
+    Muestra un botón que descarga un archivo sin volver a ejecutar la aplicación.
+
+    Args:
+        label (str): Texto del botón.
+        data (bytes | callable): Contenido del archivo o función sin argumentos que lo genera
+            al pulsar el botón (se ejecuta fuera del script, así que no debe usar Streamlit).
+        file_name (str): Nombre con el que se descarga el archivo.
+        mime (str): Tipo MIME (por defecto, según la extensión de `file_name`).
+        key (str): Clave del widget (necesaria si hay varios botones con el mismo texto).
+        **kwargs: Otros argumentos de `st.download_button` (help, disabled, ...).
+
+    Returns:
+        bool: True en la ejecución en la que se pulsó el botón.
+    """
+    return st.download_button(
+        label=label,
+        data=data,
+        file_name=file_name,
+        mime=mime or guess_mime(file_name),
+        key=key,
+        on_click="ignore",
+        **kwargs
+    )
@@ -3,6 +3,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from asset_index import AssetIndex
+from data_loading import SUPPORTED_EXTENSIONS, InventoryError, content_hash, parse_inventory, read_local_inventory
+
 # Configuración de la página
 st.set_page_config(
     page_title="Análisis de Riesgos",
@@ -26,8 +29,69 @@ data = {
     'RT': [4, 3, 7, 3, 4, 6, 4, 7, 5, 4]
 }
 
-# Crear DataFrame
-df = pd.DataFrame(data)
+# Número de activos mostrados en la comparación cuando el inventario es grande
+MAX_CHART_ASSETS = 30
+
+# Opciones mostradas a la vez en el selector de activos (el buscador filtra el resto)
+MAX_SELECTOR_OPTIONS = 50
+
+
+@st.cache_data(max_entries=8, show_spinner="Analizando inventario...")
+def load_inventory(digest, file_name, _data):
+    """Analiza un inventario una sola vez por contenido (compartido entre ejecuciones y sesiones)."""
+    return parse_inventory(_data, file_name)
+
+
+@st.cache_resource(max_entries=8)
+def get_asset_index(dataset_key, _df):
+    """Construye el índice de activos una sola vez por inventario."""
+    return AssetIndex(_df)
+
+
+# Origen de los datos: ejemplo, archivo subido o ruta local
+st.sidebar.header("📂 Datos")
+source = st.sidebar.radio(
+    "Origen del inventario:",
+    ["Datos de ejemplo", "Subir archivo", "Ruta local"]
+)
+
+df = None
+dataset_key = "ejemplo"
+inventory_bytes = inventory_name = None
+if source == "Subir archivo":
+    uploaded_file = st.sidebar.file_uploader(
+        "Inventario (CSV, Excel o Parquet)",
+        type=[extension.lstrip(".") for extension in SUPPORTED_EXTENSIONS]
+    )
+    if uploaded_file is not None:
+        inventory_bytes, inventory_name = uploaded_file.getvalue(), uploaded_file.name
+elif source == "Ruta local":
+    local_path = st.sidebar.text_input("Ruta del archivo:")
+    if local_path:
+        try:
+            inventory_bytes, inventory_name = read_local_inventory(local_path)
+        except (InventoryError, OSError) as error:
+            st.sidebar.error(str(error))
+
+if inventory_bytes is not None:
+    try:
+        digest = content_hash(inventory_bytes)
+        df = load_inventory(digest, inventory_name, inventory_bytes)
+    except InventoryError as error:
+        st.sidebar.error(str(error))
+    else:
+        dataset_key = digest
+        st.sidebar.success(f"{len(df):,} activos cargados de {inventory_name}")
+
+if df is None:
+    if source != "Datos de ejemplo":
+        st.sidebar.info("Mientras tanto se muestran los datos de ejemplo.")
+    # Crear DataFrame
+    df = pd.DataFrame(data)
+
+if df.empty:
+    st.warning("El inventario no contiene activos.")
+    st.stop()
 
 # Título principal
 st.title("📊 Dashboard de Análisis de Riesgos")
@@ -47,7 +111,15 @@ Este dashboard muestra el análisis de riesgos para diferentes activos, consider
 col1, col2 = st.columns([2, 1])
 
 with col1:
-    st.subheader("Comparación de Todos los Activos")
+    # Con inventarios grandes solo se comparan los activos de mayor riesgo total
+    if len(df) > MAX_CHART_ASSETS:
+        st.subheader(f"Comparación de los {MAX_CHART_ASSETS} Activos de Mayor Riesgo")
+        st.caption(f"De {len(df):,} activos, ordenados por la suma de RD, RI, RC, RA y RT")
+        total_risk = df[['RD', 'RI', 'RC', 'RA', 'RT']].astype('Int16').sum(axis=1)
+        chart_df = df.loc[total_risk.nlargest(MAX_CHART_ASSETS).index]
+    else:
+        st.subheader("Comparación de Todos los Activos")
+        chart_df = df
     
     # Crear gráfico de barras agrupadas
     fig = go.Figure()
@@ -59,9 +131,9 @@ with col1:
     for risk, color in zip(risk_types, colors):
         fig.add_trace(go.Bar(
             name=risk,
-            x=df['Activo'],
-            y=df[risk],
-            text=df[risk],
+            x=chart_df['Activo'],
+            y=chart_df[risk],
+            text=chart_df[risk],
             textposition='auto',
             marker_color=color
         ))
@@ -83,51 +155,72 @@ with col1:
 with col2:
     st.subheader("Detalles por Activo")
     
-    # Selector de activo
-    selected_asset = st.selectbox(
-        "Selecciona un activo para ver sus detalles:",
-        df['Activo'].tolist(),
-        format_func=lambda x: f"{x} - {df[df['Activo']==x]['Nombre'].iloc[0]}"
-    )
-    
-    # Filtrar datos para el activo seleccionado
-    asset_data = df[df['Activo'] == selected_asset].iloc[0]
-    
-    # Crear gráfico de radar
-    fig_radar = go.Figure()
+    asset_index = get_asset_index(dataset_key, df)
+    if asset_index.duplicates:
+        st.caption(f"⚠️ {asset_index.duplicates} identificadores repetidos: se muestra su primera fila")
     
-    fig_radar.add_trace(go.Scatterpolar(
-        r=[asset_data['RD'], asset_data['RI'], asset_data['RC'], 
-        asset_data['RA'], asset_data['RT']],
-        theta=['RD', 'RI', 'RC', 'RA', 'RT'],
-        fill='toself',
-        name=asset_data['Activo']
-    ))
-    
-    fig_radar.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 10]
-            )),
-        showlegend=False,
-        height=400
+    # Buscador con filtrado por prefijo del ID o de cualquier palabra del nombre
+    search_text = st.text_input(
+        "🔎 Buscar activo (ID o nombre):",
+        placeholder="p. ej. HW01 o cisco"
     )
-    
-    st.plotly_chart(fig_radar, use_container_width=True)
-    
-    # Mostrar valores específicos
-    st.markdown("### Valores de Riesgo")
-    col_stats1, col_stats2 = st.columns(2)
-    
-    with col_stats1:
-        st.metric("Disponibilidad", asset_data['RD'])
-        st.metric("Integridad", asset_data['RI'])
-        st.metric("Confidencialidad", asset_data['RC'])
+    matches, more_matches = asset_index.search(search_text, MAX_SELECTOR_OPTIONS)
+    if not matches:
+        st.info("Ningún activo coincide con la búsqueda.")
+    else:
+        if more_matches:
+            st.caption(f"Se muestran las primeras {MAX_SELECTOR_OPTIONS} coincidencias de {len(asset_index):,} activos; escribe más para afinar.")
+        
+        # Selector de activo (las opciones son filas del inventario)
+        selected_position = st.selectbox(
+            "Selecciona un activo para ver sus detalles:",
+            matches,
+            format_func=asset_index.label
+        )
+        
+        # Fila del activo seleccionado; los riesgos sin valorar quedan como None (no son un 0)
+        asset_data = df.iloc[selected_position]
+        scores = {risk: None if pd.isna(asset_data[risk]) else int(asset_data[risk]) for risk in risk_types}
+        shown = {risk: "—" if score is None else score for risk, score in scores.items()}
+        
+        # Crear gráfico de radar
+        fig_radar = go.Figure()
+        
+        fig_radar.add_trace(go.Scatterpolar(
+            r=[scores['RD'], scores['RI'], scores['RC'], 
+            scores['RA'], scores['RT']],
+            theta=['RD', 'RI', 'RC', 'RA', 'RT'],
+            fill='toself',
+            name=asset_data['Activo']
+        ))
+        
+        fig_radar.update_layout(
+            polar=dict(
+                radialaxis=dict(
+                    visible=True,
+                    range=[0, 10]
+                )),
+            showlegend=False,
+            height=400
+        )
+        
+        st.plotly_chart(fig_radar, use_container_width=True)
+        unscored = [risk for risk, score in scores.items() if score is None]
+        if unscored:
+            st.caption(f"Sin valorar: {', '.join(unscored)} (no se dibujan en el radar)")
+        
+        # Mostrar valores específicos
+        st.markdown("### Valores de Riesgo")
+        col_stats1, col_stats2 = st.columns(2)
+        
+        with col_stats1:
+            st.metric("Disponibilidad", shown['RD'])
+            st.metric("Integridad", shown['RI'])
+            st.metric("Confidencialidad", shown['RC'])
         
-    with col_stats2:
-        st.metric("Autenticidad", asset_data['RA'])
-        st.metric("Trazabilidad", asset_data['RT'])
+        with col_stats2:
+            st.metric("Autenticidad", shown['RA'])
+            st.metric("Trazabilidad", shown['RT'])
 
 # Añadir footer
 st.markdown("---")
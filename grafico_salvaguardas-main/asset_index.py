@@ -0,0 +1,87 @@
+"""
+Índice de activos para el selector del dashboard.
+
+Se construye una sola vez por inventario y resuelve en tiempo constante el paso de
+identificador a fila y a etiqueta ("HW01 - Cisco Catalyst 9200"), sin recorrer el
+DataFrame por cada opción del selector. La búsqueda por prefijo (del identificador o del
+nombre desde cualquiera de sus palabras, así que "catalyst 9200" encuentra "Cisco Catalyst
+9200") usa bisección sobre una lista ordenada de claves, así que filtrar mientras se escribe
+cuesta O(log n + resultados) aunque haya decenas de miles de activos.
+"""
+import unicodedata
+from bisect import bisect_left
+
+from data_loading import ID_COLUMN, NAME_COLUMN
+
+
+def normalize_text(text):
+    """Normaliza un texto para buscarlo: sin tildes, en minúsculas y con los espacios reducidos a uno."""
+    decomposed = unicodedata.normalize("NFKD", " ".join(str(text).split()))
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+class AssetIndex:
+    """Identificadores, etiquetas y claves de búsqueda de los activos de un inventario."""
+
+    def __init__(self, df):
+        ids = df[ID_COLUMN].astype(str).tolist()
+        names = df[NAME_COLUMN].astype(str).tolist()
+        self.labels = [f"{asset_id} - {name}" for asset_id, name in zip(ids, names)]
+
+        # Con identificadores repetidos, cada uno apunta a su primera fila
+        self.positions = {}
+        for position, asset_id in enumerate(ids):
+            self.positions.setdefault(asset_id, position)
+        self.duplicates = len(ids) - len(self.positions)
+        self._unique_positions = list(self.positions.values())
+
+        # Claves (texto normalizado, fila): el identificador y el nombre desde cada una de sus
+        # palabras ("cisco catalyst 9200", "catalyst 9200", "9200"), para que un prefijo de
+        # varias palabras encuentre el nombre aunque no empiece por la primera
+        keys = set()
+        for position, (asset_id, name) in enumerate(zip(ids, names)):
+            if self.positions[asset_id] != position:
+                continue
+            keys.add((normalize_text(asset_id), position))
+            words = normalize_text(name).split(" ")
+            for start in range(len(words)):
+                keys.add((" ".join(words[start:]), position))
+        self._keys = sorted(keys)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def label(self, position):
+        """Retorna la etiqueta "ID - Nombre" de una fila."""
+        return self.labels[position]
+
+    def position(self, asset_id):
+        """Retorna la fila de un identificador, o None si no existe."""
+        return self.positions.get(asset_id)
+
+    def search(self, prefix, limit=50):
+        """
+        Busca activos cuyo identificador, o su nombre a partir de alguna palabra, empiece por el prefijo.
+
+        Args:
+            prefix (str): Texto escrito en el buscador (sin distinguir tildes, mayúsculas ni
+                espacios repetidos).
+            limit (int): Número máximo de resultados.
+
+        Returns:
+            tuple: (hasta `limit` filas encontradas, en orden del inventario; hay más resultados)
+        """
+        key = normalize_text(prefix)
+        if not key:
+            return self._unique_positions[:limit], len(self._unique_positions) > limit
+
+        # Las claves con el prefijo forman un tramo contiguo de la lista ordenada; la búsqueda
+        # se detiene en cuanto hay un resultado más del límite
+        found = set()
+        for text, position in self._keys[bisect_left(self._keys, (key,)):]:
+            if not text.startswith(key):
+                break
+            found.add(position)
+            if len(found) > limit:
+                break
+        return sorted(found)[:limit], len(found) > limit
@@ -0,0 +1,144 @@
+"""
+Carga del inventario de activos para el dashboard de riesgos.
+
+Acepta exportaciones CSV, Excel y Parquet con una fila por activo: el identificador
+(Activo), un nombre opcional (Nombre) y las puntuaciones RD, RI, RC, RA y RT de 0 a 10.
+
+Las columnas se leen con tipos explícitos y se guardan compactas (las puntuaciones en
+enteros de 8 bits tras comprobar su rango, los nombres repetidos como categorías), así que
+un inventario de decenas de miles de activos ocupa unos pocos MB. El análisis no depende de
+Streamlit: la aplicación lo cachea por el hash del contenido del archivo (`content_hash`).
+"""
+import hashlib
+import io
+import os
+
+import pandas as pd
+
+ID_COLUMN = "Activo"
+NAME_COLUMN = "Nombre"
+RISK_COLUMNS = ["RD", "RI", "RC", "RA", "RT"]
+RISK_RANGE = (0, 10)
+
+# Tipos al leer: enteros que admiten huecos, anchos para comprobar el rango antes de compactar
+# (leído directamente como UInt8, un 261 se convertiría en 5 sin ningún error)
+READ_DTYPES = {
+    ID_COLUMN: "string",
+    NAME_COLUMN: "string",
+    **{risk: "Int64" for risk in RISK_COLUMNS},
+}
+
+# Tipos finales: enteros sin signo de 8 bits para las puntuaciones (los nombres se convierten
+# después en categorías, porque suelen repetirse)
+COLUMN_DTYPES = {
+    ID_COLUMN: "string",
+    NAME_COLUMN: "string",
+    **{risk: "UInt8" for risk in RISK_COLUMNS},
+}
+
+SUPPORTED_EXTENSIONS = {
+    ".csv": "csv",
+    ".txt": "csv",
+    ".xlsx": "excel",
+    ".xls": "excel",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+
+class InventoryError(ValueError):
+    """El archivo no tiene el formato o las columnas esperadas."""
+
+
+def content_hash(data):
+    """Retorna el hash SHA-256 del contenido de un archivo (clave de la caché)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_format(file_name):
+    """Retorna el formato ("csv", "excel" o "parquet") según la extensión del archivo."""
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        supported = ", ".join(sorted(SUPPORTED_EXTENSIONS))
+        raise InventoryError(f"Formato no soportado: {extension or file_name} (usa {supported})")
+    return SUPPORTED_EXTENSIONS[extension]
+
+
+def _csv_separator(data):
+    """Detecta el separador del CSV: punto y coma en las exportaciones de Excel en español, coma si no."""
+    header = data[:4096].split(b"\n", 1)[0]
+    return ";" if header.count(b";") > header.count(b",") else ","
+
+
+def _read_columns(data, fmt):
+    """Lee solo las columnas del inventario, con sus tipos ya al analizar cuando el formato lo permite."""
+    wanted = lambda column: str(column).strip() in READ_DTYPES
+    if fmt == "csv":
+        return pd.read_csv(io.BytesIO(data), sep=_csv_separator(data), usecols=wanted, dtype=READ_DTYPES)
+    if fmt == "excel":
+        return pd.read_excel(io.BytesIO(data), usecols=wanted, dtype=READ_DTYPES)
+    # Parquet guarda el esquema aparte: se consulta para leer solo las columnas del inventario
+    import pyarrow.parquet as pq
+
+    columns = [name for name in pq.read_schema(io.BytesIO(data)).names if wanted(name)]
+    return pd.read_parquet(io.BytesIO(data), columns=columns)
+
+
+def parse_inventory(data, file_name):
+    """
+    Analiza un archivo de inventario y lo normaliza a tipos compactos.
+
+    Args:
+        data (bytes): Contenido del archivo.
+        file_name (str): Nombre del archivo (la extensión decide el formato).
+
+    Returns:
+        pd.DataFrame: Columnas Activo, Nombre, RD, RI, RC, RA y RT, con índice 0..n-1.
+
+    Raises:
+        InventoryError: Si el formato no es soportado, faltan columnas o hay valores fuera de rango.
+    """
+    fmt = file_format(file_name)
+    try:
+        df = _read_columns(data, fmt)
+    except (ValueError, TypeError, ImportError) as error:
+        raise InventoryError(f"No se pudo leer {file_name}: {error}") from error
+
+    df = df.rename(columns=lambda column: str(column).strip())
+    missing = [column for column in [ID_COLUMN, *RISK_COLUMNS] if column not in df.columns]
+    if missing:
+        raise InventoryError(f"Faltan columnas en {file_name}: {', '.join(missing)}")
+    if NAME_COLUMN not in df.columns:
+        df[NAME_COLUMN] = df[ID_COLUMN]
+
+    # Parquet trae sus propios tipos: se convierten aquí (en CSV y Excel ya vienen convertidos)
+    try:
+        df = df[[ID_COLUMN, NAME_COLUMN, *RISK_COLUMNS]].astype(READ_DTYPES)
+    except (ValueError, TypeError) as error:
+        raise InventoryError(f"Valores no válidos en {file_name}: {error}") from error
+
+    df = df.dropna(subset=[ID_COLUMN])
+    df[ID_COLUMN] = df[ID_COLUMN].str.strip()
+    df[NAME_COLUMN] = df[NAME_COLUMN].fillna(df[ID_COLUMN]).astype("category")
+    for risk in RISK_COLUMNS:
+        out_of_range = ~df[risk].between(*RISK_RANGE) & df[risk].notna()
+        if out_of_range.any():
+            raise InventoryError(
+                f"{risk} fuera del rango {RISK_RANGE[0]}-{RISK_RANGE[1]} en {int(out_of_range.sum())} activos"
+            )
+    return df.astype({risk: COLUMN_DTYPES[risk] for risk in RISK_COLUMNS}).reset_index(drop=True)
+
+
+def read_local_inventory(path):
+    """
+    Lee un inventario desde una ruta local.
+
+    Returns:
+        tuple: (contenido en bytes, nombre del archivo)
+    """
+    path = os.path.expanduser(path.strip())
+    if not os.path.isfile(path):
+        raise InventoryError(f"No existe el archivo: {path}")
+    file_format(path)
+    with open(path, "rb") as inventory_file:
+        return inventory_file.read(), os.path.basename(path)
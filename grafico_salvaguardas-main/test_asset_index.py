@@ -0,0 +1,78 @@
+"""
+Pruebas del índice de activos del selector: etiquetas, duplicados y búsqueda por prefijo.
+
+Uso:
+    python -m pytest test_asset_index.py
+"""
+import pandas as pd
+import pytest
+
+from asset_index import AssetIndex, normalize_text
+from data_loading import ID_COLUMN, NAME_COLUMN
+
+ASSETS = [
+    ("HW01", "Cisco Catalyst 9200"),
+    ("HW02", "Servidor de aplicaciones"),
+    ("SW01", "Gestión de  nóminas"),
+    ("HW01", "Duplicado del primero"),
+    ("NET7", "Catalyst 9300 core"),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return AssetIndex(pd.DataFrame(ASSETS, columns=[ID_COLUMN, NAME_COLUMN]))
+
+
+def test_labels_positions_and_duplicates(index):
+    assert len(index) == 4 and index.duplicates == 1
+    assert index.position("HW01") == 0 and index.position("NET7") == 4 and index.position("XX") is None
+    assert index.label(2) == "SW01 - Gestión de  nóminas"
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("", [0, 1, 2, 4]),
+    ("hw", [0, 1]),
+    ("HW01", [0]),
+    ("cisco", [0]),
+    ("catalyst", [0, 4]),
+    ("catalyst 9", [0, 4]),
+    # Varias palabras que no empiezan por la primera del nombre
+    ("catalyst 9200", [0]),
+    ("Catalyst  93", [4]),
+    ("9300 core", [4]),
+    ("cisco catalyst 9200", [0]),
+    ("de aplic", [1]),
+    # Sin distinguir tildes, mayúsculas ni espacios repetidos
+    ("gestion de nom", [2]),
+    ("NÓMINAS", [2]),
+    # Las palabras deben ser consecutivas y en orden
+    ("cisco 9200", []),
+    ("9200 catalyst", []),
+    ("duplicado", []),
+])
+def test_search(index, query, expected):
+    assert index.search(query) == (expected, False)
+
+
+def test_search_limit(index):
+    assert index.search("", limit=2) == ([0, 1], True)
+    assert index.search("catalyst", limit=1) == ([0], True)
+    assert index.search("catalyst", limit=2) == ([0, 4], False)
+
+
+def test_search_limit_on_large_inventory():
+    df = pd.DataFrame({
+        ID_COLUMN: [f"A{number:05d}" for number in range(20000)],
+        NAME_COLUMN: [f"Equipo {number % 7} planta {number % 3}" for number in range(20000)],
+    })
+    index = AssetIndex(df)
+    matches, more = index.search("3 planta 2", limit=50)
+    assert more and len(matches) == 50
+    assert all(df[NAME_COLUMN][position].endswith("3 planta 2") for position in matches)
+    # Los resultados se devuelven en orden del inventario
+    assert matches == sorted(matches)
+
+
+def test_normalize_text():
+    assert normalize_text("  Gestión   de\tNÓMINAS ") == "gestion de nominas"
@@ -0,0 +1,110 @@
+"""
+Pruebas de la carga del inventario: formatos, tipos compactos y errores.
+
+Uso:
+    python -m pytest test_data_loading.py
+"""
+import io
+
+import pandas as pd
+import pytest
+
+from data_loading import (
+    ID_COLUMN, NAME_COLUMN, RISK_COLUMNS, InventoryError, file_format, parse_inventory, read_local_inventory,
+)
+
+ROWS = [
+    {"Activo": "SRV-01", "Nombre": "Servidor web", "RD": 3, "RI": 5, "RC": 7, "RA": 2, "RT": 0},
+    {"Activo": "SW-02", "Nombre": "Switch Catalyst 9200", "RD": 10, "RI": None, "RC": 1, "RA": 4, "RT": 6},
+]
+
+
+def csv_bytes(rows=ROWS, sep=","):
+    return pd.DataFrame(rows).to_csv(index=False, sep=sep).encode("utf-8")
+
+
+def parquet_bytes(df):
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def check_inventory(df):
+    assert list(df.columns) == [ID_COLUMN, NAME_COLUMN, *RISK_COLUMNS]
+    assert list(df[ID_COLUMN]) == ["SRV-01", "SW-02"]
+    assert df[NAME_COLUMN].dtype == "category"
+    assert all(df[risk].dtype == "UInt8" for risk in RISK_COLUMNS)
+    assert df.loc[1, "RD"] == 10 and pd.isna(df.loc[1, "RI"])
+
+
+def test_csv_with_comma_and_semicolon():
+    check_inventory(parse_inventory(csv_bytes(), "inventario.csv"))
+    # Exportación de Excel en español: punto y coma, y columnas con espacios alrededor
+    data = csv_bytes(sep=";").replace(b"Activo;", b" Activo ;")
+    check_inventory(parse_inventory(data, "inventario.txt"))
+
+
+def test_extra_columns_are_ignored_and_name_is_optional():
+    rows = [{**row, "Propietario": "TI"} for row in ROWS]
+    check_inventory(parse_inventory(csv_bytes(rows), "inventario.csv"))
+    without_name = [{key: value for key, value in row.items() if key != NAME_COLUMN} for row in ROWS]
+    df = parse_inventory(csv_bytes(without_name), "inventario.csv")
+    assert list(df[NAME_COLUMN]) == list(df[ID_COLUMN])
+
+
+def test_excel():
+    buffer = io.BytesIO()
+    pd.DataFrame(ROWS).to_excel(buffer, index=False)
+    check_inventory(parse_inventory(buffer.getvalue(), "inventario.xlsx"))
+
+
+def test_parquet_types_are_cast():
+    # Parquet conserva sus tipos (int64, float64 con NaN, object): se convierten a los compactos
+    df = pd.DataFrame(ROWS)
+    df["Propietario"] = "TI"
+    check_inventory(parse_inventory(parquet_bytes(df), "inventario.parquet"))
+
+
+def test_parquet_invalid_values():
+    df = pd.DataFrame(ROWS)
+    df["RC"] = [2.5, 1.0]
+    with pytest.raises(InventoryError, match="Valores no válidos"):
+        parse_inventory(parquet_bytes(df), "inventario.pq")
+
+
+@pytest.mark.parametrize("value", [11, 261, 300, -1, -251])
+@pytest.mark.parametrize("fmt", ["csv", "xlsx", "parquet"])
+def test_out_of_range_scores(value, fmt):
+    # 261 y -251 son 5 módulo 256: no deben colarse como puntuaciones válidas
+    rows = [dict(ROWS[0], RT=value), ROWS[1]]
+    if fmt == "csv":
+        data = csv_bytes(rows)
+    elif fmt == "xlsx":
+        buffer = io.BytesIO()
+        pd.DataFrame(rows).to_excel(buffer, index=False)
+        data = buffer.getvalue()
+    else:
+        data = parquet_bytes(pd.DataFrame(rows))
+    with pytest.raises(InventoryError, match="RT fuera del rango 0-10 en 1 activos"):
+        parse_inventory(data, f"inventario.{fmt}")
+
+
+def test_missing_columns():
+    rows = [{key: value for key, value in row.items() if key not in ("RA", "RT")} for row in ROWS]
+    with pytest.raises(InventoryError, match="Faltan columnas en inventario.csv: RA, RT"):
+        parse_inventory(csv_bytes(rows), "inventario.csv")
+
+
+def test_unsupported_or_unreadable_files(tmp_path):
+    with pytest.raises(InventoryError, match="Formato no soportado"):
+        file_format("inventario.json")
+    with pytest.raises(InventoryError, match="No se pudo leer"):
+        parse_inventory(b"no es parquet", "inventario.parquet")
+    with pytest.raises(InventoryError, match="No existe"):
+        read_local_inventory(str(tmp_path / "falta.csv"))
+
+    path = tmp_path / "inventario.csv"
+    path.write_bytes(csv_bytes())
+    data, file_name = read_local_inventory(f" {path} ")
+    assert file_name == "inventario.csv"
+    check_inventory(parse_inventory(data, file_name))
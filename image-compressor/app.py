@@ -4,13 +4,46 @@ import io
 from PIL import Image
 import base64
 import os
-from typing import List, Tuple, Dict
+import sys
+import zlib
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Tuple, Dict, Optional
 import time
+import numpy as np
 
-def compress_image(image: Image.Image, quality: int = 85, max_width: int = None, max_height: int = None) -> Tuple[io.BytesIO, int]:
-    """Comprime una imagen y retorna el buffer y el tamaño."""
-    output = io.BytesIO()
-    
+# Botones de descarga compartidos con las demás aplicaciones (en la raíz del repositorio)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from downloads import download_button
+
+# Espacio de búsqueda del modo PNG sin pérdida
+PNG_FILTERS = ("none", "sub", "up", "average", "paeth", "adaptive")
+PNG_ZLIB_LEVELS = (6, 9)
+PNG_ZLIB_STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED)
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Modos de 8 bits que el codificador propio representa sin pérdida (el resto, p. ej. 16 bits, lo escribe Pillow)
+PNG_LOSSLESS_MODES = ('1', 'L', 'LA', 'P', 'PA', 'RGB', 'RGBA')
+
+# Calidad automática: rango de búsqueda y resolución de la luma usada para medir
+AUTO_QUALITY_RANGE = (20, 95)
+METRIC_ANALYSIS_SIZE = 256
+SSIM_WINDOW = 7
+
+OUTPUT_FORMATS = {
+    'JPEG': ('.jpg', 'image/jpeg'),
+    'PNG': ('.png', 'image/png'),
+    'GIF': ('.gif', 'image/gif'),
+    'WEBP': ('.webp', 'image/webp'),
+    'BMP': ('.bmp', 'image/bmp'),
+    'TIFF': ('.tiff', 'image/tiff'),
+}
+
+def prepare_for_jpeg(image: Image.Image, max_width: int = None, max_height: int = None) -> Image.Image:
+    """Redimensiona y convierte una copia de la imagen a un modo compatible con JPEG."""
     # Crear una copia para no modificar la original
     img_copy = image.copy()
     
@@ -28,6 +61,13 @@ def compress_image(image: Image.Image, quality: int = 85, max_width: int = None,
         else:
             img_copy = img_copy.convert('RGB')
     
+    return img_copy
+
+def compress_image(image: Image.Image, quality: int = 85, max_width: int = None, max_height: int = None) -> Tuple[io.BytesIO, int]:
+    """Comprime una imagen y retorna el buffer y el tamaño."""
+    output = io.BytesIO()
+    img_copy = prepare_for_jpeg(image, max_width, max_height)
+    
     # Comprimir la imagen
     img_copy.save(output, format='JPEG', quality=quality, optimize=True)
     output.seek(0)
@@ -35,7 +75,245 @@ def compress_image(image: Image.Image, quality: int = 85, max_width: int = None,
     size = len(output.getvalue())
     return output, size
 
-def extract_images_from_zip(zip_file) -> Dict[str, Tuple[Image.Image, int]]:
+def _analysis_luma(image: Image.Image) -> np.ndarray:
+    """Retorna la luma de la imagen reducida a METRIC_ANALYSIS_SIZE como array float."""
+    luma = image.convert('L')
+    luma.thumbnail((METRIC_ANALYSIS_SIZE, METRIC_ANALYSIS_SIZE), Image.Resampling.BOX)
+    return np.asarray(luma, dtype=np.float64)
+
+def _box_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Media en ventanas window x window (modo 'valid') usando una imagen integral."""
+    integral = np.pad(values, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    sums = (integral[window:, window:] - integral[:-window, window:]
+            - integral[window:, :-window] + integral[:-window, :-window])
+    return sums / (window * window)
+
+def compute_ssim(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """SSIM medio entre dos lumas del mismo tamaño, con ventana uniforme y vectorizado."""
+    window = min(SSIM_WINDOW, *reference.shape)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mu_x, mu_y = _box_mean(reference, window), _box_mean(candidate, window)
+    var_x = _box_mean(reference * reference, window) - mu_x * mu_x
+    var_y = _box_mean(candidate * candidate, window) - mu_y * mu_y
+    cov_xy = _box_mean(reference * candidate, window) - mu_x * mu_y
+    ssim_map = ((2 * mu_x * mu_y + c1) * (2 * cov_xy + c2)) / ((mu_x ** 2 + mu_y ** 2 + c1) * (var_x + var_y + c2))
+    return float(ssim_map.mean())
+
+def compute_psnr(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """PSNR en dB entre dos lumas del mismo tamaño."""
+    mse = np.mean((reference - candidate) ** 2)
+    return float('inf') if mse == 0 else float(10 * np.log10(255 ** 2 / mse))
+
+def compress_image_auto(image: Image.Image, threshold: float, metric: str = "SSIM",
+                        max_width: int = None, max_height: int = None) -> Tuple[io.BytesIO, int, int, float]:
+    """
+    Busca la calidad JPEG más baja cuya métrica perceptual no baje del umbral.
+
+    Retorna el buffer, el tamaño, la calidad elegida y el valor de la métrica. Si ninguna
+    calidad del rango alcanza el umbral se usa la máxima.
+    """
+    img_copy = prepare_for_jpeg(image, max_width, max_height)
+    reference = _analysis_luma(img_copy)
+    measure = compute_ssim if metric == "SSIM" else compute_psnr
+
+    def encode(quality: int) -> Tuple[io.BytesIO, float]:
+        output = io.BytesIO()
+        img_copy.save(output, format='JPEG', quality=quality, optimize=True)
+        output.seek(0)
+        candidate = _analysis_luma(Image.open(io.BytesIO(output.getvalue())))
+        return output, measure(reference, candidate)
+
+    # Búsqueda binaria: la métrica crece de forma prácticamente monótona con la calidad
+    low, high = AUTO_QUALITY_RANGE
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        output, score = encode(quality)
+        if score >= threshold:
+            best = (output, quality, score)
+            high = quality - 1
+        else:
+            low = quality + 1
+
+    if best is None:
+        quality = AUTO_QUALITY_RANGE[1]
+        output, score = encode(quality)
+        best = (output, quality, score)
+
+    output, quality, score = best
+    return output, len(output.getvalue()), quality, score
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Serializa un chunk PNG con su longitud y CRC."""
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+def _filter_scanlines(raw: np.ndarray, bpp: int, method: str) -> bytes:
+    """Aplica un filtro PNG a todas las filas a la vez y antepone el byte de tipo de filtro."""
+    height = raw.shape[0]
+    left = np.zeros_like(raw)
+    left[:, bpp:] = raw[:, :-bpp]
+    up = np.zeros_like(raw)
+    up[1:] = raw[:-1]
+
+    def paeth() -> np.ndarray:
+        upleft = np.zeros_like(raw)
+        upleft[1:, bpp:] = raw[:-1, :-bpp]
+        a, b, c = left.astype(np.int16), up.astype(np.int16), upleft.astype(np.int16)
+        p = a + b - c
+        pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+        predictor = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+        return raw - predictor.astype(np.uint8)
+
+    filters = {
+        "none": lambda: raw,
+        "sub": lambda: raw - left,
+        "up": lambda: raw - up,
+        "average": lambda: raw - ((left.astype(np.uint16) + up) >> 1).astype(np.uint8),
+        "paeth": paeth,
+    }
+
+    if method == "adaptive":
+        # Heurística estándar: por cada fila, el filtro con menor suma de valores absolutos
+        candidates = np.stack([build() for build in filters.values()])
+        scores = np.abs(candidates.view(np.int8).astype(np.int32)).sum(axis=2)
+        filter_types = scores.argmin(axis=0).astype(np.uint8)
+        filtered = candidates[filter_types, np.arange(height)]
+    else:
+        filter_types = np.full(height, list(filters).index(method), dtype=np.uint8)
+        filtered = filters[method]()
+
+    return np.concatenate([filter_types[:, None], filtered], axis=1).tobytes()
+
+def _pack_indices(indices: np.ndarray, bit_depth: int) -> np.ndarray:
+    """Empaqueta índices de paleta en filas de 1, 2 o 4 bits por píxel."""
+    if bit_depth == 8:
+        return indices
+    per_byte = 8 // bit_depth
+    height, width = indices.shape
+    padded = np.zeros((height, -(-width // per_byte) * per_byte), dtype=np.uint8)
+    padded[:, :width] = indices
+    groups = padded.reshape(height, -1, per_byte)
+    shifts = np.arange(8 - bit_depth, -1, -bit_depth, dtype=np.uint8)
+    return np.bitwise_or.reduce(groups << shifts, axis=2).astype(np.uint8)
+
+def _png_candidates(image: Image.Image) -> List[Tuple[bytes, np.ndarray, int]]:
+    """
+    Prepara las representaciones sin pérdida de una imagen para el codificador PNG.
+
+    Retorna una lista de (cabecera, filas_crudas, bytes_por_pixel). Siempre incluye la
+    representación directa y, si la imagen tiene 256 colores o menos, también una paletizada.
+    Retorna una lista vacía para los modos fuera de PNG_LOSSLESS_MODES.
+    """
+    if image.mode not in PNG_LOSSLESS_MODES:
+        return []
+    # La transparencia por color clave (tRNS en L, RGB y P) se convierte en canal alfa
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+    if image.mode == 'L' and has_alpha:
+        image = image.convert('LA')
+    elif image.mode not in ('L', 'LA'):
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    pixels = np.asarray(image)
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    # Descartar canales redundantes: alfa totalmente opaco y RGB en escala de grises
+    if pixels.shape[2] in (2, 4) and (pixels[:, :, -1] == 255).all():
+        pixels = pixels[:, :, :-1]
+    if pixels.shape[2] in (3, 4) and (pixels[:, :, 0] == pixels[:, :, 1]).all() and (pixels[:, :, 1] == pixels[:, :, 2]).all():
+        pixels = pixels[:, :, [0] + ([3] if pixels.shape[2] == 4 else [])]
+
+    height, width, channels = pixels.shape
+    color_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    candidates = [(PNG_SIGNATURE + _png_chunk(b"IHDR", ihdr), pixels.reshape(height, -1), channels)]
+
+    if image.getcolors(256) is not None:
+        keys = np.zeros((height, width), dtype=np.uint32)
+        for channel in range(channels):
+            keys |= pixels[:, :, channel].astype(np.uint32) << (8 * channel)
+        palette_keys, indices = np.unique(keys, return_inverse=True)
+        entries = ((palette_keys[:, None] >> (8 * np.arange(channels, dtype=np.uint32))) & 0xFF).astype(np.uint8)
+
+        if channels <= 2:
+            plte = np.repeat(entries[:, :1], 3, axis=1)
+        else:
+            plte = entries[:, :3]
+        bit_depth = next(depth for depth in (1, 2, 4, 8) if len(palette_keys) <= 2 ** depth)
+        ihdr = struct.pack(">IIBBBBB", width, height, bit_depth, 3, 0, 0, 0)
+        header = PNG_SIGNATURE + _png_chunk(b"IHDR", ihdr) + _png_chunk(b"PLTE", plte.tobytes())
+        if channels in (2, 4):
+            header += _png_chunk(b"tRNS", entries[:, -1].tobytes())
+
+        packed = _pack_indices(indices.reshape(height, width).astype(np.uint8), bit_depth)
+        candidates.append((header, packed, 1))
+
+    return candidates
+
+def _encode_png_candidate(header: bytes, raw: np.ndarray, bpp: int, method: str) -> bytes:
+    """Filtra una representación y la comprime con cada nivel y estrategia zlib, quedándose con la menor."""
+    filtered = _filter_scanlines(raw, bpp, method)
+    best = None
+    for level in PNG_ZLIB_LEVELS:
+        for strategy in PNG_ZLIB_STRATEGIES:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+            idat = compressor.compress(filtered) + compressor.flush()
+            if best is None or len(idat) < len(best):
+                best = idat
+    return header + _png_chunk(b"IDAT", best) + _png_chunk(b"IEND", b"")
+
+def _decodes_to(data: bytes, reference: Image.Image) -> bool:
+    """Comprueba que un PNG codificado se decodifica exactamente en los píxeles de la referencia."""
+    with Image.open(io.BytesIO(data)) as decoded:
+        return np.array_equal(np.asarray(decoded.convert('RGBA')), np.asarray(reference.convert('RGBA')))
+
+def _pillow_png(image: Image.Image) -> bytes:
+    """Codifica con Pillow, que conserva los 16 bits; los modos que PNG no admite (CMYK, F...) pasan a RGB."""
+    buffer = io.BytesIO()
+    try:
+        image.save(buffer, format='PNG', optimize=True)
+    except OSError:
+        buffer = io.BytesIO()
+        image.convert('RGBA' if 'A' in image.getbands() else 'RGB').save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+def optimize_png(image: Image.Image, max_width: int = None, max_height: int = None,
+                 original_data: Optional[bytes] = None) -> Tuple[io.BytesIO, int]:
+    """
+    Optimiza una imagen como PNG sin pérdida y retorna el buffer y el tamaño.
+
+    Busca en paralelo entre la representación directa y la paletizada, los filtros PNG y los
+    niveles/estrategias de zlib, y conserva el resultado más pequeño cuyos píxeles decodificados
+    coinciden con los de la imagen. Las imágenes de 16 bits y otros modos sin representación de
+    8 bits las codifica Pillow. Si no se redimensiona y el resultado no mejora al archivo
+    original, se devuelve el original sin cambios.
+    """
+    img_copy = image.copy()
+
+    if max_width or max_height:
+        img_copy.thumbnail((max_width or img_copy.width, max_height or img_copy.height), Image.Resampling.LANCZOS)
+
+    jobs = [(header, raw, bpp, method)
+            for header, raw, bpp in _png_candidates(img_copy)
+            for method in PNG_FILTERS]
+    results = []
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(lambda job: _encode_png_candidate(*job), jobs))
+    data = next((result for result in sorted(results, key=len) if _decodes_to(result, img_copy)), None)
+    if data is None:
+        data = _pillow_png(img_copy)
+
+    if original_data is not None and img_copy.size == image.size and len(original_data) <= len(data):
+        data = original_data
+
+    return io.BytesIO(data), len(data)
+
+def get_output_format(buffer: io.BytesIO) -> Tuple[str, str]:
+    """Retorna la extensión y el tipo MIME de una imagen ya codificada."""
+    with Image.open(io.BytesIO(buffer.getvalue())) as img:
+        return OUTPUT_FORMATS.get(img.format, ('.jpg', 'image/jpeg'))
+
+def extract_images_from_zip(zip_file) -> Dict[str, Tuple[Image.Image, int, bytes]]:
     """Extrae imágenes de un archivo ZIP."""
     images = {}
     supported_formats = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp', '.gif')
@@ -49,7 +327,7 @@ def extract_images_from_zip(zip_file) -> Dict[str, Tuple[Image.Image, int]]:
                             image_data = img_file.read()
                             image = Image.open(io.BytesIO(image_data))
                             original_size = len(image_data)
-                            images[file_info.filename] = (image, original_size)
+                            images[file_info.filename] = (image, original_size, image_data)
                     except Exception as e:
                         st.warning(f"No se pudo cargar la imagen {file_info.filename}: {str(e)}")
     except Exception as e:
@@ -72,9 +350,10 @@ def create_zip_download(compressed_images: Dict[str, io.BytesIO]) -> bytes:
     
     with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zip_file:
         for filename, image_buffer in compressed_images.items():
-            # Cambiar extensión a .jpg para las imágenes comprimidas
+            # Usar la extensión del formato realmente generado
             base_name = os.path.splitext(filename)[0]
-            new_filename = f"{base_name}_compressed.jpg"
+            extension, _ = get_output_format(image_buffer)
+            new_filename = f"{base_name}_compressed{extension}"
             zip_file.writestr(new_filename, image_buffer.getvalue())
     
     zip_buffer.seek(0)
@@ -111,17 +390,46 @@ def main():
         st.session_state.compressed_images = {}
     if 'compression_settings' not in st.session_state:
         st.session_state.compression_settings = {}
+    if 'auto_quality_report' not in st.session_state:
+        st.session_state.auto_quality_report = {}
     
     # Sidebar para configuración
     st.sidebar.header("⚙️ Configuración de Compresión")
     
-    # Configuración de calidad con descripción
-    quality = st.sidebar.slider(
-        "Calidad de Compresión", 
-        1, 100, 85, 
-        help="Ajusta la calidad de la imagen comprimida"
+    # Formato de salida
+    output_format = st.sidebar.radio(
+        "Formato de salida",
+        ["JPEG (con pérdida)", "PNG sin pérdida"],
+        help="PNG sin pérdida es ideal para capturas de pantalla, diagramas y dibujos lineales"
     )
-    st.sidebar.caption(f"📊 {get_quality_description(quality)}")
+    lossless = output_format == "PNG sin pérdida"
+    
+    # Configuración de calidad con descripción
+    if lossless:
+        quality = None
+        st.sidebar.caption("📊 Se prueban paleta, filtros PNG y niveles zlib, y se conserva el archivo más pequeño")
+    else:
+        quality = st.sidebar.slider(
+            "Calidad de Compresión", 
+            1, 100, 85, 
+            help="Ajusta la calidad de la imagen comprimida"
+        )
+        st.sidebar.caption(f"📊 {get_quality_description(quality)}")
+    
+    # Calidad automática por imagen
+    auto_quality = False
+    if not lossless:
+        auto_quality = st.sidebar.checkbox(
+            "🎯 Calidad automática (perceptual)",
+            help="Elige por imagen la calidad más baja que mantiene la métrica perceptual sobre el umbral. "
+                 "La calidad del control deslizante se usa como referencia para calcular el ahorro."
+        )
+        if auto_quality:
+            metric = st.sidebar.radio("Métrica", ["SSIM", "PSNR"], horizontal=True)
+            if metric == "SSIM":
+                threshold = st.sidebar.slider("Umbral SSIM mínimo", 0.900, 0.999, 0.980, step=0.001, format="%.3f")
+            else:
+                threshold = st.sidebar.slider("Umbral PSNR mínimo (dB)", 25.0, 50.0, 38.0, step=0.5)
     
     # Configuración de redimensionamiento
     st.sidebar.subheader("📏 Redimensionamiento (opcional)")
@@ -140,7 +448,12 @@ def main():
     # Información de configuración actual
     st.sidebar.markdown("---")
     st.sidebar.subheader("📋 Configuración Actual")
-    st.sidebar.write(f"**Calidad:** {quality}%")
+    if lossless:
+        st.sidebar.write("**Formato:** PNG sin pérdida")
+    elif auto_quality:
+        st.sidebar.write(f"**Calidad:** automática ({metric} ≥ {threshold:g}, referencia {quality}%)")
+    else:
+        st.sidebar.write(f"**Calidad:** {quality}%")
     if resize_enabled:
         st.sidebar.write(f"**Redimensionar:** {max_width}x{max_height}px")
     else:
@@ -177,8 +490,8 @@ def main():
                 # Resetear el puntero del archivo
                 uploaded_file.seek(0)
                 image = Image.open(uploaded_file)
-                original_size = len(uploaded_file.getvalue())
-                current_images[uploaded_file.name] = (image, original_size)
+                original_data = uploaded_file.getvalue()
+                current_images[uploaded_file.name] = (image, len(original_data), original_data)
             except Exception as e:
                 st.error(f"Error al cargar {uploaded_file.name}: {str(e)}")
     
@@ -199,6 +512,39 @@ def main():
         st.session_state.images_data = current_images
         # Limpiar imágenes comprimidas si se cargan nuevas imágenes
         st.session_state.compressed_images = {}
+        st.session_state.auto_quality_report = {}
+    
+    def fixed_quality_size(filename: str, entry: Dict) -> int:
+        """Tamaño de la imagen a la calidad fija del informe, codificada la primera vez que se pide."""
+        if entry['fixed_size'] is None:
+            image = st.session_state.images_data[filename][0]
+            _, entry['fixed_size'] = compress_image(image, entry['fixed_quality'], *entry['resize'])
+        return entry['fixed_size']
+    
+    def compress_entry(filename: str, image: Image.Image, original_data: bytes) -> None:
+        """Comprime una imagen con la configuración actual y guarda el resultado en la sesión."""
+        width = max_width if resize_enabled else None
+        height = max_height if resize_enabled else None
+        st.session_state.auto_quality_report.pop(filename, None)
+        if lossless:
+            compressed_buffer, _ = optimize_png(image, width, height, original_data)
+        elif auto_quality:
+            compressed_buffer, compressed_size, chosen_quality, score = compress_image_auto(
+                image, threshold, metric, width, height
+            )
+            # La comparación con la calidad fija se codifica solo si se pide en el resumen
+            st.session_state.auto_quality_report[filename] = {
+                'quality': chosen_quality,
+                'metric': metric,
+                'score': score,
+                'size': compressed_size,
+                'fixed_quality': quality,
+                'resize': (width, height),
+                'fixed_size': None,
+            }
+        else:
+            compressed_buffer, _ = compress_image(image, quality, width, height)
+        st.session_state.compressed_images[filename] = compressed_buffer
     
     if st.session_state.images_data:
         st.header("🖼️ Imágenes Cargadas")
@@ -212,13 +558,10 @@ def main():
                 status_text = st.empty()
                 total_images = len(st.session_state.images_data)
                 
-                for i, (filename, (image, original_size)) in enumerate(st.session_state.images_data.items()):
+                for i, (filename, (image, original_size, original_data)) in enumerate(st.session_state.images_data.items()):
                     status_text.text(f"Comprimiendo {filename}...")
                     try:
-                        compressed_buffer, compressed_size = compress_image(
-                            image, quality, max_width if resize_enabled else None, max_height if resize_enabled else None
-                        )
-                        st.session_state.compressed_images[filename] = compressed_buffer
+                        compress_entry(filename, image, original_data)
                         progress_bar.progress((i + 1) / total_images)
                     except Exception as e:
                         st.error(f"Error al comprimir {filename}: {str(e)}")
@@ -232,27 +575,25 @@ def main():
         with col2:
             if st.button("🗑️ Limpiar Comprimidas", use_container_width=True):
                 st.session_state.compressed_images = {}
+                st.session_state.auto_quality_report = {}
                 st.success("✅ Se limpiaron las imágenes comprimidas!")
                 st.rerun()
         
         with col3:
             if st.session_state.compressed_images:
-                try:
-                    zip_data = create_zip_download(st.session_state.compressed_images)
-                    st.download_button(
-                        label="📦 Descargar ZIP",
-                        data=zip_data,
-                        file_name="imagenes_comprimidas.zip",
-                        mime="application/zip",
-                        use_container_width=True
-                    )
-                except Exception as e:
-                    st.error(f"Error al crear ZIP: {str(e)}")
+                # El ZIP se crea al pulsar el botón, no en cada ejecución
+                download_button(
+                    "📦 Descargar ZIP",
+                    partial(create_zip_download, dict(st.session_state.compressed_images)),
+                    "imagenes_comprimidas.zip",
+                    "application/zip",
+                    use_container_width=True
+                )
         
         st.markdown("---")
         
         # Mostrar información de las imágenes en una tabla más organizada
-        for i, (filename, (image, original_size)) in enumerate(st.session_state.images_data.items()):
+        for i, (filename, (image, original_size, original_data)) in enumerate(st.session_state.images_data.items()):
             with st.expander(f"📸 {filename} ({format_file_size(original_size)})", expanded=False):
                 col1, col2, col3 = st.columns([1, 2, 1])
                 
@@ -277,16 +618,16 @@ def main():
                         compressed_size = len(st.session_state.compressed_images[filename].getvalue())
                         reduction = ((original_size - compressed_size) / original_size) * 100
                         st.success(f"✅ **Comprimida:** {format_file_size(compressed_size)} (-{reduction:.1f}%)")
+                        if filename in st.session_state.auto_quality_report:
+                            report = st.session_state.auto_quality_report[filename]
+                            st.write(f"**🎯 Calidad automática:** {report['quality']}% ({report['metric']} {report['score']:.3f})")
                 
                 with col3:
                     # Botón de compresión individual
                     if st.button(f"🔄 Comprimir", key=f"compress_{i}"):
                         with st.spinner("Comprimiendo..."):
                             try:
-                                compressed_buffer, compressed_size = compress_image(
-                                    image, quality, max_width if resize_enabled else None, max_height if resize_enabled else None
-                                )
-                                st.session_state.compressed_images[filename] = compressed_buffer
+                                compress_entry(filename, image, original_data)
                                 st.rerun()
                             except Exception as e:
                                 st.error(f"Error al comprimir: {str(e)}")
@@ -295,13 +636,14 @@ def main():
                     if filename in st.session_state.compressed_images:
                         compressed_buffer = st.session_state.compressed_images[filename]
                         base_name = os.path.splitext(filename)[0]
-                        download_filename = f"{base_name}_compressed.jpg"
+                        extension, mime = get_output_format(compressed_buffer)
+                        download_filename = f"{base_name}_compressed{extension}"
                         
-                        st.download_button(
-                            label="⬇️ Descargar",
-                            data=compressed_buffer.getvalue(),
-                            file_name=download_filename,
-                            mime="image/jpeg",
+                        download_button(
+                            "⬇️ Descargar",
+                            compressed_buffer.getvalue,
+                            download_filename,
+                            mime,
                             key=f"download_{i}",
                             use_container_width=True
                         )
@@ -311,7 +653,7 @@ def main():
             st.markdown("---")
             st.header("📊 Resumen de Compresión")
             
-            total_original = sum(original_size for filename, (_, original_size) in st.session_state.images_data.items() 
+            total_original = sum(original_size for filename, (_, original_size, _) in st.session_state.images_data.items() 
                             if filename in st.session_state.compressed_images)
             total_compressed = sum(len(buffer.getvalue()) for buffer in st.session_state.compressed_images.values())
             total_reduction = ((total_original - total_compressed) / total_original) * 100 if total_original > 0 else 0
@@ -329,7 +671,39 @@ def main():
             
             with col4:
                 st.metric("💾 Reducción Total", f"{total_reduction:.1f}%", delta=f"-{format_file_size(total_original - total_compressed)}")
-        
+
+            # Detalle de la calidad automática (y, si se pide, frente a la calidad fija)
+            if st.session_state.auto_quality_report:
+                st.subheader("🎯 Calidad Automática por Imagen")
+                report = st.session_state.auto_quality_report
+                compare_fixed = st.checkbox(
+                    "Comparar con la calidad fija",
+                    help="Codifica cada imagen otra vez a la calidad del control deslizante para calcular el ahorro"
+                )
+                rows = []
+                for filename, entry in report.items():
+                    row = {
+                        "Imagen": filename,
+                        "Calidad elegida": f"{entry['quality']}%",
+                        "Métrica": f"{entry['metric']} {entry['score']:.3f}",
+                        "Tamaño automático": format_file_size(entry['size']),
+                    }
+                    if compare_fixed:
+                        fixed_size = fixed_quality_size(filename, entry)
+                        row["Tamaño calidad fija"] = format_file_size(fixed_size)
+                        row["Ahorro"] = ("-" if fixed_size < entry['size'] else "") + format_file_size(abs(fixed_size - entry['size']))
+                    rows.append(row)
+                st.dataframe(rows, use_container_width=True, hide_index=True)
+                
+                if compare_fixed:
+                    total_fixed = sum(entry['fixed_size'] for entry in report.values())
+                    total_auto = sum(entry['size'] for entry in report.values())
+                    st.metric(
+                        "💾 Ahorro frente a la calidad fija",
+                        ("-" if total_fixed < total_auto else "") + format_file_size(abs(total_fixed - total_auto)),
+                        delta=f"{((total_fixed - total_auto) / total_fixed) * 100 if total_fixed > 0 else 0:.1f}%"
+                    )
+
     else:
         # Página de inicio con información
         st.info("👆 Sube archivos de imagen o un archivo ZIP para comenzar.")
@@ -340,7 +714,7 @@ def main():
             ### 🎯 **Cómo usar esta aplicación:**
             
             1. **📁 Cargar archivos**: Sube imágenes individuales o un archivo ZIP
-            2. **⚙️ Configurar compresión**: Ajusta la calidad y redimensionamiento en la barra lateral
+            2. **⚙️ Configurar compresión**: Elige el formato de salida y ajusta la calidad y redimensionamiento en la barra lateral
             3. **🔄 Comprimir**: Comprime imágenes individualmente o todas a la vez
             4. **⬇️ Descargar**: Descarga imágenes comprimidas individualmente o en un ZIP
             
@@ -352,6 +726,7 @@ def main():
             - **Calidad 85-95%**: Para fotos de alta calidad
             - **Calidad 70-85%**: Balance entre calidad y tamaño
             - **Calidad 50-70%**: Para imágenes web o previsualizaciones
+            - **PNG sin pérdida**: Para capturas de pantalla, diagramas y dibujos lineales; nunca devuelve un archivo mayor que el original
             - **Redimensionar**: Útil para reducir el tamaño de imágenes muy grandes
             
             ### 🔒 **Privacidad:**
@@ -2,9 +2,17 @@ import streamlit as st
 import zipfile
 from PIL import Image
 import io
-import base64
+from functools import partial
 from typing import List, Tuple, Dict
 import os
+import sys
+
+# Botones de descarga compartidos con las demás aplicaciones (en la raíz del repositorio)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from downloads import download_button
 
 # Configuración de la página
 st.set_page_config(
@@ -84,21 +92,6 @@ def extract_images_from_zip(zip_file) -> Dict[str, Image.Image]:
     
     return images
 
-def create_download_link(img_data: bytes, filename: str) -> str:
-    """
-    Crea un enlace de descarga para una imagen.
-    
-    Args:
-        img_data: Datos de la imagen en bytes
-        filename: Nombre del archivo
-        
-    Returns:
-        HTML con enlace de descarga
-    """
-    b64 = base64.b64encode(img_data).decode()
-    href = f'<a href="data:image/png;base64,{b64}" download="{filename}">📥 Descargar {filename}</a>'
-    return href
-
 def create_zip_download(images_data: Dict[str, bytes]) -> bytes:
     """
     Crea un archivo ZIP con múltiples imágenes.
@@ -240,19 +233,12 @@ if st.session_state.processed_images:
             # Botón de descarga individual
             if filename in st.session_state.images_data:
                 img_data = st.session_state.images_data[filename]
-                b64 = base64.b64encode(img_data).decode()
                 
                 # Crear nombre de archivo para descarga
                 name_without_ext = os.path.splitext(filename)[0]
                 download_filename = f"{name_without_ext}_480px.png"
                 
-                st.download_button(
-                    label="📥 Descargar imagen",
-                    data=img_data,
-                    file_name=download_filename,
-                    mime="image/png",
-                    key=f"download_{idx}"
-                )
+                download_button("📥 Descargar imagen", img_data, download_filename, "image/png", key=f"download_{idx}")
             
             st.markdown("---")
     
@@ -260,23 +246,19 @@ if st.session_state.processed_images:
     if len(st.session_state.images_data) > 1:
         st.markdown("### 📦 Descarga masiva")
         
-        if st.button("🗜️ Preparar ZIP con todas las imágenes"):
-            with st.spinner("Creando archivo ZIP..."):
-                # Preparar datos para ZIP con nombres modificados
-                zip_data = {}
-                for filename, img_data in st.session_state.images_data.items():
-                    name_without_ext = os.path.splitext(filename)[0]
-                    new_filename = f"{name_without_ext}_480px.png"
-                    zip_data[new_filename] = img_data
-                
-                zip_bytes = create_zip_download(zip_data)
-                
-                st.download_button(
-                    label="📥 Descargar ZIP con todas las imágenes",
-                    data=zip_bytes,
-                    file_name="imagenes_redimensionadas_480px.zip",
-                    mime="application/zip"
-                )
+        # Preparar datos para ZIP con nombres modificados (el ZIP se crea al pulsar el botón)
+        zip_data = {}
+        for filename, img_data in st.session_state.images_data.items():
+            name_without_ext = os.path.splitext(filename)[0]
+            new_filename = f"{name_without_ext}_480px.png"
+            zip_data[new_filename] = img_data
+        
+        download_button(
+            "📥 Descargar ZIP con todas las imágenes",
+            partial(create_zip_download, zip_data),
+            "imagenes_redimensionadas_480px.zip",
+            "application/zip"
+        )
         
         st.info("💡 **Tip:** Puedes descargar cada imagen individualmente o todas juntas en un archivo ZIP.")
 
@@ -0,0 +1,260 @@
+"""
+Servicio HTTP local de imágenes de símbolos químicos y marcadores RA.
+
+Sirve las mismas imágenes que las aplicaciones de Streamlit para incrustarlas en otras
+páginas, sin descargarlas a mano:
+
+    /symbol/Fe.png?v=1&size=256&number=1        Símbolo (PNG, SVG o PDF; también /symbol/26.png)
+    /marker/qr/26.png?v=2&symbol=1&number=1     Marcador RA (estilos qr, tradicional y familia)
+
+Cada URL lleva obligatoriamente la versión del generador que la produce (`v`, igual a
+VERSION_RENDERIZADO para los símbolos y a MARKER_GENERATOR_VERSION para los marcadores), así
+que su contenido no cambia nunca y se envía con un ETag fuerte (hash del contenido) y
+cabeceras de caché inmutable: el navegador o una CDN delante del servicio absorben casi
+todas las peticiones, y las revalidaciones con If-None-Match se responden con 304 sin
+cuerpo. Al cambiar un generador cambian sus URL y las de versiones anteriores responden 404,
+en lugar de servir imágenes nuevas bajo una URL que las cachés ya dieron por definitiva.
+Los bytes codificados se guardan en una caché LRU del proceso, además de las cachés propias
+de cada generador.
+
+Uso:
+    python image_service.py --port 8765
+"""
+import argparse
+import hashlib
+import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+for app_dir in ("simbolos-quimicos", "marcadores-ra-tp"):
+    if os.path.join(REPO_ROOT, app_dir) not in sys.path:
+        sys.path.append(os.path.join(REPO_ROOT, app_dir))
+
+from periodic_table import element_by_number, lookup
+from renderizado import ESTILO_PREDETERMINADO, ESTILOS, VERSION_RENDERIZADO, obtener_png
+from vectorial import exportar_vectorial
+from marker_cache import get_marker_png
+from marker_generator import MARKER_GENERATOR_VERSION, MARKER_STYLE_TRADITIONAL, MARKER_STYLES
+
+RESPONSE_CACHE_SIZE = 4096
+
+# Un año: cada URL incluye la versión de su generador (v), así que su contenido no cambia
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+SYMBOL_FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+SYMBOL_SIZE_RANGE = (16, 2048)
+SYMBOL_SIZE_DEFAULT = 400
+SYMBOL_SIZE_MM_RANGE = (5.0, 2000.0)
+
+# Respuesta ya codificada: cuerpo, tipo MIME y ETag
+Response = namedtuple("Response", ["body", "content_type", "etag"])
+
+
+class RequestError(ValueError):
+    """Petición inválida; `status` es el código HTTP que se devuelve."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def make_response(body, content_type):
+    """Envuelve un cuerpo con su ETag fuerte (hash SHA-256 truncado del contenido)."""
+    return Response(body, content_type, '"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+
+
+def _flag(query, name, default):
+    value = query.get(name, [None])[-1]
+    if value is None:
+        return default
+    if value.lower() in ("1", "true", "si", "sí", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise RequestError(HTTPStatus.BAD_REQUEST, f"Valor no válido para {name}: {value}")
+
+
+def _number(query, name, default, minimum, maximum, kind=int):
+    value = query.get(name, [None])[-1]
+    if value is None:
+        return default
+    try:
+        number = kind(value)
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"Valor no válido para {name}: {value}") from None
+    if not minimum <= number <= maximum:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"{name} debe estar entre {minimum} y {maximum}")
+    return number
+
+
+def _check_version(query, current):
+    value = query.get("v", [None])[-1]
+    if value is None:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"Falta el parámetro v (versión actual: {current})")
+    if value != str(current):
+        raise RequestError(HTTPStatus.NOT_FOUND, f"Versión no disponible: {value} (versión actual: {current})")
+
+
+def _split_name(segment):
+    if "." not in segment:
+        raise RequestError(HTTPStatus.NOT_FOUND, "Falta la extensión del archivo")
+    return segment.rsplit(".", 1)
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def symbol_response(atomic_number, fmt, size, show_number, style, size_mm):
+    """Genera (o recupera de la caché) la respuesta de un símbolo con parámetros ya normalizados."""
+    symbol, _, _ = element_by_number(atomic_number)
+    number = atomic_number if show_number else None
+    if fmt == "png":
+        body = obtener_png(symbol, number, show_number, size, style)
+    else:
+        body = exportar_vectorial(fmt, symbol, number, show_number, style, size_mm)
+    return make_response(body, SYMBOL_FORMATS[fmt])
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def marker_response(style, atomic_number, show_symbol, show_atomic_number, symbol_size):
+    """Genera (o recupera de la caché) la respuesta de un marcador con parámetros ya normalizados."""
+    body = get_marker_png(style, atomic_number, show_symbol, show_atomic_number, symbol_size)
+    return make_response(body, "image/png")
+
+
+def resolve(path, query):
+    """
+    Resuelve una ruta del servicio en su respuesta.
+
+    Args:
+        path (str): Ruta de la URL, p. ej. "/symbol/Fe.png" (con `v` en los parámetros).
+        query (dict): Parámetros de la URL, como los devuelve `parse_qs`.
+
+    Returns:
+        Response: Cuerpo, tipo MIME y ETag.
+
+    Raises:
+        RequestError: Si la ruta no existe o los parámetros no son válidos.
+    """
+    parts = [part for part in path.split("/") if part]
+    if len(parts) == 2 and parts[0] == "symbol":
+        _check_version(query, VERSION_RENDERIZADO)
+        name, fmt = _split_name(parts[1])
+        if fmt not in SYMBOL_FORMATS:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Formato no soportado: {fmt}")
+        element = lookup(name)
+        if element is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Elemento desconocido: {name}")
+        style = query.get("style", [ESTILO_PREDETERMINADO])[-1]
+        if style not in ESTILOS:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Estilo desconocido: {style}")
+        # Los parámetros que no afectan al formato se fijan para no duplicar entradas en la caché
+        size = _number(query, "size", SYMBOL_SIZE_DEFAULT, *SYMBOL_SIZE_RANGE) if fmt == "png" else None
+        size_mm = _number(query, "mm", 100.0, *SYMBOL_SIZE_MM_RANGE, kind=float) if fmt != "png" else None
+        return symbol_response(element.atomic_number, fmt, size, _flag(query, "number", False), style, size_mm)
+
+    if len(parts) == 3 and parts[0] == "marker":
+        _check_version(query, MARKER_GENERATOR_VERSION)
+        style = parts[1]
+        if style not in MARKER_STYLES:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Estilo de marcador desconocido: {style}")
+        name, fmt = _split_name(parts[2])
+        if fmt != "png":
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Formato no soportado: {fmt}")
+        element = lookup(name)
+        if element is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Elemento desconocido: {name}")
+        show_symbol = _flag(query, "symbol", True)
+        symbol_size = _number(query, "symbol_size", 2, 2, 4)
+        if style != MARKER_STYLE_TRADITIONAL or not show_symbol:
+            symbol_size = 2
+        return marker_response(style, element.atomic_number, show_symbol, _flag(query, "number", True), symbol_size)
+
+    raise RequestError(HTTPStatus.NOT_FOUND, f"Ruta desconocida: {path}")
+
+
+class ImageRequestHandler(BaseHTTPRequestHandler):
+    """Atiende GET y HEAD con ETag fuerte, caché inmutable y respuestas 304."""
+
+    server_version = "ImageService/1.0"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        url = urlsplit(self.path)
+        try:
+            # Nombres con tildes llegan codificados: /symbol/Hidr%C3%B3geno.png
+            response = resolve(unquote(url.path), parse_qs(url.query))
+        except RequestError as error:
+            self._send_error(error.status, str(error), send_body)
+            return
+        except Exception as error:
+            # Un fallo del generador no debe cortar la conexión ni quedar en ninguna caché
+            self.log_error("Error al generar %s: %r", self.path, error)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Error interno al generar la imagen", send_body)
+            return
+
+        if_none_match = self.headers.get("If-None-Match", "")
+        if response.etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(response)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self._send_cache_headers(response)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(response.body)
+
+    def _send_cache_headers(self, response):
+        self.send_header("ETag", response.etag)
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+    def _send_error(self, status, message, send_body):
+        body = (message + "\n").encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+def make_server(host="127.0.0.1", port=8765):
+    """Crea el servidor HTTP (un hilo por conexión) sin arrancarlo."""
+    return ThreadingHTTPServer((host, port), ImageRequestHandler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de símbolos químicos y marcadores RA.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port)
+    print(
+        f"Sirviendo en http://{args.host}:{args.port}/symbol/Fe.png?v={VERSION_RENDERIZADO} "
+        f"y /marker/qr/26.png?v={MARKER_GENERATOR_VERSION}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,153 @@
+"""
+Generación masiva de marcadores RA con manifiesto para bases de datos de targets.
+
+Los marcadores se renderizan en paralelo en un pool de procesos y se escriben en el ZIP
+a medida que llegan, junto con un manifiesto JSON y CSV.
+"""
+import csv
+import io
+import json
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from PIL import Image
+
+# El perfil PNG se comparte con las demás aplicaciones desde la raíz del repositorio
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from marker_family import aruco_dictionary_bytes
+from marker_generator import MARKER_STYLE_FAMILY, MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL, ElementARMarkerGenerator
+from png_profile import encode_png
+
+MANIFEST_FIELDS = [
+    "file", "symbol", "name", "atomic_number", "style", "seeds", "show_symbol",
+    "show_atomic_number", "symbol_size", "aruco_id", "width_px", "width_mm", "height_mm", "dpi"
+]
+
+# Diccionario ArUco incluido en el ZIP de la familia
+ARUCO_DICTIONARY_FILENAME = "familia_aruco.yml"
+
+# Generador propio de cada proceso del pool
+_generator = None
+
+
+def _get_generator():
+    """Retorna el generador del proceso actual, creándolo la primera vez."""
+    global _generator
+    if _generator is None:
+        _generator = ElementARMarkerGenerator()
+    return _generator
+
+
+def marker_filename(style, atomic_number, symbol, symbol_size=2):
+    """
+    Retorna un nombre de archivo predecible para el marcador de un elemento.
+    
+    Args:
+        style (str): Estilo del marcador.
+        atomic_number (int): Número atómico del elemento.
+        symbol (str): Símbolo del elemento.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        
+    Returns:
+        str: Nombre del archivo PNG.
+    """
+    if style == MARKER_STYLE_QR:
+        return f"{atomic_number:03d}_{symbol}_QR_AR_OPTIMIZADO.png"
+    if style == MARKER_STYLE_FAMILY:
+        return f"{atomic_number:03d}_{symbol}_FAMILIA_ARUCO.png"
+    return f"{atomic_number:03d}_{symbol}_TRADICIONAL_{symbol_size}x{symbol_size}.png"
+
+
+def render_marker_png(task):
+    """
+    Renderiza un marcador y lo codifica como PNG (función de trabajo del pool).
+    
+    Args:
+        task (tuple): (estilo, número atómico, mostrar símbolo, mostrar número, tamaño del símbolo, dpi).
+        
+    Returns:
+        bytes: PNG del marcador con la resolución física incrustada.
+    """
+    style, atomic_number, show_symbol, show_atomic_number, symbol_size, dpi = task
+    marker = _get_generator().generate_marker(
+        style, atomic_number, show_symbol=show_symbol,
+        show_atomic_number=show_atomic_number, symbol_size=symbol_size
+    )
+    return encode_png(Image.fromarray(marker), dpi=dpi)
+
+
+def build_marker_zip(output, atomic_numbers, style, show_symbol=True, show_atomic_number=True,
+                     symbol_size=2, physical_size_mm=50.0, max_workers=None, progress=None):
+    """
+    Genera los marcadores de varios elementos y los escribe en un ZIP con su manifiesto.
+    
+    Args:
+        output: Ruta o archivo binario donde escribir el ZIP.
+        atomic_numbers (list): Números atómicos a generar.
+        style (str): Estilo del marcador.
+        show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+        show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        physical_size_mm (float): Ancho impreso del marcador completo (con borde) en milímetros.
+        max_workers (int): Procesos del pool (por defecto, uno por núcleo).
+        progress (callable): Función opcional llamada con (generados, total).
+        
+    Returns:
+        list: Filas del manifiesto, una por marcador.
+    """
+    generator = _get_generator()
+    width_px = generator.marker_size + 2 * generator.border_size
+    dpi = round(width_px * 25.4 / physical_size_mm)
+    elements = [generator.get_element_by_atomic_number(number) for number in atomic_numbers]
+    tasks = [(style, number, show_symbol, show_atomic_number, symbol_size, dpi) for _, _, number in elements]
+    
+    manifest = []
+    with zipfile.ZipFile(output, "w") as zip_file, ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chunksize = max(1, len(tasks) // (4 * (max_workers or os.cpu_count() or 1)))
+        # Los PNG ya están comprimidos: se guardan sin volver a comprimir
+        for index, png_bytes in enumerate(executor.map(render_marker_png, tasks, chunksize=chunksize)):
+            symbol, name, atomic_number = elements[index]
+            filename = marker_filename(style, atomic_number, symbol, symbol_size)
+            zip_file.writestr(filename, png_bytes, compress_type=zipfile.ZIP_STORED)
+            manifest.append({
+                "file": filename,
+                "symbol": symbol,
+                "name": name,
+                "atomic_number": atomic_number,
+                "style": style,
+                "seeds": generator.get_seeds(style, atomic_number),
+                "show_symbol": show_symbol,
+                "show_atomic_number": show_atomic_number,
+                "symbol_size": symbol_size if style == MARKER_STYLE_TRADITIONAL else None,
+                "aruco_id": atomic_number - 1 if style == MARKER_STYLE_FAMILY else None,
+                "width_px": width_px,
+                "width_mm": physical_size_mm,
+                "height_mm": physical_size_mm,
+                "dpi": dpi,
+            })
+            if progress:
+                progress(index + 1, len(tasks))
+        
+        zip_file.writestr("manifest.json", json.dumps({
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "count": len(manifest),
+            "markers": manifest,
+        }, ensure_ascii=False, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+        
+        csv_buffer = io.StringIO()
+        writer = csv.DictWriter(csv_buffer, fieldnames=MANIFEST_FIELDS)
+        writer.writeheader()
+        for row in manifest:
+            writer.writerow({**row, "seeds": ";".join(str(seed) for seed in row["seeds"])})
+        zip_file.writestr("manifest.csv", csv_buffer.getvalue(), compress_type=zipfile.ZIP_DEFLATED)
+        
+        if style == MARKER_STYLE_FAMILY:
+            zip_file.writestr(ARUCO_DICTIONARY_FILENAME, aruco_dictionary_bytes(), compress_type=zipfile.ZIP_DEFLATED)
+    
+    return manifest
@@ -0,0 +1,145 @@
+"""
+Libro de códigos de los marcadores RA.
+
+Cada marcador queda descrito por completo por una pequeña matriz de celdas: 16x16 en el
+estilo QR y 8x8 en la familia ArUco (no dependen de las opciones de texto), y 8x8 en el estilo
+tradicional (depende de las áreas reservadas para el símbolo y el número atómico). Las matrices de los 118 elementos
+se calculan una sola vez, se guardan empaquetadas con `np.packbits` en `codebook.npz` y se
+cargan al importar, de modo que el renderizado parte de una consulta a una tabla y otras
+herramientas pueden reutilizar exactamente los mismos patrones.
+
+Para regenerar el archivo tras cambiar el algoritmo (y MARKER_GENERATOR_VERSION):
+
+    python codebook.py
+"""
+import os
+
+import numpy as np
+
+CODEBOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "codebook.npz")
+
+NUM_ELEMENTS = 118
+QR_GRID_SIZE = 16
+TRADITIONAL_GRID_SIZE = 8
+FAMILY_GRID_SIZE = 8
+
+# Tablas del archivo y lado de sus matrices
+GRID_SIZES = {"qr": QR_GRID_SIZE, "traditional": TRADITIONAL_GRID_SIZE, "family": FAMILY_GRID_SIZE}
+
+# Número de bits a 1 de cada valor de byte, para medir distancias entre matrices empaquetadas
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+# Combinaciones (mostrar símbolo, mostrar número, tamaño del símbolo) con matriz propia en el
+# estilo tradicional; el tamaño del símbolo no importa cuando el símbolo está oculto
+TRADITIONAL_VARIANTS = (
+    (False, False, 2),
+    (False, True, 2),
+    (True, False, 2),
+    (True, True, 2),
+    (True, False, 3),
+    (True, True, 3),
+    (True, False, 4),
+    (True, True, 4),
+)
+
+
+def traditional_variant_index(show_symbol, show_atomic_number, symbol_size):
+    """
+    Retorna la posición de unas opciones del estilo tradicional en TRADITIONAL_VARIANTS.
+
+    Args:
+        show_symbol (bool): Indica si se muestra el símbolo del elemento.
+        show_atomic_number (bool): Indica si se muestra el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (2, 3, o 4).
+
+    Returns:
+        int: Índice de la variante, o None si las opciones no están en el libro de códigos.
+    """
+    if not show_symbol:
+        symbol_size = 2
+    try:
+        return TRADITIONAL_VARIANTS.index((bool(show_symbol), bool(show_atomic_number), int(symbol_size)))
+    except ValueError:
+        return None
+
+
+def _unpack(packed, grid_size):
+    """Desempaqueta matrices guardadas con np.packbits a matrices booleanas grid[x][y]."""
+    bits = np.unpackbits(packed, axis=-1, count=grid_size * grid_size)
+    grids = bits.reshape(packed.shape[:-1] + (grid_size, grid_size)).astype(bool)
+    grids.setflags(write=False)  # Compartidas por todos los marcadores
+    return grids
+
+
+def load_codebook(version, path=CODEBOOK_PATH):
+    """
+    Carga el libro de códigos empaquetado.
+
+    Args:
+        version (int): Versión del algoritmo de generación esperada.
+        path (str): Ruta del archivo .npz.
+
+    Returns:
+        dict: Matrices booleanas 'qr' (118, 16, 16), 'traditional' (118, 8, 8, 8) y 'family'
+        (118, 8, 8), indexadas por número atómico - 1, o None si el archivo falta, es de otra
+        versión o le falta alguna tabla.
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        if int(data["version"]) != version or not set(GRID_SIZES) <= set(data.files):
+            return None
+        return {name: _unpack(data[name], grid_size) for name, grid_size in GRID_SIZES.items()}
+
+
+def build_codebook(path=CODEBOOK_PATH):
+    """
+    Calcula las matrices de todos los elementos y opciones y las guarda empaquetadas.
+
+    Antes comprueba que los marcadores de la familia se identifican con ArUco con cualquier
+    opción de texto (`check_family_decoding`).
+
+    Args:
+        path (str): Ruta del archivo .npz de salida.
+
+    Returns:
+        dict: Arrays empaquetados guardados ('version', 'qr', 'traditional' y 'family').
+
+    Raises:
+        ValueError: Si algún marcador de la familia no se identifica.
+    """
+    # Importación diferida: marker_generator y marker_family cargan este módulo al importarse
+    from marker_family import check_family_decoding
+    from marker_generator import MARKER_GENERATOR_VERSION, ElementARMarkerGenerator
+
+    # Ningún marcador de la familia se publica si el detector ArUco no lo identifica
+    failures = check_family_decoding()
+    if failures:
+        raise ValueError(f"{len(failures)} marcadores de la familia no se identifican con ArUco, p. ej. {failures[0]}")
+
+    generator = ElementARMarkerGenerator()
+    atomic_numbers = range(1, NUM_ELEMENTS + 1)
+
+    qr = np.stack([generator.generate_qr_grid(z).reshape(-1) for z in atomic_numbers])
+    traditional = np.stack([
+        np.stack([
+            generator.generate_element_grid(z, show_symbol, show_atomic_number, symbol_size).reshape(-1)
+            for show_symbol, show_atomic_number, symbol_size in TRADITIONAL_VARIANTS
+        ])
+        for z in atomic_numbers
+    ])
+    family = np.stack([generator.generate_family_grid(z).reshape(-1) for z in atomic_numbers])
+
+    arrays = {
+        "version": np.array(MARKER_GENERATOR_VERSION),
+        "qr": np.packbits(qr, axis=-1),
+        "traditional": np.packbits(traditional, axis=-1),
+        "family": np.packbits(family, axis=-1),
+    }
+    np.savez_compressed(path, **arrays)
+    return arrays
+
+
+if __name__ == "__main__":
+    arrays = build_codebook()
+    print(f"{CODEBOOK_PATH}: {os.path.getsize(CODEBOOK_PATH)} bytes, versión {int(arrays['version'])}")
@@ -0,0 +1,245 @@
+"""
+Banco de pruebas de riqueza de características de los marcadores RA.
+
+Vuforia califica los targets de imagen por la cantidad y el reparto de sus puntos
+característicos, y hasta ahora solo lo sabíamos después de subirlos. Este módulo puntúa
+todos los marcadores generados sin conexión con los detectores ORB y FAST de OpenCV:
+
+- Cuenta los puntos de cada marcador y qué fracción de una rejilla de SPREAD_GRID x SPREAD_GRID
+  regiones cubren (reparto).
+- Aplica transformaciones simuladas (perspectiva, desenfoque y ruido) con semilla fija y
+  empareja los descriptores ORB contra el marcador original, contando los emparejamientos
+  y los que son coherentes con la homografía real (inliers).
+- Mide la latencia de detección y de emparejamiento por marcador.
+
+Uso desde la línea de comandos (un informe CSV o JSON por elemento):
+
+    python feature_benchmark.py --style qr --output informe_qr.csv
+"""
+import argparse
+import csv
+import json
+import time
+
+import cv2
+import numpy as np
+
+from marker_generator import MARKER_STYLE_QR, MARKER_STYLES, ElementARMarkerGenerator
+
+ORB_FEATURES = 500
+SPREAD_GRID = 4
+BENCHMARK_SEED = 2024
+INLIER_TOLERANCE_PX = 3.0
+
+# Transformaciones simuladas: (nombre, desplazamiento de esquinas, sigma de desenfoque, sigma de ruido)
+TRANSFORMS = (
+    ("perspectiva", 0.12, 0.0, 0.0),
+    ("desenfoque", 0.0, 2.0, 0.0),
+    ("ruido", 0.0, 0.0, 12.0),
+    ("combinada", 0.08, 1.2, 8.0),
+)
+
+REPORT_FIELDS = [
+    "atomic_number", "symbol", "style", "orb_keypoints", "fast_keypoints", "spread",
+    "detect_ms", "match_ms", "min_inlier_ratio",
+] + [f"{name}_{metric}" for name, _, _, _ in TRANSFORMS for metric in ("matches", "inliers")]
+
+
+def keypoint_spread(keypoints, image_shape, grid=SPREAD_GRID):
+    """
+    Retorna la fracción de regiones de una rejilla grid x grid que contienen algún punto.
+
+    Args:
+        keypoints (list): Puntos característicos de OpenCV.
+        image_shape (tuple): Forma (alto, ancho) de la imagen.
+        grid (int): Regiones por lado.
+
+    Returns:
+        float: Fracción de regiones ocupadas (0 a 1).
+    """
+    if not keypoints:
+        return 0.0
+    height, width = image_shape[:2]
+    points = np.array([keypoint.pt for keypoint in keypoints])
+    cols = np.minimum((points[:, 0] * grid / width).astype(int), grid - 1)
+    rows = np.minimum((points[:, 1] * grid / height).astype(int), grid - 1)
+    return len(set(zip(rows.tolist(), cols.tolist()))) / (grid * grid)
+
+
+def simulate_view(image, rng, corner_shift=0.0, blur_sigma=0.0, noise_sigma=0.0):
+    """
+    Simula cómo ve la cámara un marcador impreso.
+
+    Args:
+        image (np.ndarray): Marcador en escala de grises.
+        rng (np.random.RandomState): Generador para la perspectiva y el ruido.
+        corner_shift (float): Desplazamiento máximo de cada esquina (fracción del lado).
+        blur_sigma (float): Sigma del desenfoque gaussiano (0 = sin desenfoque).
+        noise_sigma (float): Sigma del ruido gaussiano en niveles de gris (0 = sin ruido).
+
+    Returns:
+        tuple: (imagen transformada, homografía 3x3 del original a la vista).
+    """
+    height, width = image.shape[:2]
+    corners = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    shift = rng.uniform(-corner_shift, corner_shift, size=(4, 2)) * (width, height)
+    homography = cv2.getPerspectiveTransform(corners, np.float32(corners + shift))
+    view = cv2.warpPerspective(image, homography, (width, height), borderValue=255)
+
+    if blur_sigma > 0:
+        view = cv2.GaussianBlur(view, (0, 0), blur_sigma)
+    if noise_sigma > 0:
+        noise = rng.normal(0.0, noise_sigma, size=view.shape)
+        view = np.clip(view + noise, 0, 255).astype(np.uint8)
+    return view, homography
+
+
+def score_marker(image, orb=None, fast=None, matcher=None, seed=BENCHMARK_SEED):
+    """
+    Puntúa un marcador: puntos, reparto y emparejamientos bajo las transformaciones simuladas.
+
+    Args:
+        image (np.ndarray): Marcador en escala de grises.
+        orb, fast, matcher: Detectores y emparejador de OpenCV a reutilizar (opcionales).
+        seed (int): Semilla de las transformaciones (la misma para todos los marcadores).
+
+    Returns:
+        dict: Fila del informe sin los datos del elemento.
+    """
+    orb = orb or cv2.ORB_create(nfeatures=ORB_FEATURES)
+    fast = fast or cv2.FastFeatureDetector_create()
+    matcher = matcher or cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
+    rng = np.random.RandomState(seed)
+
+    start = time.perf_counter()
+    keypoints, descriptors = orb.detectAndCompute(image, None)
+    detect_times = [time.perf_counter() - start]
+    fast_keypoints = fast.detect(image, None)
+
+    row = {
+        "orb_keypoints": len(keypoints),
+        "fast_keypoints": len(fast_keypoints),
+        "spread": round(keypoint_spread(keypoints, image.shape), 3),
+    }
+    match_times = []
+    inlier_ratios = []
+    for name, corner_shift, blur_sigma, noise_sigma in TRANSFORMS:
+        view, homography = simulate_view(image, rng, corner_shift, blur_sigma, noise_sigma)
+
+        start = time.perf_counter()
+        view_keypoints, view_descriptors = orb.detectAndCompute(view, None)
+        detect_times.append(time.perf_counter() - start)
+
+        matches = []
+        if descriptors is not None and view_descriptors is not None:
+            start = time.perf_counter()
+            matches = matcher.match(descriptors, view_descriptors)
+            match_times.append(time.perf_counter() - start)
+
+        # Un emparejamiento es correcto si la homografía real lleva el punto a su pareja
+        inliers = 0
+        if matches:
+            source = np.float32([keypoints[match.queryIdx].pt for match in matches]).reshape(-1, 1, 2)
+            target = np.float32([view_keypoints[match.trainIdx].pt for match in matches]).reshape(-1, 2)
+            projected = cv2.perspectiveTransform(source, homography).reshape(-1, 2)
+            inliers = int(np.count_nonzero(np.linalg.norm(projected - target, axis=1) <= INLIER_TOLERANCE_PX))
+
+        row[f"{name}_matches"] = len(matches)
+        row[f"{name}_inliers"] = inliers
+        inlier_ratios.append(inliers / len(keypoints) if keypoints else 0.0)
+
+    row["detect_ms"] = round(1000 * float(np.mean(detect_times)), 3)
+    row["match_ms"] = round(1000 * float(np.mean(match_times)), 3) if match_times else None
+    row["min_inlier_ratio"] = round(min(inlier_ratios), 3)
+    return row
+
+
+def benchmark_markers(style, atomic_numbers=None, show_symbol=True, show_atomic_number=True,
+                      symbol_size=2, progress=None):
+    """
+    Puntúa los marcadores de varios elementos en un estilo.
+
+    Los detectores y el emparejador se crean una sola vez y todos los marcadores usan la
+    misma secuencia de transformaciones, así que las puntuaciones son comparables entre sí.
+
+    Args:
+        style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+        atomic_numbers (list): Números atómicos a puntuar (por defecto, los 118).
+        show_symbol (bool): Indica si se muestra el símbolo del elemento.
+        show_atomic_number (bool): Indica si se muestra el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        progress (callable): Función opcional llamada con (puntuados, total).
+
+    Returns:
+        list: Filas del informe (campos REPORT_FIELDS), una por elemento.
+
+    Raises:
+        ValueError: Si la lista de números atómicos está vacía o alguno está fuera de rango.
+    """
+    generator = ElementARMarkerGenerator()
+    if atomic_numbers is None:
+        atomic_numbers = [number for _, _, number in generator.elements]
+    if not atomic_numbers:
+        raise ValueError("No se indicó ningún número atómico")
+    invalid = [number for number in atomic_numbers if not 1 <= number <= len(generator.elements)]
+    if invalid:
+        raise ValueError(f"Número atómico fuera de rango (1-{len(generator.elements)}): {invalid[0]}")
+    orb = cv2.ORB_create(nfeatures=ORB_FEATURES)
+    fast = cv2.FastFeatureDetector_create()
+    matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
+
+    # Pasada de calentamiento: la primera detección incluye la inicialización de OpenCV
+    warmup = generator.generate_marker(style, atomic_numbers[0], show_symbol, show_atomic_number, symbol_size)
+    orb.detectAndCompute(warmup, None)
+
+    report = []
+    for index, atomic_number in enumerate(atomic_numbers):
+        symbol, _, _ = generator.get_element_by_atomic_number(atomic_number)
+        marker = generator.generate_marker(
+            style, atomic_number, show_symbol=show_symbol,
+            show_atomic_number=show_atomic_number, symbol_size=symbol_size
+        )
+        row = {"atomic_number": atomic_number, "symbol": symbol, "style": style}
+        row.update(score_marker(marker, orb=orb, fast=fast, matcher=matcher))
+        report.append(row)
+        if progress:
+            progress(index + 1, len(atomic_numbers))
+    return report
+
+
+def write_report(report, path):
+    """Guarda el informe como CSV o JSON según la extensión del archivo."""
+    if path.endswith(".json"):
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, ensure_ascii=False, indent=2)
+        return
+    with open(path, "w", newline="", encoding="utf-8") as report_file:
+        writer = csv.DictWriter(report_file, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Puntúa la riqueza de características de los marcadores RA.")
+    parser.add_argument("--style", choices=MARKER_STYLES, default=MARKER_STYLE_QR)
+    parser.add_argument("--elements", type=int, nargs="*", help="Números atómicos (por defecto, los 118)")
+    parser.add_argument("--hide-symbol", action="store_true")
+    parser.add_argument("--hide-number", action="store_true")
+    parser.add_argument("--symbol-size", type=int, choices=(2, 3, 4), default=2)
+    parser.add_argument("--output", default="informe_caracteristicas.csv", help="Archivo .csv o .json")
+    args = parser.parse_args()
+
+    try:
+        report = benchmark_markers(
+            args.style, atomic_numbers=args.elements, show_symbol=not args.hide_symbol,
+            show_atomic_number=not args.hide_number, symbol_size=args.symbol_size
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    write_report(report, args.output)
+
+    weakest = sorted(report, key=lambda row: (row["min_inlier_ratio"], row["orb_keypoints"]))[:5]
+    print(f"{args.output}: {len(report)} marcadores")
+    for row in weakest:
+        print(f"  {row['symbol']} ({row['atomic_number']}): {row['orb_keypoints']} puntos ORB, "
+              f"reparto {row['spread']:.2f}, inliers mínimos {row['min_inlier_ratio']:.2f}")
@@ -0,0 +1,164 @@
+"""
+Atlas de fuentes y glifos para los textos de los marcadores RA.
+
+Cada fuente se carga una sola vez por proceso y tamaño. Para cada texto que realmente se
+dibuja (símbolo o número atómico en su área reservada) el ajuste de tamaño a la caja y la
+posición se calculan una vez, y el texto se rasteriza una sola vez como un recorte en escala
+de grises que después se compone sobre el marcador con NumPy. Para la exportación vectorial
+el mismo texto se puede rasterizar a mayor escala con `text_mask`.
+"""
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_PATHS = (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "font", "OpenSans-Bold.ttf"),
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+)
+
+# Pasadas de dibujo desplazadas un píxel usadas para engrosar el texto (estilo tradicional)
+BOLD_PASSES = ((-1, -1), (-1, 0), (0, -1), (0, 0))
+SINGLE_PASS = ((0, 0),)
+
+_measure = ImageDraw.Draw(Image.new("L", (1, 1)))
+
+
+@lru_cache(maxsize=None)
+def load_font(size):
+    """
+    Carga la fuente de los marcadores en el tamaño indicado, una sola vez por proceso.
+    
+    Args:
+        size (int): Tamaño de la fuente en píxeles.
+        
+    Returns:
+        ImageFont: OpenSans Bold, DejaVu Sans Bold o la fuente por defecto, en ese orden.
+    """
+    for font_path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except IOError:
+            continue
+    return ImageFont.load_default()
+
+
+# Texto a dibujar en un área reservada del marcador y sus parámetros de ajuste y posición
+TextSpec = namedtuple(
+    "TextSpec",
+    ["text", "box_x0", "box_y0", "box_size", "font_size", "fit_margin", "center_on_bbox", "y_adjust", "passes"],
+    defaults=(False, 0, SINGLE_PASS),
+)
+
+
+@lru_cache(maxsize=4096)
+def text_position(spec):
+    """
+    Ajusta el tamaño de la fuente a la caja y calcula la posición del texto.
+    
+    Args:
+        spec (TextSpec): Texto, caja (x0, y0, lado), tamaño inicial de la fuente, margen
+            horizontal (si el texto no cabe se reduce la fuente), centrado vertical con la caja
+            real del texto (center_on_bbox), desplazamiento vertical y pasadas de dibujo.
+        
+    Returns:
+        tuple: (x, y, tamaño de la fuente) con la posición de dibujo en píxeles del marcador.
+    """
+    font_size = spec.font_size
+    font = load_font(font_size)
+    text_width = _measure.textlength(spec.text, font=font)
+    
+    # Ajustar tamaño si es necesario
+    if text_width > (spec.box_size - spec.fit_margin):
+        scaling_factor = (spec.box_size - spec.fit_margin) / text_width
+        font_size = int(font_size * scaling_factor)
+        font = load_font(font_size)
+        text_width = _measure.textlength(spec.text, font=font)
+    
+    text_x = spec.box_x0 + (spec.box_size - text_width) / 2
+    if spec.center_on_bbox:
+        # Centrar con la altura real del texto compensando la línea base
+        bbox = _measure.textbbox((0, 0), spec.text, font=font)
+        text_y = spec.box_y0 + (spec.box_size - (bbox[3] - bbox[1])) / 2 - bbox[1] + spec.y_adjust
+    else:
+        text_y = spec.box_y0 + (spec.box_size - font_size) / 2 + spec.y_adjust
+    return text_x, text_y, font_size
+
+
+def _rasterize_text(spec, canvas_size, scale=1):
+    """Dibuja el texto en su zona del marcador (escalado) y retorna el recorte con tinta."""
+    text_x, text_y, font_size = text_position(spec)
+    font = load_font(font_size) if scale == 1 else load_font(round(font_size * scale))
+    
+    # Lienzo limitado a la caja con un margen de una caja por lado; su origen es entero, así
+    # que el texto conserva el mismo posicionamiento subpíxel que en el marcador completo
+    left = max(0, spec.box_x0 - spec.box_size) * scale
+    top = max(0, spec.box_y0 - spec.box_size) * scale
+    right = min(canvas_size, spec.box_x0 + 2 * spec.box_size) * scale
+    bottom = min(canvas_size, spec.box_y0 + 2 * spec.box_size) * scale
+    canvas = Image.new("L", (right - left, bottom - top), color=255)
+    draw = ImageDraw.Draw(canvas)
+    for offset_x, offset_y in spec.passes:
+        draw.text(
+            ((text_x + offset_x) * scale - left, (text_y + offset_y) * scale - top), spec.text, fill=0, font=font
+        )
+    
+    # Guardar solo el recorte con tinta
+    pixels = np.asarray(canvas)
+    rows = np.flatnonzero((pixels < 255).any(axis=1))
+    cols = np.flatnonzero((pixels < 255).any(axis=0))
+    if rows.size == 0:
+        return 0, 0, np.full((0, 0), 255, dtype=np.uint8)
+    
+    crop = pixels[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1].copy()
+    crop.flags.writeable = False
+    return top + int(rows[0]), left + int(cols[0]), crop
+
+
+@lru_cache(maxsize=4096)
+def text_stamp(spec, canvas_size):
+    """
+    Rasteriza un texto como un recorte reutilizable, en su posición dentro del marcador.
+    
+    Args:
+        spec (TextSpec): Texto y parámetros de posición.
+        canvas_size (int): Lado de la imagen del marcador.
+        
+    Returns:
+        tuple: (y0, x0, recorte) con el recorte en uint8 (255 = sin texto).
+    """
+    return _rasterize_text(spec, canvas_size)
+
+
+def text_mask(spec, canvas_size, scale):
+    """
+    Rasteriza un texto `scale` veces más grande que en el marcador (para vectorizarlo).
+    
+    Args:
+        spec (TextSpec): Texto y parámetros de posición.
+        canvas_size (int): Lado de la imagen del marcador sin escalar.
+        scale (int): Factor de escala entero.
+        
+    Returns:
+        tuple: (y0, x0, máscara) en píxeles escalados, con la máscara booleana (True = tinta).
+    """
+    y0, x0, crop = _rasterize_text(spec, canvas_size, scale)
+    return y0, x0, crop < 128
+
+
+def composite_stamp(marker, stamp):
+    """
+    Compone un recorte de texto negro sobre el marcador, en el sitio.
+    
+    El marcador solo tiene píxeles blancos o negros bajo el texto, así que mezclar tinta
+    negra equivale a quedarse con el mínimo entre el marcador y el recorte.
+    
+    Args:
+        marker (np.ndarray): Imagen del marcador en escala de grises (se modifica).
+        stamp (tuple): Resultado de `text_stamp`.
+    """
+    y0, x0, crop = stamp
+    region = marker[y0:y0 + crop.shape[0], x0:x0 + crop.shape[1]]
+    np.minimum(region, crop, out=region)
@@ -0,0 +1,118 @@
+"""
+Análisis de distinción entre marcadores RA.
+
+Calcula la matriz de distancias de Hamming entre las matrices de celdas visibles de todos los
+elementos de un estilo. La distancia es invariante a rotaciones y reflejos: para cada par se
+toma la mínima entre un marcador y las 8 transformaciones del otro (4 giros x espejo), porque
+una cámara puede ver el marcador impreso en cualquier orientación o desde el reverso. En la
+familia ArUco solo se consideran las 4 rotaciones, que son las que compara su detector.
+
+Las matrices se empaquetan con `np.packbits` y se comparan con XOR y un conteo de bits por
+tabla, por lo que la comparación completa 118 x 118 x 8 tarda unos milisegundos.
+
+Uso desde la línea de comandos (muestra los pares más cercanos de cada estilo):
+
+    python marker_analysis.py
+"""
+import numpy as np
+
+from codebook import POPCOUNT
+from marker_generator import MARKER_STYLE_FAMILY, MARKER_STYLES, ElementARMarkerGenerator
+
+
+def dihedral_variants(grids, mirror=True):
+    """
+    Retorna las 8 orientaciones (4 rotaciones de la matriz y de su reflejo) de cada matriz.
+
+    Args:
+        grids (np.ndarray): Matrices booleanas cuadradas con forma (N, n, n).
+        mirror (bool): Si es False, solo se retornan las 4 rotaciones.
+
+    Returns:
+        np.ndarray: Orientaciones con forma (N, 8, n, n) o (N, 4, n, n); la posición 0 es la original.
+    """
+    variants = []
+    for oriented in (grids, grids[..., ::-1]) if mirror else (grids,):
+        for turns in range(4):
+            variants.append(np.rot90(oriented, turns, axes=(-2, -1)))
+    return np.stack(variants, axis=1)
+
+
+def hamming_distance_matrix(grids, mirror=True):
+    """
+    Calcula la distancia de Hamming invariante a rotaciones y reflejos entre todas las matrices.
+
+    Args:
+        grids (np.ndarray): Matrices booleanas cuadradas con forma (N, n, n).
+        mirror (bool): Si es False, la distancia solo es invariante a rotaciones.
+
+    Returns:
+        np.ndarray: Matriz simétrica (N, N) de celdas distintas en la mejor orientación.
+    """
+    count = len(grids)
+    packed = np.packbits(grids.reshape(count, -1), axis=-1)
+    variants = dihedral_variants(grids, mirror=mirror)
+    variants = np.packbits(variants.reshape(count, variants.shape[1], -1), axis=-1)
+
+    # (N, 1, 1, bytes) ^ (1, N, 8, bytes): cada marcador contra las orientaciones de los demás
+    differing = packed[:, None, None, :] ^ variants[None, :, :, :]
+    bits = POPCOUNT[differing].sum(axis=-1, dtype=np.uint16)
+    return bits.min(axis=-1)
+
+
+def analyze_style(style, show_symbol=True, show_atomic_number=True, symbol_size=2, generator=None):
+    """
+    Calcula las distancias entre los marcadores de todos los elementos en un estilo.
+
+    Args:
+        style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+        show_symbol (bool): Indica si se muestra el símbolo del elemento.
+        show_atomic_number (bool): Indica si se muestra el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        generator (ElementARMarkerGenerator): Generador a usar (se crea uno si no se indica).
+
+    Returns:
+        tuple: (números atómicos, matriz de distancias (N, N)).
+    """
+    generator = generator or ElementARMarkerGenerator()
+    atomic_numbers = [number for _, _, number in generator.elements]
+    grids = np.stack([
+        generator.get_visible_grid(
+            style, number, show_symbol=show_symbol,
+            show_atomic_number=show_atomic_number, symbol_size=symbol_size
+        )
+        for number in atomic_numbers
+    ])
+    return atomic_numbers, hamming_distance_matrix(grids, mirror=style != MARKER_STYLE_FAMILY)
+
+
+def closest_pairs(atomic_numbers, distances, count=10):
+    """
+    Retorna los pares de elementos distintos con menor distancia.
+
+    Args:
+        atomic_numbers (list): Números atómicos en el orden de la matriz.
+        distances (np.ndarray): Matriz de distancias (N, N).
+        count (int): Número máximo de pares a retornar.
+
+    Returns:
+        list: Tuplas (número atómico A, número atómico B, distancia) de menor a mayor distancia.
+    """
+    rows, cols = np.triu_indices(len(atomic_numbers), k=1)
+    pair_distances = distances[rows, cols]
+    order = np.argsort(pair_distances, kind="stable")[:count]
+    return [
+        (atomic_numbers[rows[index]], atomic_numbers[cols[index]], int(pair_distances[index]))
+        for index in order
+    ]
+
+
+if __name__ == "__main__":
+    generator = ElementARMarkerGenerator()
+    for style in MARKER_STYLES:
+        atomic_numbers, distances = analyze_style(style, generator=generator)
+        print(f"Estilo {style}: pares más cercanos")
+        for number_a, number_b, distance in closest_pairs(atomic_numbers, distances):
+            symbol_a = generator.get_element_by_atomic_number(number_a)[0]
+            symbol_b = generator.get_element_by_atomic_number(number_b)[0]
+            print(f"  {symbol_a} ({number_a}) - {symbol_b} ({number_b}): {distance} celdas")
@@ -0,0 +1,206 @@
+"""
+Caché de marcadores RA codificados como PNG.
+
+Los marcadores son deterministas dados (estilo, número atómico, mostrar símbolo, mostrar
+número, tamaño del símbolo), así que se guardan ya codificados en dos niveles:
+
+1. Una caché LRU en memoria compartida por todas las sesiones del proceso.
+2. Un almacén opcional en disco, activado con la variable de entorno MARKER_CACHE_DIR,
+   que puede precalcularse completo al arrancar con `warm_disk_cache`.
+
+Cada entrada guarda también el informe del PNG compacto (en disco, en un archivo `.report`
+junto al PNG), así que la vista previa nunca vuelve a renderizar un marcador ya cacheado.
+"""
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from PIL import Image
+
+# El perfil PNG se comparte con las demás aplicaciones desde la raíz del repositorio
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from marker_generator import MARKER_GENERATOR_VERSION, MARKER_STYLE_TRADITIONAL, MARKER_STYLES, ElementARMarkerGenerator
+from png_profile import PngReport, encode_png_with_report
+
+MEMORY_CACHE_SIZE = 2048
+
+_generator = ElementARMarkerGenerator()
+
+
+def get_cache_dir():
+    """Retorna el directorio del almacén en disco para la versión actual, o None si está desactivado."""
+    base_dir = os.environ.get("MARKER_CACHE_DIR")
+    if not base_dir:
+        return None
+    return os.path.join(base_dir, f"v{MARKER_GENERATOR_VERSION}")
+
+
+def normalize_key(style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2):
+    """
+    Normaliza los parámetros de generación para que marcadores idénticos compartan entrada.
+    
+    El tamaño del símbolo solo afecta al estilo tradicional cuando se muestra el símbolo.
+    
+    Returns:
+        tuple: Clave de caché (estilo, número atómico, mostrar símbolo, mostrar número, tamaño).
+    """
+    if style != MARKER_STYLE_TRADITIONAL or not show_symbol:
+        symbol_size = 2
+    return (style, int(atomic_number), bool(show_symbol), bool(show_atomic_number), int(symbol_size))
+
+
+def _disk_path(cache_dir, key):
+    style, atomic_number, show_symbol, show_atomic_number, symbol_size = key
+    return os.path.join(
+        cache_dir, f"{style}_{atomic_number:03d}_{int(show_symbol)}{int(show_atomic_number)}_{symbol_size}.png"
+    )
+
+
+def _render_image(key):
+    style, atomic_number, show_symbol, show_atomic_number, symbol_size = key
+    return Image.fromarray(_generator.generate_marker(
+        style, atomic_number, show_symbol=show_symbol,
+        show_atomic_number=show_atomic_number, symbol_size=symbol_size
+    ))
+
+
+def render_png(key):
+    """
+    Genera el marcador de una clave normalizada y lo codifica como PNG compacto.
+    
+    Returns:
+        tuple: (bytes del PNG, PngReport).
+    """
+    return encode_png_with_report(_render_image(key))
+
+
+def _write_atomic(path, data):
+    """Escribe un archivo de forma atómica para que otros procesos nunca lean uno a medias."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as tmp_file:
+        tmp_file.write(data)
+    os.replace(tmp_path, path)
+
+
+def _report_path(path):
+    return os.path.splitext(path)[0] + ".report"
+
+
+def _is_stored(path):
+    return os.path.exists(path) and os.path.exists(_report_path(path))
+
+
+def _read_stored(path):
+    """Lee un PNG del almacén y su informe, o retorna None si falta alguno de los dos."""
+    try:
+        with open(_report_path(path), encoding="ascii") as report_file:
+            mode, baseline_size = report_file.read().split()
+        with open(path, "rb") as cached_file:
+            data = cached_file.read()
+    except (FileNotFoundError, ValueError):
+        return None
+    return data, PngReport(mode, len(data), int(baseline_size))
+
+
+def _write_stored(path, entry):
+    # El informe se escribe antes que el PNG: si el PNG existe, su informe también
+    data, report = entry
+    _write_atomic(_report_path(path), f"{report.mode} {report.baseline_size}".encode("ascii"))
+    _write_atomic(path, data)
+
+
+@lru_cache(maxsize=MEMORY_CACHE_SIZE)
+def _cached_png(key):
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return render_png(key)
+    
+    path = _disk_path(cache_dir, key)
+    entry = _read_stored(path)
+    if entry is None:
+        entry = render_png(key)
+        _write_stored(path, entry)
+    return entry
+
+
+def get_marker_png(style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2):
+    """
+    Retorna el PNG de un marcador, generándolo solo si no está en ninguna de las cachés.
+    
+    Args:
+        style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+        atomic_number (int): Número atómico del elemento.
+        show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+        show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        
+    Returns:
+        bytes: Marcador codificado como PNG.
+    """
+    return _cached_png(normalize_key(style, atomic_number, show_symbol, show_atomic_number, symbol_size))[0]
+
+
+def get_marker_png_report(style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2):
+    """
+    Retorna el ahorro del PNG compacto de un marcador frente al PNG sin optimizar.
+    
+    Sale de la misma entrada de caché que `get_marker_png`, sin volver a renderizar.
+    
+    Returns:
+        PngReport: Modo elegido, tamaño compacto y tamaño del PNG sin optimizar.
+    """
+    return _cached_png(normalize_key(style, atomic_number, show_symbol, show_atomic_number, symbol_size))[1]
+
+
+def all_keys():
+    """Retorna todas las claves normalizadas distintas de los 118 elementos."""
+    keys = []
+    for _, _, atomic_number in _generator.elements:
+        for style in MARKER_STYLES:
+            for show_symbol in (False, True):
+                for show_atomic_number in (False, True):
+                    sizes = (2,) if style != MARKER_STYLE_TRADITIONAL or not show_symbol else (2, 3, 4)
+                    for symbol_size in sizes:
+                        keys.append(normalize_key(style, atomic_number, show_symbol, show_atomic_number, symbol_size))
+    return keys
+
+
+def warm_disk_cache(max_workers=None):
+    """
+    Precalcula en disco todos los marcadores que aún no estén guardados.
+    
+    Args:
+        max_workers (int): Procesos usados para generar (por defecto, uno por núcleo).
+        
+    Returns:
+        int: Número de marcadores generados.
+    """
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return 0
+    
+    missing = [key for key in all_keys() if not _is_stored(_disk_path(cache_dir, key))]
+    if not missing:
+        return 0
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for key, entry in zip(missing, executor.map(render_png, missing, chunksize=16)):
+            _write_stored(_disk_path(cache_dir, key), entry)
+    return len(missing)
+
+
+def start_background_warmup():
+    """Lanza `warm_disk_cache` en un hilo de fondo si el almacén en disco está activado."""
+    if get_cache_dir() is None:
+        return None
+    thread = threading.Thread(target=warm_disk_cache, name="marker-cache-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,191 @@
+"""
+Familia de marcadores RA con distancia mínima garantizada, compatible con ArUco.
+
+Los marcadores QR y tradicionales dibujan celdas aleatorias, así que nada garantiza que dos
+elementos difieran en suficientes bits. Esta familia selecciona 118 códigos de 6x6 bits
+(rodeados por el borde negro de ArUco, 8x8 celdas en total) tales que cualquier par difiere
+en al menos FAMILY_MIN_DISTANCE bits en cualquiera de las 4 rotaciones, y cada código en al
+menos esa distancia de sus propias rotaciones (la orientación nunca es ambigua).
+
+Las celdas interiores de la esquina superior izquierda (símbolo) y de la inferior derecha
+(número atómico) quedan siempre en blanco para conservar el texto de cada elemento.
+
+Los códigos se exportan como diccionario personalizado de `cv2.aruco`, de modo que los
+dispositivos pueden usar el detector ArUco en lugar de reconocer imágenes genéricas:
+
+    python marker_family.py familia_aruco.yml
+"""
+import sys
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from codebook import POPCOUNT
+
+FAMILY_SIZE = 118
+FAMILY_CODE_SIZE = 6  # Bits por lado sin contar el borde negro
+FAMILY_MIN_DISTANCE = 9  # Corrige hasta (9 - 1) // 2 = 4 bits erróneos
+FAMILY_SEED = 118  # Semilla Mersenne Twister de la búsqueda
+FAMILY_BATCH_SIZE = 4096
+
+# Celdas del código reservadas para el texto (code[fila][columna], siempre blancas)
+FAMILY_SYMBOL_CELLS = 2
+FAMILY_NUMBER_CELLS = 2
+FAMILY_RESERVED = np.zeros((FAMILY_CODE_SIZE, FAMILY_CODE_SIZE), dtype=bool)
+FAMILY_RESERVED[:FAMILY_SYMBOL_CELLS, :FAMILY_SYMBOL_CELLS] = True
+FAMILY_RESERVED[FAMILY_CODE_SIZE - FAMILY_NUMBER_CELLS:, FAMILY_CODE_SIZE - FAMILY_NUMBER_CELLS:] = True
+
+# Margen del texto dentro de cada área reservada, en fracción de celda: el detector lee una
+# celda como negra si más de la mitad de su interior lo es, así que el texto centrado en el
+# área debe quedar lejos de ese límite en todas las celdas (con 0.3 no pasa del 25 %)
+FAMILY_TEXT_INSET = 0.3
+
+
+def _packed_rotations(codes):
+    """Empaqueta las 4 rotaciones de cada código: (N, 6, 6) -> (N, 4, bytes)."""
+    rotations = np.stack([np.rot90(codes, turns, axes=(-2, -1)) for turns in range(4)], axis=1)
+    return np.packbits(rotations.reshape(len(codes), 4, -1), axis=-1)
+
+
+@lru_cache(maxsize=None)
+def select_family_codes(min_distance=FAMILY_MIN_DISTANCE, seed=FAMILY_SEED):
+    """
+    Selecciona de forma voraz y determinista los códigos de la familia.
+
+    Se generan lotes de candidatos aleatorios con Mersenne Twister; un candidato se acepta si
+    sus rotaciones difieren de sí mismo en al menos `min_distance` bits y ninguna de ellas
+    está a menos de `min_distance` bits de un código ya aceptado.
+
+    Args:
+        min_distance (int): Distancia de Hamming mínima garantizada bajo rotación.
+        seed (int): Semilla de la búsqueda.
+
+    Returns:
+        np.ndarray: Códigos booleanos (118, 6, 6) indexados como code[fila][columna]
+        (True = celda negra), en el orden de los números atómicos; no debe modificarse.
+    """
+    rng = np.random.RandomState(seed)
+    free_cells = np.count_nonzero(~FAMILY_RESERVED)
+    accepted = []
+    accepted_packed = np.zeros((0, (FAMILY_CODE_SIZE * FAMILY_CODE_SIZE + 7) // 8), dtype=np.uint8)
+
+    while len(accepted) < FAMILY_SIZE:
+        candidates = np.zeros((FAMILY_BATCH_SIZE, FAMILY_CODE_SIZE, FAMILY_CODE_SIZE), dtype=bool)
+        candidates[:, ~FAMILY_RESERVED] = rng.random((FAMILY_BATCH_SIZE, free_cells)) > 0.5
+        rotations = _packed_rotations(candidates)
+
+        # Distancia de cada candidato a sus propias rotaciones de 90, 180 y 270 grados
+        self_distance = POPCOUNT[rotations[:, :1] ^ rotations[:, 1:]].sum(axis=-1).min(axis=-1)
+        for index in np.flatnonzero(self_distance >= min_distance):
+            if len(accepted_packed):
+                distance = POPCOUNT[accepted_packed[:, None, :] ^ rotations[index][None, :, :]].sum(axis=-1).min()
+                if distance < min_distance:
+                    continue
+            accepted.append(candidates[index])
+            accepted_packed = np.concatenate([accepted_packed, rotations[index, :1]])
+            if len(accepted) == FAMILY_SIZE:
+                break
+
+    codes = np.stack(accepted)
+    codes.setflags(write=False)
+    return codes
+
+
+def code_to_grid(code):
+    """
+    Convierte un código de la familia en la matriz de celdas 8x8 del marcador (con borde negro).
+
+    Args:
+        code (np.ndarray): Código booleano (6, 6) indexado como code[fila][columna].
+
+    Returns:
+        np.ndarray: Matriz booleana grid[x][y] (True = celda negra).
+    """
+    grid = np.ones((FAMILY_CODE_SIZE + 2, FAMILY_CODE_SIZE + 2), dtype=bool)
+    grid[1:-1, 1:-1] = code.T
+    return grid
+
+
+def build_aruco_dictionary(codes=None):
+    """
+    Construye el diccionario personalizado de ArUco de la familia (id = número atómico - 1).
+
+    Args:
+        codes (np.ndarray): Códigos (N, 6, 6); por defecto, los de select_family_codes().
+
+    Returns:
+        cv2.aruco.Dictionary: Diccionario listo para cv2.aruco.ArucoDetector.
+    """
+    if codes is None:
+        codes = select_family_codes()
+    # En ArUco el bit 1 es una celda blanca
+    bytes_list = np.concatenate([
+        cv2.aruco.Dictionary.getByteListFromBits((~code).astype(np.uint8)) for code in codes
+    ])
+    return cv2.aruco.Dictionary(bytes_list, FAMILY_CODE_SIZE, (FAMILY_MIN_DISTANCE - 1) // 2)
+
+
+def check_family_decoding():
+    """
+    Comprueba que el detector ArUco identifica los 118 marcadores con cada opción de texto.
+
+    Cada marcador se genera con y sin símbolo y número atómico y se detecta en las cuatro
+    rotaciones con el diccionario de la familia.
+
+    Returns:
+        list: Fallos (número atómico, mostrar símbolo, mostrar número, giros de 90 grados,
+        ids detectados); vacía si todos se identifican correctamente.
+    """
+    from marker_generator import MARKER_STYLE_FAMILY, ElementARMarkerGenerator
+
+    generator = ElementARMarkerGenerator()
+    detector = cv2.aruco.ArucoDetector(build_aruco_dictionary(), cv2.aruco.DetectorParameters())
+    failures = []
+    for atomic_number in range(1, FAMILY_SIZE + 1):
+        for show_symbol in (True, False):
+            for show_atomic_number in (True, False):
+                marker = generator.generate_marker(MARKER_STYLE_FAMILY, atomic_number, show_symbol, show_atomic_number)
+                for turns in range(4):
+                    _, ids, _ = detector.detectMarkers(np.ascontiguousarray(np.rot90(marker, turns)))
+                    found = [] if ids is None else [int(marker_id) for marker_id in ids.ravel()]
+                    if found != [atomic_number - 1]:
+                        failures.append((atomic_number, show_symbol, show_atomic_number, turns, found))
+    return failures
+
+
+def export_aruco_dictionary(path):
+    """
+    Guarda el diccionario de la familia en un archivo YAML/JSON de OpenCV.
+
+    Se carga en el dispositivo con:
+
+        storage = cv2.FileStorage(path, cv2.FILE_STORAGE_READ)
+        dictionary = cv2.aruco.Dictionary()
+        dictionary.readDictionary(storage.root())
+
+    Args:
+        path (str): Ruta de salida (.yml, .yaml o .json).
+    """
+    storage = cv2.FileStorage(path, cv2.FILE_STORAGE_WRITE)
+    try:
+        build_aruco_dictionary().writeDictionary(storage)
+    finally:
+        storage.release()
+
+
+def aruco_dictionary_bytes(extension=".yml"):
+    """Retorna el diccionario de la familia serializado por OpenCV (para descargarlo)."""
+    storage = cv2.FileStorage(extension, cv2.FILE_STORAGE_WRITE | cv2.FILE_STORAGE_MEMORY)
+    build_aruco_dictionary().writeDictionary(storage)
+    return storage.releaseAndGetString().encode()
+
+
+if __name__ == "__main__":
+    failures = check_family_decoding()
+    if failures:
+        sys.exit(f"{len(failures)} marcadores no se identifican con ArUco, p. ej. {failures[0]}")
+    output_path = sys.argv[1] if len(sys.argv) > 1 else "familia_aruco.yml"
+    export_aruco_dictionary(output_path)
+    print(f"{output_path}: {FAMILY_SIZE} códigos de {FAMILY_CODE_SIZE}x{FAMILY_CODE_SIZE} bits, "
+          f"distancia mínima {FAMILY_MIN_DISTANCE}")
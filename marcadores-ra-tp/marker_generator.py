@@ -0,0 +1,559 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+# La tabla periódica se comparte con las demás aplicaciones desde la raíz del repositorio
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from periodic_table import CATEGORIES, ELEMENTS, element_by_number
+from codebook import load_codebook, traditional_variant_index
+from glyph_atlas import BOLD_PASSES, TextSpec, composite_stamp, text_stamp
+from marker_family import (
+    FAMILY_NUMBER_CELLS, FAMILY_SEED, FAMILY_SYMBOL_CELLS, FAMILY_TEXT_INSET, code_to_grid, select_family_codes,
+)
+
+# Clasificación de elementos por categorías (números atómicos), compartida con la tabla periódica
+ELEMENT_CATEGORIES = CATEGORIES
+
+# Versión del algoritmo de generación: cambiarla invalida los marcadores precalculados
+MARKER_GENERATOR_VERSION = 2
+
+# Estilos de marcador disponibles
+MARKER_STYLE_QR = "qr"
+MARKER_STYLE_TRADITIONAL = "tradicional"
+MARKER_STYLE_FAMILY = "familia"
+MARKER_STYLES = (MARKER_STYLE_TRADITIONAL, MARKER_STYLE_QR, MARKER_STYLE_FAMILY)
+
+# Áreas de texto del estilo QR en celdas: símbolo centrado y número en la esquina inferior derecha
+QR_SYMBOL_AREA_CELLS = 6
+QR_NUMBER_AREA_CELLS = 4
+
+# Modificaciones fijas (fila, columna, valor) del interior de cada esquina QR según
+# mod_val = (número atómico + índice de esquina * 37) % 12
+CORNER_MODIFICATIONS = (
+    ((2, 2, 0), (4, 4, 0)),
+    ((2, 3, 0), (3, 2, 0)),
+    ((3, 3, 0), (2, 4, 1)),
+    ((2, 2, 1), (3, 4, 0)),
+    ((4, 2, 0), (4, 3, 1)),
+    ((2, 3, 1), (4, 3, 0)),
+    ((3, 2, 1), (3, 4, 1)),
+    ((2, 4, 0), (4, 2, 1)),
+    ((2, 2, 1), (2, 4, 0), (4, 4, 1)),
+    ((3, 3, 1), (4, 3, 0)),
+    ((2, 3, 0), (3, 4, 1), (4, 2, 0)),
+    ((2, 2, 0), (3, 3, 1), (4, 4, 0)),
+)
+
+# Matrices precalculadas de todos los elementos (None si falta o es de otra versión)
+_CODEBOOK = load_codebook(MARKER_GENERATOR_VERSION)
+
+# Un generador Mersenne Twister por hilo: las sesiones concurrentes no comparten estado
+_thread_state = threading.local()
+
+
+def seeded_rng(seed):
+    """
+    Retorna el generador Mersenne Twister (MT19937) del hilo actual resembrado con `seed`.
+    
+    Produce exactamente la misma secuencia que `np.random.seed(seed)` seguido de
+    `np.random.random()`, pero sin tocar el estado global de NumPy, por lo que la
+    generación de marcadores es segura desde varios hilos o procesos.
+    
+    Args:
+        seed (int): Semilla del generador.
+        
+    Returns:
+        np.random.RandomState: Generador del hilo actual, listo para usar.
+    """
+    rng = getattr(_thread_state, 'rng', None)
+    if rng is None:
+        rng = _thread_state.rng = np.random.RandomState()
+    rng.seed(seed)
+    return rng
+
+
+class ElementARMarkerGenerator:
+    def __init__(self):
+        """
+        Inicializa el generador de marcadores RA para elementos químicos.
+        """
+        self.marker_size = 400  # Tamaño del marcador en píxeles
+        self.border_size = 40   # Tamaño del borde en píxeles
+        
+        # Elementos de la tabla periódica (símbolo, nombre, número atómico), compartidos
+        self.elements = ELEMENTS
+    
+    def generate_unique_corner_pattern(self, atomic_number, corner_index):
+        """
+        Genera un patrón de esquina único para cada elemento y cada esquina.
+        
+        Args:
+            atomic_number (int): Número atómico del elemento.
+            corner_index (int): Índice de la esquina (0, 1, 2).
+            
+        Returns:
+            np.ndarray: Patrón de esquina de 7x7.
+        """
+        # Usar diferentes semillas para cada esquina
+        seed_offset = [1000, 2000, 3000]
+        rng = seeded_rng(atomic_number + seed_offset[corner_index])
+        
+        # Patrón base de esquina QR
+        corner_base = np.array([
+            [1, 1, 1, 1, 1, 1, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 0, 1, 1, 1, 0, 1],
+            [1, 0, 1, 1, 1, 0, 1],
+            [1, 0, 1, 1, 1, 0, 1],
+            [1, 0, 0, 0, 0, 0, 1],
+            [1, 1, 1, 1, 1, 1, 1]
+        ], dtype=np.uint8)
+        
+        # Crear copia del patrón base
+        corner_pattern = corner_base.copy()
+        
+        # Generar modificaciones únicas para el área interna (2x2 a 4x4) con Mersenne Twister;
+        # los 9 valores se extraen en el mismo orden fila a fila que las llamadas individuales
+        flips = rng.random((3, 3)) > 0.5
+        corner_pattern[2:5, 2:5] ^= flips.astype(np.uint8)  # Invertir
+        
+        # Aplicar modificaciones adicionales basadas en el número atómico y esquina
+        mod_val = (atomic_number + corner_index * 37) % 12  # Más variaciones
+        for i, j, value in CORNER_MODIFICATIONS[mod_val]:
+            corner_pattern[i][j] = value
+        
+        return corner_pattern
+    
+    def generate_qr_grid(self, atomic_number):
+        """
+        Calcula la matriz de celdas 16x16 del marcador tipo QR de un elemento.
+        
+        Args:
+            atomic_number (int): Número atómico del elemento.
+            
+        Returns:
+            np.ndarray: Matriz booleana grid[x][y] (True = celda negra).
+        """
+        # Crear un patrón tipo QR más denso
+        grid_size = 16  # Más celdas para patrón más complejo
+        grid = np.zeros((grid_size, grid_size), dtype=bool)  # grid[x][y], True = celda negra
+        
+        # Generar patrones de esquina únicos para cada esquina
+        corner_positions = [(0, 0), (grid_size-7, 0), (0, grid_size-7)]
+        
+        for corner_idx, (corner_x, corner_y) in enumerate(corner_positions):
+            corner_pattern = self.generate_unique_corner_pattern(atomic_number, corner_idx)
+            grid[corner_x:corner_x+7, corner_y:corner_y+7] |= corner_pattern.astype(bool)
+        
+        # Patrón de alineación central único para cada elemento
+        center_x, center_y = grid_size // 2 - 2, grid_size // 2 - 2
+        
+        # Usar semilla específica para el patrón central
+        rng = seeded_rng(atomic_number + 5000)
+        
+        # Generar patrón de alineación único usando Mersenne Twister: borde completo
+        # e interior con probabilidad variable según el elemento
+        alignment_size = 5
+        alignment_pattern = np.ones((alignment_size, alignment_size), dtype=bool)
+        threshold = 0.3 + (atomic_number % 5) * 0.1  # 0.3 a 0.7
+        alignment_pattern[1:-1, 1:-1] = rng.random((alignment_size-2, alignment_size-2)) > threshold
+        grid[center_x:center_x+alignment_size, center_y:center_y+alignment_size] |= alignment_pattern
+        
+        # Rellenar el resto con patrón pseudo-aleatorio único usando Mersenne Twister
+        rng = seeded_rng(atomic_number + 10000)  # Semilla para el relleno general
+        
+        # Evitar las esquinas y el centro ya dibujados
+        reserved = np.zeros((grid_size, grid_size), dtype=bool)
+        reserved[:7, :7] = True  # Esquina superior izquierda
+        reserved[grid_size-7:, :7] = True  # Esquina superior derecha
+        reserved[:7, grid_size-7:] = True  # Esquina inferior izquierda
+        reserved[center_x:center_x+5, center_y:center_y+5] = True  # Centro
+        
+        # Generar patrón usando Mersenne Twister con probabilidad variable; la indexación
+        # booleana recorre las celdas libres en el mismo orden (i, j) que el bucle original
+        threshold = 0.45 + (atomic_number % 7) * 0.02  # 0.45 a 0.57
+        free = ~reserved
+        grid[free] |= rng.random(np.count_nonzero(free)) > threshold
+        
+        return grid
+    
+    def generate_qr_marker(self, symbol, atomic_number, show_symbol=True, show_atomic_number=True):
+        """
+        Genera un marcador tipo QR único para cualquier elemento químico usando Mersenne Twister
+        con patrones de esquina únicos para cada elemento.
+        
+        Args:
+            symbol (str): Símbolo del elemento.
+            atomic_number (int): Número atómico del elemento.
+            show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+            show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+            
+        Returns:
+            np.array: Imagen del marcador como array de NumPy.
+        """
+        marker = self._rasterize_grid(self.get_grid(MARKER_STYLE_QR, atomic_number))
+        self._draw_overlay(marker, self.get_overlay(
+            MARKER_STYLE_QR, symbol, atomic_number, show_symbol=show_symbol, show_atomic_number=show_atomic_number
+        ))
+        return marker
+    
+    def generate_element_grid(self, atomic_number, show_symbol=False, show_atomic_number=True, symbol_size=2):
+        """
+        Calcula la matriz de celdas 8x8 del marcador tradicional de un elemento.
+        
+        Args:
+            atomic_number (int): Número atómico del elemento.
+            show_symbol (bool): Indica si se reserva el área del símbolo.
+            show_atomic_number (bool): Indica si se reserva el área del número atómico.
+            symbol_size (int): Tamaño del símbolo en celdas (2, 3, o 4).
+            
+        Returns:
+            np.ndarray: Matriz booleana grid[x][y] (True = celda negra).
+        """
+        rng = seeded_rng(atomic_number)  # Usar número atómico como semilla
+        
+        # Generar una matriz de celdas para el marcador
+        grid_size = 8  
+        
+        # Evitar dibujar en las áreas reservadas para el símbolo y número atómico
+        reserved = np.zeros((grid_size, grid_size), dtype=bool)
+        if show_symbol:
+            reserved[:symbol_size, :symbol_size] = True
+        if show_atomic_number:
+            reserved[grid_size-2:, grid_size-2:] = True
+        
+        # Generar un valor aleatorio determinista basado en el número atómico para cada celda
+        # libre (mismo orden (i, j) que el recorrido celda a celda); 50% de probabilidad de dibujar
+        grid = np.zeros((grid_size, grid_size), dtype=bool)  # grid[x][y], True = celda negra
+        free = ~reserved
+        grid[free] = rng.random(np.count_nonzero(free)) > 0.5
+        
+        return grid
+    
+    def generate_element_marker(self, symbol, name, atomic_number, show_symbol=False, show_atomic_number=True, symbol_size=2):
+        """
+        Genera un marcador RA único para un elemento químico optimizado para impresión 3D (estilo original).
+        
+        Args:
+            symbol (str): Símbolo del elemento.
+            name (str): Nombre del elemento.
+            atomic_number (int): Número atómico del elemento.
+            show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+            show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+            symbol_size (int): Tamaño del símbolo en celdas (2, 3, o 4).
+            
+        Returns:
+            np.array: Imagen del marcador como array de NumPy.
+        """
+        marker = self._rasterize_grid(self.get_grid(
+            MARKER_STYLE_TRADITIONAL, atomic_number, show_symbol=show_symbol,
+            show_atomic_number=show_atomic_number, symbol_size=symbol_size
+        ))
+        self._draw_overlay(marker, self.get_overlay(
+            MARKER_STYLE_TRADITIONAL, symbol, atomic_number, show_symbol=show_symbol,
+            show_atomic_number=show_atomic_number, symbol_size=symbol_size
+        ))
+        return marker
+    
+    def generate_family_grid(self, atomic_number):
+        """
+        Calcula la matriz de celdas 8x8 (código ArUco con su borde) de la familia de un elemento.
+        
+        Args:
+            atomic_number (int): Número atómico del elemento.
+            
+        Returns:
+            np.ndarray: Matriz booleana grid[x][y] (True = celda negra).
+        """
+        return code_to_grid(select_family_codes()[atomic_number - 1])
+    
+    def generate_family_marker(self, symbol, atomic_number, show_symbol=True, show_atomic_number=True):
+        """
+        Genera el marcador de la familia con distancia mínima garantizada (detectable con ArUco).
+        
+        El símbolo y el número atómico se dibujan sobre celdas del código que siempre son
+        blancas, dentro del borde negro, sin alterar los bits que lee el detector.
+        
+        Args:
+            symbol (str): Símbolo del elemento.
+            atomic_number (int): Número atómico del elemento.
+            show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+            show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+            
+        Returns:
+            np.array: Imagen del marcador como array de NumPy.
+        """
+        marker = self._rasterize_grid(self.get_grid(MARKER_STYLE_FAMILY, atomic_number))
+        self._draw_overlay(marker, self.get_overlay(
+            MARKER_STYLE_FAMILY, symbol, atomic_number, show_symbol=show_symbol, show_atomic_number=show_atomic_number
+        ))
+        return marker
+    
+    def get_grid(self, style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2):
+        """
+        Retorna la matriz de celdas de un marcador, desde el libro de códigos si está disponible.
+        
+        Args:
+            style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+            atomic_number (int): Número atómico del elemento.
+            show_symbol (bool): Indica si se muestra el símbolo del elemento.
+            show_atomic_number (bool): Indica si se muestra el número atómico.
+            symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+            
+        Returns:
+            np.ndarray: Matriz booleana grid[x][y] (True = celda negra); no debe modificarse.
+        """
+        in_codebook = _CODEBOOK is not None and 1 <= atomic_number <= len(_CODEBOOK["qr"])
+        if style == MARKER_STYLE_QR:
+            if in_codebook:
+                return _CODEBOOK["qr"][atomic_number - 1]
+            return self.generate_qr_grid(atomic_number)
+        if style == MARKER_STYLE_FAMILY:
+            if in_codebook:
+                return _CODEBOOK["family"][atomic_number - 1]
+            return self.generate_family_grid(atomic_number)
+        
+        variant = traditional_variant_index(show_symbol, show_atomic_number, symbol_size)
+        if in_codebook and variant is not None:
+            return _CODEBOOK["traditional"][atomic_number - 1, variant]
+        return self.generate_element_grid(atomic_number, show_symbol, show_atomic_number, symbol_size)
+    
+    def get_visible_grid(self, style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2):
+        """
+        Retorna las celdas que quedan visibles en el marcador impreso, sin las tapadas por el texto.
+        
+        En el estilo tradicional y en la familia las áreas de texto ya están en blanco en la
+        matriz; en el estilo QR se dibujan y después se borran al pintar el fondo del texto.
+        
+        Args:
+            style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+            atomic_number (int): Número atómico del elemento.
+            show_symbol (bool): Indica si se muestra el símbolo del elemento.
+            show_atomic_number (bool): Indica si se muestra el número atómico.
+            symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+            
+        Returns:
+            np.ndarray: Matriz booleana grid[x][y] (True = celda negra).
+        """
+        grid = self.get_grid(
+            style, atomic_number, show_symbol=show_symbol,
+            show_atomic_number=show_atomic_number, symbol_size=symbol_size
+        )
+        if style != MARKER_STYLE_QR or not (show_symbol or show_atomic_number):
+            return grid
+        
+        grid = grid.copy()
+        grid_size = grid.shape[0]
+        if show_symbol:
+            start = (grid_size - QR_SYMBOL_AREA_CELLS) // 2
+            grid[start:start + QR_SYMBOL_AREA_CELLS, start:start + QR_SYMBOL_AREA_CELLS] = False
+        if show_atomic_number:
+            grid[grid_size - QR_NUMBER_AREA_CELLS:, grid_size - QR_NUMBER_AREA_CELLS:] = False
+        return grid
+    
+    def get_overlay(self, style, symbol, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2):
+        """
+        Calcula las áreas que se pintan de blanco y los textos que se dibujan sobre la matriz.
+        
+        Args:
+            style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+            symbol (str): Símbolo del elemento.
+            atomic_number (int): Número atómico del elemento.
+            show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+            show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+            symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+            
+        Returns:
+            tuple: (áreas (x0, y0, lado) en píxeles del marcador, textos TextSpec).
+        """
+        grid_size = {MARKER_STYLE_QR: 16, MARKER_STYLE_TRADITIONAL: 8, MARKER_STYLE_FAMILY: 8}[style]
+        cell_size = self.marker_size // grid_size
+        atomic_text = str(atomic_number)
+        areas = []
+        texts = []
+        
+        if style == MARKER_STYLE_QR:
+            # Áreas reservadas para el texto: símbolo en el centro (6x6 celdas) y número atómico
+            # en la esquina inferior derecha (4x4 celdas)
+            symbol_area_size = QR_SYMBOL_AREA_CELLS
+            symbol_area_x0 = self.border_size + (grid_size - symbol_area_size) // 2 * cell_size
+            symbol_area_y0 = self.border_size + (grid_size - symbol_area_size) // 2 * cell_size
+            atomic_area_x0 = self.border_size + (grid_size - QR_NUMBER_AREA_CELLS) * cell_size
+            atomic_area_y0 = self.border_size + (grid_size - QR_NUMBER_AREA_CELLS) * cell_size
+            
+            # Fondo blanco para el símbolo y el número
+            if show_symbol:
+                areas.append((symbol_area_x0, symbol_area_y0, cell_size * symbol_area_size))
+            if show_atomic_number:
+                areas.append((atomic_area_x0, atomic_area_y0, cell_size * QR_NUMBER_AREA_CELLS))
+            
+            # Añadir el símbolo en el centro si está habilitado (desde el atlas de glifos)
+            if show_symbol:
+                # Aumentar significativamente el tamaño de la letra
+                if len(symbol) == 1:
+                    font_size = 120  # Para símbolos de una letra
+                elif len(symbol) == 2:
+                    font_size = 100  # Para símbolos de dos letras
+                else:
+                    font_size = 80   # Para símbolos de tres letras
+                
+                texts.append(TextSpec(
+                    symbol, symbol_area_x0, symbol_area_y0, symbol_area_size * cell_size, font_size,
+                    fit_margin=20, center_on_bbox=True, y_adjust=-5
+                ))
+            
+            # Añadir el número atómico si está habilitado (con tamaño aumentado)
+            if show_atomic_number:
+                if len(atomic_text) == 1:
+                    font_size = 85
+                elif len(atomic_text) == 2:
+                    font_size = 80
+                else:  # 3 dígitos
+                    font_size = 70
+                
+                texts.append(TextSpec(
+                    atomic_text, atomic_area_x0, atomic_area_y0, QR_NUMBER_AREA_CELLS * cell_size, font_size,
+                    fit_margin=15, center_on_bbox=True, y_adjust=-3
+                ))
+            return areas, texts
+        
+        if style == MARKER_STYLE_FAMILY:
+            # Esquina superior izquierda y esquina inferior derecha del código (sin el borde
+            # negro); las celdas ya son blancas, así que no hay que borrar nada. El texto se
+            # limita al área reducida por FAMILY_TEXT_INSET y se centra con su caja real para
+            # que no oscurezca ninguna celda hasta el punto de que el detector la lea negra
+            inset = round(FAMILY_TEXT_INSET * cell_size)
+            symbol_area_x0 = symbol_area_y0 = self.border_size + cell_size + inset
+            atomic_area_x0 = atomic_area_y0 = (
+                self.border_size + (grid_size - 1 - FAMILY_NUMBER_CELLS) * cell_size + inset
+            )
+            symbol_box = FAMILY_SYMBOL_CELLS * cell_size - 2 * inset
+            atomic_box = FAMILY_NUMBER_CELLS * cell_size - 2 * inset
+            symbol_font_size = 80  # Mismos textos que el estilo tradicional con símbolo de 2x2 celdas
+            center_on_bbox = True
+        else:
+            symbol_area_x0 = symbol_area_y0 = self.border_size
+            atomic_area_x0 = atomic_area_y0 = self.border_size + (grid_size - 2) * cell_size
+            symbol_box = symbol_size * cell_size
+            atomic_box = 2 * cell_size
+            symbol_font_size = {2: 80, 3: 110, 4: 140}[symbol_size]
+            center_on_bbox = False
+            
+            if show_symbol:
+                areas.append((symbol_area_x0, symbol_area_y0, symbol_box))
+            if show_atomic_number:
+                areas.append((atomic_area_x0, atomic_area_y0, atomic_box))
+        
+        # Textos desde el atlas de glifos, engrosados con cuatro pasadas desplazadas
+        if show_symbol:
+            texts.append(TextSpec(
+                symbol, symbol_area_x0, symbol_area_y0, symbol_box, symbol_font_size,
+                fit_margin=10, center_on_bbox=center_on_bbox, passes=BOLD_PASSES
+            ))
+        if show_atomic_number:
+            font_size = 80 if len(atomic_text) <= 2 else 65
+            texts.append(TextSpec(
+                atomic_text, atomic_area_x0, atomic_area_y0, atomic_box, font_size,
+                fit_margin=10, center_on_bbox=center_on_bbox, passes=BOLD_PASSES
+            ))
+        return areas, texts
+    
+    def _draw_overlay(self, marker, overlay):
+        """Pinta de blanco las áreas reservadas y compone los textos sobre el marcador, en el sitio."""
+        areas, texts = overlay
+        img_size = self.marker_size + 2 * self.border_size
+        for x0, y0, size in areas:
+            self._clear_area(marker, x0, y0, size)
+        for spec in texts:
+            composite_stamp(marker, text_stamp(spec, img_size))
+    
+    def _rasterize_grid(self, grid):
+        """
+        Convierte la matriz de celdas en la imagen del marcador en un único paso vectorizado.
+        
+        Args:
+            grid (np.ndarray): Matriz booleana cuadrada indexada como grid[x][y] (True = negro).
+            
+        Returns:
+            np.ndarray: Imagen en escala de grises (uint8) con el borde blanco incluido.
+        """
+        grid_size = grid.shape[0]
+        cell_size = self.marker_size // grid_size
+        img_size = self.marker_size + 2 * self.border_size
+        
+        # Cada celda cubre cell_size + 1 píxeles por lado (el rectángulo incluye su borde
+        # derecho e inferior), así que la línea de píxeles entre dos celdas es negra si lo es
+        # cualquiera de ellas. Se construye una rejilla intercalada (líneas de borde en índices
+        # pares, interiores de celda en impares) y se expande con un único np.repeat por eje.
+        def interleave(cells):
+            padded = np.pad(cells, ((1, 1), (0, 0)))
+            rows = np.empty((2 * grid_size + 1, cells.shape[1]), dtype=bool)
+            rows[0::2] = padded[:-1] | padded[1:]
+            rows[1::2] = cells
+            return rows
+        
+        black = np.pad(interleave(interleave(grid.T).T).T, 1)
+        counts = [self.border_size] + [1, cell_size - 1] * grid_size + [1]
+        counts.append(img_size - sum(counts))
+        
+        pixels = np.where(black, 0, 255).astype(np.uint8)
+        return np.repeat(np.repeat(pixels, counts, axis=0), counts, axis=1)
+    
+    @staticmethod
+    def _clear_area(marker, x0, y0, size):
+        """Pinta de blanco un área cuadrada del marcador, incluyendo su borde derecho e inferior."""
+        marker[y0:y0 + size + 1, x0:x0 + size + 1] = 255
+
+    def generate_marker(self, style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2):
+        """
+        Genera el marcador de un elemento en el estilo indicado.
+        
+        Args:
+            style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+            atomic_number (int): Número atómico del elemento.
+            show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+            show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+            symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+            
+        Returns:
+            np.array: Imagen del marcador como array de NumPy.
+        """
+        symbol, name, atomic_number = self.get_element_by_atomic_number(atomic_number)
+        if style == MARKER_STYLE_QR:
+            return self.generate_qr_marker(
+                symbol, atomic_number, show_symbol=show_symbol, show_atomic_number=show_atomic_number
+            )
+        if style == MARKER_STYLE_FAMILY:
+            return self.generate_family_marker(
+                symbol, atomic_number, show_symbol=show_symbol, show_atomic_number=show_atomic_number
+            )
+        return self.generate_element_marker(
+            symbol, name, atomic_number, show_symbol=show_symbol,
+            show_atomic_number=show_atomic_number, symbol_size=symbol_size
+        )
+    
+    def get_seeds(self, style, atomic_number):
+        """
+        Retorna las semillas Mersenne Twister que usa el marcador de un elemento.
+        
+        Args:
+            style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+            atomic_number (int): Número atómico del elemento.
+            
+        Returns:
+            list: Semillas en orden de uso (esquinas, centro y relleno para el estilo QR).
+        """
+        if style == MARKER_STYLE_QR:
+            return [atomic_number + offset for offset in (1000, 2000, 3000, 5000, 10000)]
+        if style == MARKER_STYLE_FAMILY:
+            return [FAMILY_SEED]  # Semilla de la búsqueda de toda la familia
+        return [atomic_number]
+    
+    def get_element_by_atomic_number(self, atomic_number):
+        """Obtiene un elemento por su número atómico (acceso directo al índice de la tabla)."""
+        return element_by_number(atomic_number)
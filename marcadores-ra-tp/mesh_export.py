@@ -0,0 +1,418 @@
+"""
+Exportación 3D (STL y 3MF) de los marcadores RA con relieve.
+
+En lugar de importar el PNG en TinkerCAD y convertir cada píxel en geometría, el relieve se
+construye directamente a partir de la matriz de celdas visible y de las máscaras del texto:
+
+- Las celdas negras y el texto forman un mapa de alturas de dos niveles (base y relieve)
+  sobre una rejilla de RELIEF_GRID_UNIT * detalle vóxeles por lado, alineada con las celdas
+  de todos los estilos (el texto se muestrea por cobertura de área).
+- El mallado voraz (greedy meshing) une las caras coplanares: cada cara superior es un
+  rectángulo máximo de vóxeles iguales y cada pared un tramo recto continuo, así que un
+  marcador queda en cientos o pocos miles de triángulos en lugar de millones.
+
+Las medidas se dan en milímetros (lado del marcador completo con su borde, grosor de la base
+y altura del relieve). Las uniones en T que deja el mallado voraz entre caras vecinas se
+eliminan partiendo cada arista en los vértices que caen sobre ella, y las zonas de relieve
+que solo se tocan por una esquina se unen con un vóxel, así que la malla es cerrada y cada
+arista la comparten exactamente dos triángulos (malla variedad, como exige 3MF).
+"""
+import io
+import struct
+import zipfile
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+from glyph_atlas import text_mask
+from marker_generator import ElementARMarkerGenerator
+
+RELIEF_GRID_UNIT = 96  # Vóxeles por lado con detalle 1 (5 píxeles del marcador por vóxel)
+RELIEF_DETAIL_OPTIONS = (1, 2, 3, 4, 5)
+
+MESH_FORMATS = ("stl", "3mf")
+THREEMF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    '</Types>'
+)
+THREEMF_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    '</Relationships>'
+)
+
+_generator = ElementARMarkerGenerator()
+
+
+@lru_cache(maxsize=256)
+def relief_mask(style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2, detail=2):
+    """
+    Calcula qué vóxeles del marcador llevan relieve (celdas negras y texto).
+
+    Args:
+        style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+        atomic_number (int): Número atómico del elemento.
+        show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+        show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        detail (int): Multiplicador de la resolución (RELIEF_GRID_UNIT * detail vóxeles por lado).
+
+    Returns:
+        np.ndarray: Máscara booleana [fila][columna] (fila 0 arriba); no debe modificarse.
+    """
+    symbol, _, atomic_number = _generator.get_element_by_atomic_number(atomic_number)
+    canvas_size = _generator.marker_size + 2 * _generator.border_size
+    resolution = RELIEF_GRID_UNIT * detail
+    pixels_per_voxel = canvas_size // RELIEF_GRID_UNIT  # A escala `detail`, igual en todos los detalles
+
+    # Matriz visible: cada celda y el borde son un número entero de vóxeles
+    grid = _generator.get_visible_grid(
+        style, atomic_number, show_symbol=show_symbol,
+        show_atomic_number=show_atomic_number, symbol_size=symbol_size
+    )
+    cell_voxels = _generator.marker_size // grid.shape[0] * detail // pixels_per_voxel
+    border_voxels = _generator.border_size * detail // pixels_per_voxel
+    mask = np.zeros((resolution, resolution), dtype=bool)
+    mask[border_voxels:resolution - border_voxels, border_voxels:resolution - border_voxels] = np.kron(
+        grid.T, np.ones((cell_voxels, cell_voxels), dtype=bool)
+    )
+
+    # Texto rasterizado a escala `detail` y reducido por cobertura (al menos la mitad del vóxel)
+    _, texts = _generator.get_overlay(
+        style, symbol, atomic_number, show_symbol=show_symbol,
+        show_atomic_number=show_atomic_number, symbol_size=symbol_size
+    )
+    coverage = np.zeros((canvas_size * detail, canvas_size * detail), dtype=np.float32)
+    for spec in texts:
+        y0, x0, ink = text_mask(spec, canvas_size, detail)
+        region = coverage[y0:y0 + ink.shape[0], x0:x0 + ink.shape[1]]
+        np.maximum(region, ink[:region.shape[0], :region.shape[1]], out=region)
+    coverage = coverage.reshape(resolution, pixels_per_voxel, resolution, pixels_per_voxel).mean(axis=(1, 3))
+    mask |= coverage >= 0.5
+
+    mask.setflags(write=False)
+    return mask
+
+
+def _greedy_rectangles(mask):
+    """
+    Cubre una máscara con rectángulos máximos de forma voraz (greedy meshing en 2D).
+
+    Args:
+        mask (np.ndarray): Máscara booleana [fila][columna].
+
+    Returns:
+        list: Rectángulos (fila0, columna0, fila1, columna1) con los extremos excluidos.
+    """
+    remaining = mask.copy()
+    rows = remaining.shape[0]
+    rectangles = []
+    for row in range(rows):
+        while remaining[row].any():
+            # Primer tramo libre de la fila, extendido hacia abajo mientras siga completo
+            col0 = int(np.argmax(remaining[row]))
+            run = np.argmin(remaining[row, col0:])
+            col1 = col0 + int(run) if run else remaining.shape[1]
+            row1 = row + 1
+            while row1 < rows and remaining[row1, col0:col1].all():
+                row1 += 1
+            remaining[row:row1, col0:col1] = False
+            rectangles.append((row, col0, row1, col1))
+    return rectangles
+
+
+def _close_diagonal_contacts(mask):
+    """
+    Une con un vóxel las zonas de relieve que solo se tocan por una esquina.
+
+    En un contacto diagonal la arista vertical de la esquina la comparten cuatro paredes, y
+    la malla deja de ser variedad. Rellenar uno de los dos vóxeles vacíos (un vóxel del orden
+    de medio milímetro, que la impresora uniría de todos modos) lo evita; se repite hasta
+    que no queda ninguno, porque cada relleno puede crear un contacto nuevo.
+
+    Returns:
+        np.ndarray: Copia de la máscara sin contactos diagonales.
+    """
+    mask = mask.copy()
+    while True:
+        top_left, top_right = mask[:-1, :-1], mask[:-1, 1:]
+        bottom_left, bottom_right = mask[1:, :-1], mask[1:, 1:]
+        falling = top_left & bottom_right & ~top_right & ~bottom_left
+        rising = top_right & bottom_left & ~top_left & ~bottom_right
+        if not (falling.any() or rising.any()):
+            return mask
+        rows, cols = np.nonzero(falling)
+        mask[rows, cols + 1] = True
+        rows, cols = np.nonzero(rising)
+        mask[rows, cols] = True
+
+
+def _runs(flags):
+    """Retorna los tramos (inicio, fin) de valores True consecutivos de un vector booleano."""
+    edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+    return zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist())
+
+
+def _wall_quads(mask):
+    """
+    Calcula las paredes del relieve: un rectángulo por tramo recto continuo de su contorno.
+
+    Returns:
+        list: Paredes ((fila0, columna0), (fila1, columna1), normal) sobre las líneas de la
+        rejilla, con la normal hacia fuera del relieve en coordenadas (fila, columna).
+    """
+    padded = np.pad(mask, 1)
+    walls = []
+    # Líneas horizontales: la línea `line` separa las filas line - 1 y line
+    for line in range(mask.shape[0] + 1):
+        above, below = padded[line, 1:-1], padded[line + 1, 1:-1]
+        for start, end in _runs(above & ~below):
+            walls.append(((line, start), (line, end), (1, 0)))
+        for start, end in _runs(below & ~above):
+            walls.append(((line, start), (line, end), (-1, 0)))
+    # Líneas verticales: la línea `line` separa las columnas line - 1 y line
+    for line in range(mask.shape[1] + 1):
+        left, right = padded[1:-1, line], padded[1:-1, line + 1]
+        for start, end in _runs(left & ~right):
+            walls.append(((start, line), (end, line), (0, 1)))
+        for start, end in _runs(right & ~left):
+            walls.append(((start, line), (end, line), (0, -1)))
+    return walls
+
+
+def build_relief_mesh(mask, size_mm=100.0, base_mm=2.0, relief_mm=1.0):
+    """
+    Construye la malla del marcador: una base del tamaño completo y el relieve encima.
+
+    Args:
+        mask (np.ndarray): Máscara de relieve de `relief_mask`.
+        size_mm (float): Lado del marcador completo (con borde) en milímetros.
+        base_mm (float): Grosor de la base en milímetros.
+        relief_mm (float): Altura del relieve sobre la base en milímetros.
+
+    Returns:
+        np.ndarray: Triángulos float32 (N, 3, 3) en milímetros, con los vértices en sentido
+        antihorario vistos desde fuera.
+    """
+    if size_mm <= 0 or base_mm <= 0 or relief_mm <= 0:
+        raise ValueError("El tamaño, el grosor de la base y la altura del relieve deben ser positivos")
+
+    mask = _close_diagonal_contacts(mask)
+    resolution = mask.shape[0]
+    pitch = size_mm / resolution
+    levels = np.array([0.0, base_mm, base_mm + relief_mm])
+    BOTTOM, BASE, TOP = range(3)
+
+    # Las caras se construyen en la rejilla entera (fila, columna, nivel) para poder partir
+    # sus aristas exactamente
+    quads = []
+    normals = []
+
+    def add(corners, normal):
+        quads.append(corners)
+        normals.append(normal)
+
+    # Base: cara inferior y laterales
+    add([(0, 0, BOTTOM), (0, resolution, BOTTOM), (resolution, resolution, BOTTOM), (resolution, 0, BOTTOM)],
+        (0, 0, -1))
+    for (row0, col0), (row1, col1), (d_row, d_col) in (
+        ((0, 0), (0, resolution), (-1, 0)),
+        ((resolution, 0), (resolution, resolution), (1, 0)),
+        ((0, 0), (resolution, 0), (0, -1)),
+        ((0, resolution), (resolution, resolution), (0, 1)),
+    ):
+        add([(row0, col0, BOTTOM), (row1, col1, BOTTOM), (row1, col1, BASE), (row0, col0, BASE)], (d_col, -d_row, 0))
+
+    # Caras superiores: la base donde no hay relieve y el relieve a su altura
+    for face_mask, level in ((~mask, BASE), (mask, TOP)):
+        for row0, col0, row1, col1 in _greedy_rectangles(face_mask):
+            add([(row0, col0, level), (row0, col1, level), (row1, col1, level), (row1, col0, level)], (0, 0, 1))
+
+    # Paredes del relieve
+    for (row0, col0), (row1, col1), (d_row, d_col) in _wall_quads(mask):
+        add([(row0, col0, BASE), (row1, col1, BASE), (row1, col1, TOP), (row0, col0, TOP)], (d_col, -d_row, 0))
+
+    polygons = _split_t_junctions(quads)
+
+    # Cuadriláteros sin vértices intermedios: dos triángulos; el resto, un abanico desde el
+    # centro de la cara (nunca alineado con sus aristas, así que no hay triángulos degenerados)
+    triangles, triangle_normals = [], []
+    for polygon, normal in zip(polygons, normals):
+        if len(polygon) == 4:
+            triangles += [(polygon[0], polygon[1], polygon[2]), (polygon[0], polygon[2], polygon[3])]
+            triangle_normals += [normal, normal]
+        else:
+            center = tuple(np.mean(polygon, axis=0).tolist())
+            triangles += [(center, polygon[index - 1], polygon[index]) for index in range(len(polygon))]
+            triangle_normals += [normal] * len(polygon)
+
+    lattice = np.asarray(triangles, dtype=np.float64)
+    triangles = np.empty_like(lattice)
+    # Fila 0 arriba en la imagen = y máxima en el modelo; el nivel entero se interpola (los
+    # centros de las paredes quedan entre dos niveles)
+    triangles[..., 0] = lattice[..., 1] * pitch
+    triangles[..., 1] = (resolution - lattice[..., 0]) * pitch
+    triangles[..., 2] = np.interp(lattice[..., 2], np.arange(len(levels)), levels)
+    normals = np.asarray(triangle_normals, dtype=np.float64)
+
+    # Orientar cada triángulo según la normal exterior de su cara
+    cross = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    flipped = np.einsum("ij,ij->i", cross, normals) < 0
+    triangles[flipped] = triangles[flipped][:, [0, 2, 1]]
+
+    triangles = triangles.astype(np.float32)
+    check_edge_manifold(triangles)
+    return triangles
+
+
+def _split_t_junctions(quads):
+    """
+    Parte las aristas de cada cara en todos los vértices de otras caras que caen sobre ellas.
+
+    El mallado voraz deja uniones en T (el vértice de una cara en mitad de la arista de su
+    vecina); al insertar esos vértices en la arista, cada arista de la malla queda compartida
+    por exactamente dos triángulos, como exige 3MF.
+
+    Args:
+        quads (list): Caras de cuatro esquinas (fila, columna, nivel) enteras y alineadas con los ejes.
+
+    Returns:
+        list: Polígonos con las esquinas y los vértices intermedios en orden.
+    """
+    # Vértices agrupados por recta paralela a cada eje: eje -> (las otras dos coordenadas) -> posiciones
+    lines = ({}, {}, {})
+    for corner in {corner for quad in quads for corner in quad}:
+        for axis in range(3):
+            key = corner[:axis] + corner[axis + 1:]
+            lines[axis].setdefault(key, []).append(corner[axis])
+    for axis_lines in lines:
+        for key in axis_lines:
+            axis_lines[key].sort()
+
+    polygons = []
+    for quad in quads:
+        polygon = []
+        for start, end in zip(quad, quad[1:] + quad[:1]):
+            polygon.append(start)
+            axis = next(axis for axis in range(3) if start[axis] != end[axis])
+            positions = lines[axis][start[:axis] + start[axis + 1:]]
+            low, high = sorted((start[axis], end[axis]))
+            inner = positions[bisect_right(positions, low):bisect_left(positions, high)]
+            if start[axis] > end[axis]:
+                inner = inner[::-1]
+            polygon += [start[:axis] + (position,) + start[axis + 1:] for position in inner]
+        polygons.append(polygon)
+    return polygons
+
+
+def check_edge_manifold(triangles):
+    """
+    Comprueba que cada arista de la malla la comparten exactamente dos triángulos.
+
+    Args:
+        triangles (np.ndarray): Triángulos (N, 3, 3).
+
+    Raises:
+        ValueError: Si alguna arista está abierta o la comparten más de dos triángulos.
+    """
+    _, indices = np.unique(np.round(triangles.reshape(-1, 3), 4), axis=0, return_inverse=True)
+    indices = indices.reshape(-1, 3)
+    edges = np.sort(np.concatenate([indices[:, [0, 1]], indices[:, [1, 2]], indices[:, [2, 0]]]), axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    if (counts != 2).any():
+        raise ValueError(f"La malla no es cerrada: {int((counts != 2).sum())} aristas no las comparten dos triángulos")
+
+
+def mesh_to_stl(triangles, name="marcador"):
+    """
+    Escribe una malla como STL binario.
+
+    Args:
+        triangles (np.ndarray): Triángulos (N, 3, 3) en milímetros.
+        name (str): Nombre guardado en la cabecera.
+
+    Returns:
+        bytes: Archivo STL.
+    """
+    cross = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    normals = cross / np.maximum(np.linalg.norm(cross, axis=1, keepdims=True), 1e-12)
+
+    records = np.zeros(len(triangles), dtype=[("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+    records["normal"] = normals
+    records["vertices"] = triangles
+    header = name.encode("ascii", "replace")[:80].ljust(80, b" ")
+    return header + struct.pack("<I", len(triangles)) + records.tobytes()
+
+
+def mesh_to_3mf(triangles, name="marcador"):
+    """
+    Escribe una malla como paquete 3MF (unidades en milímetros, vértices compartidos).
+
+    Args:
+        triangles (np.ndarray): Triángulos (N, 3, 3) en milímetros.
+        name (str): Nombre del objeto.
+
+    Returns:
+        bytes: Archivo 3MF.
+    """
+    vertices, indices = np.unique(np.round(triangles.reshape(-1, 3), 4), axis=0, return_inverse=True)
+    indices = indices.reshape(-1, 3)
+
+    model = io.StringIO()
+    model.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<model unit="millimeter" xml:lang="es-ES" '
+        'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+        f'<resources><object id="1" name="{name}" type="model"><mesh><vertices>\n'
+    )
+    model.writelines(f'<vertex x="{x:g}" y="{y:g}" z="{z:g}"/>\n' for x, y, z in vertices.tolist())
+    model.write("</vertices><triangles>\n")
+    model.writelines(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>\n' for a, b, c in indices.tolist())
+    model.write('</triangles></mesh></object></resources>\n<build><item objectid="1"/></build>\n</model>\n')
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", THREEMF_CONTENT_TYPES)
+        package.writestr("_rels/.rels", THREEMF_RELATIONSHIPS)
+        package.writestr("3D/3dmodel.model", model.getvalue())
+    return output.getvalue()
+
+
+def export_marker_mesh(fmt, style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2,
+                       size_mm=100.0, base_mm=2.0, relief_mm=1.0, detail=2):
+    """
+    Exporta un marcador con relieve como STL o 3MF.
+
+    Args:
+        fmt (str): "stl" o "3mf".
+        style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+        atomic_number (int): Número atómico del elemento.
+        show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+        show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        size_mm (float): Lado del marcador completo (con borde) en milímetros.
+        base_mm (float): Grosor de la base en milímetros.
+        relief_mm (float): Altura del relieve sobre la base en milímetros.
+        detail (int): Resolución del texto (RELIEF_GRID_UNIT * detail vóxeles por lado).
+
+    Returns:
+        bytes: Archivo exportado.
+    """
+    if fmt not in MESH_FORMATS:
+        raise ValueError(f"Formato 3D no soportado: {fmt}")
+    mask = relief_mask(
+        style, atomic_number, show_symbol=show_symbol,
+        show_atomic_number=show_atomic_number, symbol_size=symbol_size, detail=detail
+    )
+    triangles = build_relief_mesh(mask, size_mm=size_mm, base_mm=base_mm, relief_mm=relief_mm)
+    symbol, _, _ = _generator.get_element_by_atomic_number(atomic_number)
+    name = f"marcador_{atomic_number:03d}_{symbol}"
+    if fmt == "stl":
+        return mesh_to_stl(triangles, name)
+    return mesh_to_3mf(triangles, name)
@@ -0,0 +1,307 @@
+"""
+Hojas imprimibles con varios marcadores RA por página (PDF vectorial).
+
+Distribuye un conjunto de elementos en páginas A4 o Carta a uno o varios tamaños físicos,
+con marcas de corte en las esquinas de cada marcador y una etiqueta con el elemento debajo.
+
+Cada marcador se dibuja una sola vez como geometría vectorial (`vector_export.marker_shapes`)
+en un pool de procesos y se escribe en el PDF como Form XObject a medida que llega; las
+páginas solo lo colocan a cada tamaño. Como mucho hay `max_pending` marcadores en vuelo y
+cada objeto se escribe en cuanto está listo, así que la memoria no crece con el número de
+páginas aunque se pidan los 118 elementos a varios tamaños:
+
+    python sheet_composer.py hojas.pdf --style qr --sizes 40 60 --page A4
+"""
+import argparse
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from marker_generator import MARKER_STYLE_QR, MARKER_STYLES, ElementARMarkerGenerator
+from vector_export import MATRIX_DECIMALS, POINTS_PER_MM, PdfWriter, format_number, marker_shapes, pdf_path_operators
+
+PAGE_SIZES_MM = {
+    "A4": (210.0, 297.0),
+    "Carta": (215.9, 279.4),
+}
+SHEET_MARGIN_MM = 10.0
+SHEET_GAP_MM = 8.0  # Separación entre marcadores (deja sitio a las marcas de corte)
+LABEL_HEIGHT_MM = 5.0  # Franja de la etiqueta bajo cada marcador (dentro del corte)
+LABEL_FONT_MM = 2.5
+LABEL_CHAR_WIDTH = 0.56  # Ancho medio de un carácter de Helvetica, en fracciones del tamaño de la fuente
+CUT_MARK_MM = 3.0
+CUT_MARK_OFFSET_MM = 1.0  # Distancia entre la esquina y el inicio de cada marca
+CUT_MARK_WIDTH_MM = 0.15
+
+# Objetos fijos del documento; después vienen un Form XObject por elemento y dos objetos por página
+CATALOG_OBJECT = 1
+PAGES_OBJECT = 2
+FONT_OBJECT = 3
+FIRST_FORM_OBJECT = 4
+
+_generator = None
+
+
+def _get_generator():
+    """Retorna el generador del proceso actual, creándolo la primera vez."""
+    global _generator
+    if _generator is None:
+        _generator = ElementARMarkerGenerator()
+    return _generator
+
+
+def sheet_grid(page, size_mm):
+    """
+    Calcula cuántos marcadores de un tamaño caben por página.
+
+    Args:
+        page (str): Clave de PAGE_SIZES_MM.
+        size_mm (float): Lado del marcador completo (con borde) en milímetros.
+
+    Returns:
+        tuple: (columnas, filas).
+    """
+    page_width, page_height = PAGE_SIZES_MM[page]
+    columns = int((page_width - 2 * SHEET_MARGIN_MM + SHEET_GAP_MM) // (size_mm + SHEET_GAP_MM))
+    rows = int((page_height - 2 * SHEET_MARGIN_MM + SHEET_GAP_MM) // (size_mm + LABEL_HEIGHT_MM + SHEET_GAP_MM))
+    return columns, rows
+
+
+def plan_sheets(atomic_numbers, sizes_mm, page="A4"):
+    """
+    Reparte los marcadores en páginas, una serie de páginas por tamaño.
+
+    Args:
+        atomic_numbers (list): Números atómicos a imprimir.
+        sizes_mm (list): Lados de los marcadores en milímetros (todos los elementos en cada tamaño).
+        page (str): Clave de PAGE_SIZES_MM.
+
+    Returns:
+        list: Páginas (tamaño, [(número atómico, x, y), ...]) con la esquina inferior izquierda
+        de cada marcador en milímetros desde la esquina inferior izquierda de la página.
+
+    Raises:
+        ValueError: Si algún número atómico está fuera de rango o algún tamaño no cabe en la página.
+    """
+    element_count = len(_get_generator().elements)
+    invalid = [number for number in atomic_numbers if not 1 <= number <= element_count]
+    if invalid:
+        raise ValueError(f"Número atómico fuera de rango (1-{element_count}): {invalid[0]}")
+
+    page_width, page_height = PAGE_SIZES_MM[page]
+    pages = []
+    for size_mm in sizes_mm:
+        columns, rows = sheet_grid(page, size_mm)
+        if columns < 1 or rows < 1:
+            raise ValueError(f"Un marcador de {size_mm:g} mm no cabe en una página {page}")
+
+        # Rejilla centrada en la página
+        tile_height = size_mm + LABEL_HEIGHT_MM
+        left = (page_width - columns * size_mm - (columns - 1) * SHEET_GAP_MM) / 2
+        top = (page_height + rows * tile_height + (rows - 1) * SHEET_GAP_MM) / 2
+        per_page = columns * rows
+        for start in range(0, len(atomic_numbers), per_page):
+            placements = []
+            for index, atomic_number in enumerate(atomic_numbers[start:start + per_page]):
+                row, column = divmod(index, columns)
+                x = left + column * (size_mm + SHEET_GAP_MM)
+                y = top - row * (tile_height + SHEET_GAP_MM) - size_mm
+                placements.append((atomic_number, x, y))
+            pages.append((size_mm, placements))
+    return pages
+
+
+def _pdf_text(text):
+    """Escapa un texto como cadena literal PDF (el flujo se codifica en WinAnsi para Helvetica)."""
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def _cut_marks(x0, y0, x1, y1):
+    """Retorna los segmentos de las marcas de corte en las cuatro esquinas de un rectángulo."""
+    segments = []
+    for corner_x, direction_x in ((x0, -1), (x1, 1)):
+        for corner_y, direction_y in ((y0, -1), (y1, 1)):
+            start_x = corner_x + direction_x * CUT_MARK_OFFSET_MM
+            start_y = corner_y + direction_y * CUT_MARK_OFFSET_MM
+            # Prolongación horizontal y vertical de los lados que forman la esquina
+            segments.append((start_x, corner_y, start_x + direction_x * CUT_MARK_MM, corner_y))
+            segments.append((corner_x, start_y, corner_x, start_y + direction_y * CUT_MARK_MM))
+    return segments
+
+
+def render_marker_form(task):
+    """
+    Dibuja un marcador como contenido de un Form XObject (función de trabajo del pool).
+
+    Args:
+        task (tuple): (estilo, número atómico, mostrar símbolo, mostrar número, tamaño del símbolo).
+
+    Returns:
+        tuple: (lado del marcador en píxeles, operadores de trazado comprimidos con Flate).
+    """
+    style, atomic_number, show_symbol, show_atomic_number, symbol_size = task
+    canvas_size, paths = marker_shapes(
+        style, atomic_number, show_symbol=show_symbol,
+        show_atomic_number=show_atomic_number, symbol_size=symbol_size
+    )
+    return canvas_size, zlib.compress("\n".join(pdf_path_operators(paths)).encode(), 9)
+
+
+def page_content(size_mm, placements, canvas_size):
+    """
+    Compone el contenido de una página: marcadores (Form XObjects /M<número>), etiquetas y marcas de corte.
+
+    Args:
+        size_mm (float): Lado de los marcadores de la página en milímetros.
+        placements (list): Colocaciones (número atómico, x, y) de `plan_sheets`.
+        canvas_size (int): Lado del marcador en píxeles (sistema de coordenadas de los Form XObjects).
+
+    Returns:
+        bytes: Flujo de contenido sin comprimir.
+    """
+    generator = _get_generator()
+    unit = format_number(POINTS_PER_MM, MATRIX_DECIMALS)
+    scale = format_number(size_mm / canvas_size, MATRIX_DECIMALS)
+    inverse_scale = format_number(-size_mm / canvas_size, MATRIX_DECIMALS)
+
+    # Unidades de usuario en milímetros con el origen en la esquina inferior izquierda
+    parts = [f"{unit} 0 0 {unit} 0 0 cm 0 g {format_number(CUT_MARK_WIDTH_MM)} w"]
+    for atomic_number, x, y in placements:
+        symbol, name, _ = generator.get_element_by_atomic_number(atomic_number)
+        # Píxeles del marcador (y hacia abajo) a milímetros de la página
+        parts.append(
+            f"q {scale} 0 0 {inverse_scale} {format_number(x)} {format_number(y + size_mm)} cm /M{atomic_number} Do Q"
+        )
+
+        label = f"{atomic_number} · {symbol} · {name} · {size_mm:g} mm"
+        if len(label) * LABEL_CHAR_WIDTH * LABEL_FONT_MM > size_mm - 2:
+            label = f"{atomic_number} · {symbol}"
+        label_y = y - LABEL_HEIGHT_MM + (LABEL_HEIGHT_MM - LABEL_FONT_MM) / 2
+        parts.append(
+            f"BT /F1 {format_number(LABEL_FONT_MM)} Tf {format_number(x + 1)} {format_number(label_y)} Td "
+            f"{_pdf_text(label)} Tj ET"
+        )
+
+        segments = _cut_marks(x, y - LABEL_HEIGHT_MM, x + size_mm, y + size_mm)
+        parts.append(" ".join(
+            f"{format_number(x0)} {format_number(y0)} m {format_number(x1)} {format_number(y1)} l"
+            for x0, y0, x1, y1 in segments
+        ) + " S")
+    return "\n".join(parts).encode("cp1252", errors="replace")
+
+
+def write_sheet_pdf(output, atomic_numbers, style, show_symbol=True, show_atomic_number=True, symbol_size=2,
+                    sizes_mm=(50.0,), page="A4", max_workers=None, max_pending=None, progress=None):
+    """
+    Compone las hojas y las escribe como un único PDF a medida que se dibujan.
+
+    Cada marcador se dibuja una sola vez como Form XObject, en paralelo y con como mucho
+    `max_pending` en vuelo, y se escribe en cuanto llega; las páginas solo lo colocan a cada
+    tamaño, así que ni el PDF ni la memoria crecen con el número de tamaños.
+
+    Args:
+        output: Archivo binario donde escribir el PDF (solo se usa `write`).
+        atomic_numbers (list): Números atómicos a imprimir.
+        style (str): Estilo del marcador.
+        show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+        show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        sizes_mm (list): Lados de los marcadores en milímetros.
+        page (str): Clave de PAGE_SIZES_MM.
+        max_workers (int): Procesos del pool (por defecto, uno por núcleo).
+        max_pending (int): Marcadores en vuelo como máximo (por defecto, cuatro por proceso).
+        progress (callable): Función opcional llamada con (pasos completados, total), donde los
+            pasos son los marcadores dibujados más las páginas escritas.
+
+    Returns:
+        int: Número de páginas escritas.
+
+    Raises:
+        ValueError: Si algún número atómico está fuera de rango o algún tamaño no cabe en la
+            página; se comprueba antes de arrancar el pool y de escribir nada en `output`.
+    """
+    pages = plan_sheets(atomic_numbers, sizes_mm, page)
+    elements = list(dict.fromkeys(atomic_numbers))
+    max_workers = max_workers or os.cpu_count() or 1
+    max_pending = max_pending or 4 * max_workers
+    page_width, page_height = (format_number(value * POINTS_PER_MM) for value in PAGE_SIZES_MM[page])
+    total_steps = len(elements) + len(pages)
+
+    writer = PdfWriter(output)
+    writer.add_object(CATALOG_OBJECT, f"<< /Type /Catalog /Pages {PAGES_OBJECT} 0 R >>")
+    writer.add_object(
+        FONT_OBJECT, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    )
+
+    # Un Form XObject por elemento, escritos en orden a medida que se dibujan
+    form_objects = {}
+    canvas_size = None
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        tasks = iter([(style, number, show_symbol, show_atomic_number, symbol_size) for number in elements])
+        pending = deque()
+        for index, atomic_number in enumerate(elements):
+            # Mantener la ventana llena sin adelantar más de max_pending marcadores
+            while len(pending) < max_pending:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                pending.append(executor.submit(render_marker_form, task))
+
+            canvas_size, content = pending.popleft().result()
+            form_objects[atomic_number] = FIRST_FORM_OBJECT + index
+            writer.add_stream(
+                form_objects[atomic_number], content, compressed=True,
+                dictionary=f"/Type /XObject /Subtype /Form /BBox [0 0 {canvas_size} {canvas_size}]"
+            )
+            if progress:
+                progress(index + 1, total_steps)
+
+    # Páginas: solo colocan los marcadores, así que se componen en el proceso principal
+    page_objects = []
+    first_page_object = FIRST_FORM_OBJECT + len(elements)
+    for index, (size_mm, placements) in enumerate(pages):
+        content_object = first_page_object + 2 * index
+        writer.add_stream(content_object, page_content(size_mm, placements, canvas_size))
+        forms = " ".join(f"/M{number} {form_objects[number]} 0 R" for number, _, _ in placements)
+        writer.add_object(
+            content_object + 1,
+            f"<< /Type /Page /Parent {PAGES_OBJECT} 0 R /MediaBox [0 0 {page_width} {page_height}] "
+            f"/Resources << /Font << /F1 {FONT_OBJECT} 0 R >> /XObject << {forms} >> >> "
+            f"/Contents {content_object} 0 R >>"
+        )
+        page_objects.append(content_object + 1)
+        if progress:
+            progress(len(elements) + index + 1, total_steps)
+
+    kids = " ".join(f"{number} 0 R" for number in page_objects)
+    writer.add_object(PAGES_OBJECT, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_objects)} >>")
+    writer.close(root=CATALOG_OBJECT)
+    return len(pages)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compone hojas imprimibles con varios marcadores RA.")
+    parser.add_argument("output", help="Archivo PDF de salida")
+    parser.add_argument("--style", choices=MARKER_STYLES, default=MARKER_STYLE_QR)
+    parser.add_argument("--elements", type=int, nargs="*", help="Números atómicos (por defecto, los 118)")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[50.0], help="Lados de los marcadores en mm")
+    parser.add_argument("--page", choices=sorted(PAGE_SIZES_MM), default="A4")
+    parser.add_argument("--hide-symbol", action="store_true")
+    parser.add_argument("--hide-number", action="store_true")
+    parser.add_argument("--symbol-size", type=int, choices=(2, 3, 4), default=2)
+    args = parser.parse_args()
+
+    elements = args.elements or [number for _, _, number in _get_generator().elements]
+    try:
+        # Valida los elementos y los tamaños antes de crear el archivo de salida
+        plan_sheets(elements, args.sizes, args.page)
+    except ValueError as error:
+        parser.error(str(error))
+    with open(args.output, "wb") as pdf_file:
+        page_count = write_sheet_pdf(
+            pdf_file, elements, args.style, show_symbol=not args.hide_symbol,
+            show_atomic_number=not args.hide_number, symbol_size=args.symbol_size,
+            sizes_mm=args.sizes, page=args.page
+        )
+    print(f"{args.output}: {len(elements)} marcadores x {len(args.sizes)} tamaños en {page_count} páginas {args.page}")
@@ -0,0 +1,210 @@
+"""
+Regresión de los generadores por hilo (`seeded_rng`) frente a la semilla global de NumPy.
+
+Las funciones `legacy_*` reproducen el recorrido celda a celda del generador original,
+que llamaba a `np.random.seed` y `np.random.random()` sobre el estado global; las matrices
+de los 118 elementos en los estilos QR y tradicional deben coincidir exactamente. Los
+marcadores de la familia deben identificarse con ArUco con cualquier opción de texto.
+
+Uso:
+    python -m pytest test_marker_generator.py
+"""
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from marker_family import check_family_decoding
+from marker_generator import MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL, ElementARMarkerGenerator
+
+ATOMIC_NUMBERS = range(1, 119)
+
+# Opciones del estilo tradicional: (mostrar símbolo, mostrar número, tamaño del símbolo)
+TRADITIONAL_OPTIONS = [(False, False, 2), (False, True, 2)] + [
+    (True, show_number, size) for show_number in (False, True) for size in (2, 3, 4)
+]
+
+
+def legacy_corner_pattern(atomic_number, corner_index):
+    np.random.seed(atomic_number + (1000, 2000, 3000)[corner_index])
+    pattern = [
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 0, 0, 1],
+        [1, 0, 1, 1, 1, 0, 1],
+        [1, 0, 1, 1, 1, 0, 1],
+        [1, 0, 1, 1, 1, 0, 1],
+        [1, 0, 0, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1, 1, 1],
+    ]
+    for i in range(2, 5):
+        for j in range(2, 5):
+            if np.random.random() > 0.5:
+                pattern[i][j] = 1 - pattern[i][j]
+    # Cadena if/elif del generador original, copiada tal cual (independiente de CORNER_MODIFICATIONS)
+    mod_val = (atomic_number + corner_index * 37) % 12
+    if mod_val == 0:
+        pattern[2][2] = 0
+        pattern[4][4] = 0
+    elif mod_val == 1:
+        pattern[2][3] = 0
+        pattern[3][2] = 0
+    elif mod_val == 2:
+        pattern[3][3] = 0
+        pattern[2][4] = 1
+    elif mod_val == 3:
+        pattern[2][2] = 1
+        pattern[3][4] = 0
+    elif mod_val == 4:
+        pattern[4][2] = 0
+        pattern[4][3] = 1
+    elif mod_val == 5:
+        pattern[2][3] = 1
+        pattern[4][3] = 0
+    elif mod_val == 6:
+        pattern[3][2] = 1
+        pattern[3][4] = 1
+    elif mod_val == 7:
+        pattern[2][4] = 0
+        pattern[4][2] = 1
+    elif mod_val == 8:
+        pattern[2][2] = 1
+        pattern[2][4] = 0
+        pattern[4][4] = 1
+    elif mod_val == 9:
+        pattern[3][3] = 1
+        pattern[4][3] = 0
+    elif mod_val == 10:
+        pattern[2][3] = 0
+        pattern[3][4] = 1
+        pattern[4][2] = 0
+    else:
+        pattern[2][2] = 0
+        pattern[3][3] = 1
+        pattern[4][4] = 0
+    return pattern
+
+
+def legacy_qr_grid(atomic_number):
+    grid_size = 16
+    grid = np.zeros((grid_size, grid_size), dtype=bool)
+    for corner_index, (corner_x, corner_y) in enumerate([(0, 0), (grid_size - 7, 0), (0, grid_size - 7)]):
+        pattern = legacy_corner_pattern(atomic_number, corner_index)
+        for i in range(7):
+            for j in range(7):
+                if pattern[i][j] == 1:
+                    grid[corner_x + i, corner_y + j] = True
+
+    center_x, center_y = grid_size // 2 - 2, grid_size // 2 - 2
+    np.random.seed(atomic_number + 5000)
+    for i in range(5):
+        for j in range(5):
+            if i in (0, 4) or j in (0, 4) or np.random.random() > 0.3 + (atomic_number % 5) * 0.1:
+                grid[center_x + i, center_y + j] = True
+
+    np.random.seed(atomic_number + 10000)
+    for i in range(grid_size):
+        for j in range(grid_size):
+            if ((i < 7 and j < 7) or (i >= grid_size - 7 and j < 7) or (i < 7 and j >= grid_size - 7)
+                    or (center_x <= i < center_x + 5 and center_y <= j < center_y + 5)):
+                continue
+            if np.random.random() > 0.45 + (atomic_number % 7) * 0.02:
+                grid[i, j] = True
+    return grid
+
+
+def legacy_element_grid(atomic_number, show_symbol, show_atomic_number, symbol_size):
+    grid_size = 8
+    grid = np.zeros((grid_size, grid_size), dtype=bool)
+    np.random.seed(atomic_number)
+    for i in range(grid_size):
+        for j in range(grid_size):
+            if show_symbol and i < symbol_size and j < symbol_size:
+                continue
+            if show_atomic_number and i >= grid_size - 2 and j >= grid_size - 2:
+                continue
+            if np.random.random() > 0.5:
+                grid[i, j] = True
+    return grid
+
+
+def all_cases():
+    """Casos (estilo, número atómico, opciones) de los dos estilos con semilla por elemento."""
+    cases = [(MARKER_STYLE_QR, number, None) for number in ATOMIC_NUMBERS]
+    cases += [(MARKER_STYLE_TRADITIONAL, number, options)
+              for number, options in itertools.product(ATOMIC_NUMBERS, TRADITIONAL_OPTIONS)]
+    return cases
+
+
+def new_grid(generator, style, atomic_number, options):
+    if style == MARKER_STYLE_QR:
+        return generator.generate_qr_grid(atomic_number)
+    return generator.generate_element_grid(atomic_number, *options)
+
+
+def legacy_grid(style, atomic_number, options):
+    if style == MARKER_STYLE_QR:
+        return legacy_qr_grid(atomic_number)
+    return legacy_element_grid(atomic_number, *options)
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return ElementARMarkerGenerator()
+
+
+@pytest.fixture(scope="module")
+def legacy_grids():
+    return {case: legacy_grid(*case) for case in all_cases()}
+
+
+def test_grids_match_global_seed_stream(generator, legacy_grids):
+    for (style, atomic_number, options), expected in legacy_grids.items():
+        assert np.array_equal(new_grid(generator, style, atomic_number, options), expected), (
+            style, atomic_number, options
+        )
+
+
+def test_codebook_grids_match_global_seed_stream(generator, legacy_grids):
+    for (style, atomic_number, options), expected in legacy_grids.items():
+        show_symbol, show_atomic_number, symbol_size = options or (True, True, 2)
+        grid = generator.get_grid(style, atomic_number, show_symbol, show_atomic_number, symbol_size)
+        assert np.array_equal(grid, expected), (style, atomic_number, options)
+
+
+def test_generation_does_not_touch_global_state(generator):
+    np.random.seed(12345)
+    expected = np.random.random(4)
+    np.random.seed(12345)
+    for style, atomic_number, options in all_cases()[:50]:
+        new_grid(generator, style, atomic_number, options)
+    assert np.array_equal(np.random.random(4), expected)
+
+
+def test_grids_are_thread_safe(generator, legacy_grids):
+    # Cada caso se genera varias veces desde hilos distintos mientras otro hilo resiembra
+    # el estado global de NumPy, que con la semilla global mezclaba las secuencias
+    cases = all_cases() * 4
+    reseeding = True
+
+    def reseed_global():
+        seed = 0
+        while reseeding:
+            np.random.seed(seed % 1000)
+            np.random.random()
+            seed += 1
+
+    with ThreadPoolExecutor(max_workers=9) as executor:
+        noise = executor.submit(reseed_global)
+        try:
+            grids = list(executor.map(lambda case: new_grid(generator, *case), cases, chunksize=16))
+        finally:
+            reseeding = False
+        noise.result()
+
+    for case, grid in zip(cases, grids):
+        assert np.array_equal(grid, legacy_grids[case]), case
+
+
+def test_family_markers_decode_with_every_overlay():
+    assert check_family_decoding() == []
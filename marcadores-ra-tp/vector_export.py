@@ -0,0 +1,327 @@
+"""
+Exportación vectorial (SVG y PDF) y rasterización a cualquier resolución de los marcadores RA.
+
+Cada marcador es una matriz de celdas más el texto del elemento, así que se describe como
+geometría en lugar de como un PNG de 480 px:
+
+- Cada región negra contigua de la matriz se convierte en un único trazado con su contorno
+  exterior y sus huecos (regla par-impar), en lugar de un rectángulo por celda.
+- El símbolo y el número se incrustan como contornos: se rasterizan OUTLINE_SCALE veces más
+  grandes con la misma posición que en el marcador y se vectorizan con OpenCV.
+
+El resultado ocupa unos pocos KB a cualquier tamaño de impresión, y la misma geometría se
+rasteriza directamente a la resolución que se necesite (por ejemplo, 600 DPI a 20 cm).
+"""
+import io
+import os
+import sys
+import zlib
+from functools import lru_cache
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# El perfil PNG se comparte con las demás aplicaciones desde la raíz del repositorio
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from glyph_atlas import text_mask
+from marker_generator import ElementARMarkerGenerator
+from png_profile import encode_png
+
+OUTLINE_SCALE = 8  # Sobremuestreo del texto antes de vectorizarlo
+OUTLINE_TOLERANCE = 0.75  # Error máximo de la simplificación, en píxeles sobremuestreados
+POINTS_PER_MM = 72 / 25.4
+RASTER_SUBPIXEL_BITS = 4  # Precisión subpíxel de cv2.fillPoly
+MATRIX_DECIMALS = 6  # Decimales de las matrices de transformación PDF
+
+_generator = ElementARMarkerGenerator()
+
+
+def _grid_loops(cells, cell_size, origin):
+    """
+    Traza los contornos de una región de celdas contiguas.
+
+    Args:
+        cells (np.ndarray): Máscara booleana [fila][columna] de las celdas de la región.
+        cell_size (int): Lado de cada celda en píxeles del marcador.
+        origin (int): Desplazamiento (borde blanco) de la matriz en el marcador.
+
+    Returns:
+        list: Lazos cerrados de vértices (x, y), solo en las esquinas.
+    """
+    padded = np.pad(cells, 1)
+    edges = {}
+    # Aristas orientadas en sentido horario alrededor de la región (y hacia abajo)
+    for row, col in zip(*np.nonzero(cells)):
+        r, c = row + 1, col + 1
+        if not padded[r - 1, c]:
+            edges.setdefault((col, row), []).append((col + 1, row))
+        if not padded[r, c + 1]:
+            edges.setdefault((col + 1, row), []).append((col + 1, row + 1))
+        if not padded[r + 1, c]:
+            edges.setdefault((col + 1, row + 1), []).append((col, row + 1))
+        if not padded[r, c - 1]:
+            edges.setdefault((col, row + 1), []).append((col, row))
+
+    loops = []
+    while edges:
+        start = next(iter(edges))
+        loop = [start]
+        vertex = start
+        while True:
+            targets = edges[vertex]
+            following = targets.pop()
+            if not targets:
+                del edges[vertex]
+            if following == start:
+                break
+            loop.append(following)
+            vertex = following
+
+        # Quitar los vértices intermedios de los tramos rectos
+        corners = [
+            point for index, point in enumerate(loop)
+            if (point[0] - loop[index - 1][0], point[1] - loop[index - 1][1])
+            != (loop[(index + 1) % len(loop)][0] - point[0], loop[(index + 1) % len(loop)][1] - point[1])
+        ]
+        loops.append([(origin + x * cell_size, origin + y * cell_size) for x, y in corners])
+    return loops
+
+
+def _text_loops(spec, canvas_size):
+    """Vectoriza un texto del marcador como lazos de vértices en píxeles del marcador."""
+    y0, x0, mask = text_mask(spec, canvas_size, OUTLINE_SCALE)
+    if not mask.size:
+        return []
+    contours, _ = cv2.findContours(mask.astype(np.uint8), cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    loops = []
+    for contour in contours:
+        contour = cv2.approxPolyDP(contour, OUTLINE_TOLERANCE, True).reshape(-1, 2)
+        if len(contour) >= 3:
+            loops.append([((x + x0 + 0.5) / OUTLINE_SCALE, (y + y0 + 0.5) / OUTLINE_SCALE) for x, y in contour])
+    return loops
+
+
+@lru_cache(maxsize=256)
+def marker_shapes(style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2):
+    """
+    Calcula la geometría de un marcador: un trazado por región negra y por texto.
+
+    Args:
+        style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+        atomic_number (int): Número atómico del elemento.
+        show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+        show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+
+    Returns:
+        tuple: (lado del marcador en píxeles, lista de trazados); cada trazado es una lista
+        de lazos de vértices (x, y) que se rellena con la regla par-impar. Se guarda en
+        caché, así que no debe modificarse.
+    """
+    symbol, _, atomic_number = _generator.get_element_by_atomic_number(atomic_number)
+    canvas_size = _generator.marker_size + 2 * _generator.border_size
+    grid = _generator.get_visible_grid(
+        style, atomic_number, show_symbol=show_symbol,
+        show_atomic_number=show_atomic_number, symbol_size=symbol_size
+    )
+    cell_size = _generator.marker_size // grid.shape[0]
+
+    # Regiones conectadas por sus lados (la matriz se indexa grid[x][y])
+    count, labels = cv2.connectedComponents(grid.T.astype(np.uint8), connectivity=4)
+    paths = [_grid_loops(labels == label, cell_size, _generator.border_size) for label in range(1, count)]
+
+    _, texts = _generator.get_overlay(
+        style, symbol, atomic_number, show_symbol=show_symbol,
+        show_atomic_number=show_atomic_number, symbol_size=symbol_size
+    )
+    for spec in texts:
+        loops = _text_loops(spec, canvas_size)
+        if loops:
+            paths.append(loops)
+    return canvas_size, paths
+
+
+def format_number(value, decimals=2):
+    """Formatea un número con `decimals` decimales como máximo y sin ceros sobrantes."""
+    return f"{value:.{decimals}f}".rstrip("0").rstrip(".")
+
+
+def shapes_to_svg(canvas_size, paths, size_mm):
+    """
+    Escribe la geometría de un marcador como SVG.
+
+    Args:
+        canvas_size (int): Lado del marcador en píxeles (viewBox).
+        paths (list): Trazados de `marker_shapes`.
+        size_mm (float): Lado impreso del marcador completo (con borde) en milímetros.
+
+    Returns:
+        bytes: Documento SVG.
+    """
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{format_number(size_mm)}mm" height="{format_number(size_mm)}mm" '
+        f'viewBox="0 0 {canvas_size} {canvas_size}">',
+        f'<rect width="{canvas_size}" height="{canvas_size}" fill="#fff"/>',
+        '<g fill="#000" fill-rule="evenodd">',
+    ]
+    for loops in paths:
+        data = "".join(
+            "M" + "L".join(f"{format_number(x)} {format_number(y)}" for x, y in loop) + "Z" for loop in loops
+        )
+        parts.append(f'<path d="{data}"/>')
+    parts.append("</g></svg>")
+    return "\n".join(parts).encode()
+
+
+def pdf_path_operators(paths):
+    """
+    Convierte la geometría de un marcador en operadores de trazado PDF (relleno par-impar).
+
+    Args:
+        paths (list): Trazados de `marker_shapes`, en píxeles del marcador.
+
+    Returns:
+        list: Líneas del flujo de contenido; se dibujan con la matriz de transformación vigente.
+    """
+    commands = []
+    for loops in paths:
+        for loop in loops:
+            (x, y), rest = loop[0], loop[1:]
+            commands.append(f"{format_number(x)} {format_number(y)} m " + " ".join(f"{format_number(x)} {format_number(y)} l" for x, y in rest) + " h")
+        commands.append("f*")
+    return commands
+
+
+class PdfWriter:
+    """
+    Escribe un PDF objeto a objeto en un archivo binario, sin mantener el documento en memoria.
+
+    Los objetos pueden escribirse en cualquier orden; la tabla de referencias cruzadas se
+    construye con las posiciones registradas al cerrar el documento.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.offsets = {}
+        self.position = 0
+        self._write(b"%PDF-1.4\n")
+
+    def _write(self, data):
+        self.output.write(data)
+        self.position += len(data)
+
+    def add_object(self, number, body):
+        """Escribe el objeto `number` con el cuerpo indicado (bytes o str)."""
+        if isinstance(body, str):
+            body = body.encode()
+        self.offsets[number] = self.position
+        self._write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    def add_stream(self, number, content, compressed=False, dictionary=""):
+        """Escribe un flujo comprimiéndolo con Flate (si no lo está ya), con entradas extra en su diccionario."""
+        if not compressed:
+            content = zlib.compress(content, 9)
+        entries = f"{dictionary} " if dictionary else ""
+        self.add_object(
+            number, f"<< {entries}/Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode() + content + b"\nendstream"
+        )
+
+    def close(self, root=1):
+        """Escribe la tabla de referencias cruzadas y el trailer; `root` es el catálogo."""
+        size = max(self.offsets) + 1
+        xref_offset = self.position
+        lines = [f"xref\n0 {size}\n0000000000 65535 f \n"]
+        lines += [f"{self.offsets[number]:010d} 00000 n \n" for number in range(1, size)]
+        lines.append(f"trailer\n<< /Size {size} /Root {root} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        self._write("".join(lines).encode())
+
+
+def shapes_to_pdf(canvas_size, paths, size_mm):
+    """
+    Escribe la geometría de un marcador como un PDF de una página del tamaño del marcador.
+
+    Args:
+        canvas_size (int): Lado del marcador en píxeles.
+        paths (list): Trazados de `marker_shapes`.
+        size_mm (float): Lado impreso del marcador completo (con borde) en milímetros.
+
+    Returns:
+        bytes: Documento PDF.
+    """
+    page_size = size_mm * POINTS_PER_MM
+    scale = page_size / canvas_size
+    # Coordenadas del marcador (y hacia abajo) a puntos PDF (y hacia arriba)
+    commands = [
+        f"{format_number(scale, MATRIX_DECIMALS)} 0 0 {format_number(-scale, MATRIX_DECIMALS)} 0 "
+        f"{format_number(page_size, MATRIX_DECIMALS)} cm",
+        "0 g",
+    ]
+    commands += pdf_path_operators(paths)
+
+    output = io.BytesIO()
+    writer = PdfWriter(output)
+    writer.add_object(1, "<< /Type /Catalog /Pages 2 0 R >>")
+    writer.add_object(2, "<< /Type /Pages /Kids [3 0 R] /Count 1 >>")
+    writer.add_object(
+        3, f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {format_number(page_size)} {format_number(page_size)}] "
+        f"/Contents 4 0 R /Resources << >> >>"
+    )
+    writer.add_stream(4, "\n".join(commands).encode())
+    writer.close()
+    return output.getvalue()
+
+
+def shapes_to_raster(canvas_size, paths, size_px):
+    """
+    Rasteriza la geometría de un marcador directamente al tamaño indicado.
+
+    Args:
+        canvas_size (int): Lado del marcador en píxeles de la geometría.
+        paths (list): Trazados de `marker_shapes`.
+        size_px (int): Lado de la imagen de salida en píxeles.
+
+    Returns:
+        np.ndarray: Imagen en escala de grises (uint8) en blanco y negro.
+    """
+    image = np.full((size_px, size_px), 255, dtype=np.uint8)
+    factor = size_px / canvas_size * (1 << RASTER_SUBPIXEL_BITS)
+    for loops in paths:
+        polygons = [np.round(np.array(loop) * factor).astype(np.int32) for loop in loops]
+        cv2.fillPoly(image, polygons, 0, lineType=cv2.LINE_8, shift=RASTER_SUBPIXEL_BITS)
+    return image
+
+
+def export_marker(fmt, style, atomic_number, show_symbol=True, show_atomic_number=True, symbol_size=2,
+                  size_mm=100.0, dpi=600):
+    """
+    Exporta un marcador en formato vectorial o como PNG de alta resolución.
+
+    Args:
+        fmt (str): "svg", "pdf" o "png".
+        style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+        atomic_number (int): Número atómico del elemento.
+        show_symbol (bool): Indica si se debe mostrar el símbolo del elemento.
+        show_atomic_number (bool): Indica si se debe mostrar el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        size_mm (float): Lado impreso del marcador completo (con borde) en milímetros.
+        dpi (int): Resolución del PNG (se ignora en SVG y PDF).
+
+    Returns:
+        bytes: Archivo exportado.
+    """
+    canvas_size, paths = marker_shapes(
+        style, atomic_number, show_symbol=show_symbol,
+        show_atomic_number=show_atomic_number, symbol_size=symbol_size
+    )
+    if fmt == "svg":
+        return shapes_to_svg(canvas_size, paths, size_mm)
+    if fmt == "pdf":
+        return shapes_to_pdf(canvas_size, paths, size_mm)
+    if fmt == "png":
+        size_px = round(size_mm / 25.4 * dpi)
+        return encode_png(Image.fromarray(shapes_to_raster(canvas_size, paths, size_px)), dpi=dpi)
+    raise ValueError(f"Formato de exportación no soportado: {fmt}")
@@ -0,0 +1,340 @@
+"""
+Reconocimiento de marcadores RA en vídeos grabados.
+
+Lee los fotogramas de un vídeo local, detecta e identifica los marcadores de los elementos
+en cada uno y mide con qué rapidez y fiabilidad se reconoce cada elemento.
+
+- Las plantillas de referencia se generan con ElementARMarkerGenerator, así que los resultados
+  quedan ligados a MARKER_GENERATOR_VERSION.
+- Estilos QR y tradicional: los descriptores ORB de las 118 plantillas forman un índice LSH
+  (FLANN); cada fotograma vota por plantillas y los candidatos se verifican con una
+  homografía RANSAC.
+- Familia ArUco: se usa directamente cv2.aruco.ArucoDetector con el diccionario de la familia.
+- La detección corre en un pool de hilos (OpenCV libera el GIL). En modo tiempo real los
+  fotogramas se leen al ritmo del vídeo y se descartan los que llegan con el pool saturado.
+
+Uso desde la línea de comandos (detecciones por fotograma en JSON Lines y resumen en pantalla):
+
+    python video_recognition.py clase.mp4 --style qr --workers 4 --realtime --output detecciones.jsonl
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from marker_family import build_aruco_dictionary
+from marker_generator import (
+    MARKER_GENERATOR_VERSION, MARKER_STYLE_FAMILY, MARKER_STYLE_QR, MARKER_STYLES, ElementARMarkerGenerator
+)
+
+TEMPLATE_SIZE = 240  # Lado de las plantillas (px), parecido al tamaño del marcador en cámara
+TEMPLATE_FEATURES = 500
+FRAME_FEATURES = 1000
+RATIO_TEST = 0.8
+MIN_INLIERS = 10
+MAX_MARKERS_PER_FRAME = 4
+RANSAC_THRESHOLD_PX = 5.0
+
+# Índice LSH de FLANN para descriptores binarios (FLANN_INDEX_LSH = 6)
+LSH_INDEX_PARAMS = dict(algorithm=6, table_number=6, key_size=12, multi_probe_level=1)
+LSH_SEARCH_PARAMS = dict(checks=32)
+
+# Un reconocedor por hilo del pool: los detectores y emparejadores de OpenCV no se comparten
+_thread_state = threading.local()
+
+
+@lru_cache(maxsize=None)
+def build_templates(style, show_symbol=True, show_atomic_number=True, symbol_size=2):
+    """
+    Calcula los descriptores ORB de las plantillas de los 118 elementos.
+
+    Args:
+        style (str): MARKER_STYLE_QR o MARKER_STYLE_TRADITIONAL.
+        show_symbol (bool): Indica si se muestra el símbolo del elemento.
+        show_atomic_number (bool): Indica si se muestra el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+
+    Returns:
+        tuple: (número atómico de cada descriptor, puntos (N, 2) en la plantilla, descriptores (N, 32)).
+    """
+    generator = ElementARMarkerGenerator()
+    orb = cv2.ORB_create(nfeatures=TEMPLATE_FEATURES)
+    owners, points, descriptors = [], [], []
+    for _, _, atomic_number in generator.elements:
+        marker = generator.generate_marker(
+            style, atomic_number, show_symbol=show_symbol,
+            show_atomic_number=show_atomic_number, symbol_size=symbol_size
+        )
+        template = cv2.resize(marker, (TEMPLATE_SIZE, TEMPLATE_SIZE), interpolation=cv2.INTER_AREA)
+        keypoints, template_descriptors = orb.detectAndCompute(template, None)
+        if template_descriptors is None:
+            continue
+        owners.append(np.full(len(keypoints), atomic_number))
+        points.append(np.float32([keypoint.pt for keypoint in keypoints]))
+        descriptors.append(template_descriptors)
+    return np.concatenate(owners), np.concatenate(points), np.concatenate(descriptors)
+
+
+def _template_corners():
+    """Esquinas del área del marcador (sin el borde blanco) en coordenadas de la plantilla."""
+    generator = ElementARMarkerGenerator()
+    border = TEMPLATE_SIZE * generator.border_size / (generator.marker_size + 2 * generator.border_size)
+    far = TEMPLATE_SIZE - border
+    return np.float32([[border, border], [far, border], [far, far], [border, far]]).reshape(-1, 1, 2)
+
+
+class MarkerRecognizer:
+    """Detecta e identifica marcadores de elementos en fotogramas en escala de grises."""
+
+    def __init__(self, style, show_symbol=True, show_atomic_number=True, symbol_size=2):
+        self.style = style
+        if style == MARKER_STYLE_FAMILY:
+            self.aruco = cv2.aruco.ArucoDetector(build_aruco_dictionary(), cv2.aruco.DetectorParameters())
+            return
+
+        self.owners, self.points, descriptors = build_templates(
+            style, show_symbol, show_atomic_number, symbol_size
+        )
+        self.corners = _template_corners()
+        self.orb = cv2.ORB_create(nfeatures=FRAME_FEATURES)
+        self.matcher = cv2.FlannBasedMatcher(LSH_INDEX_PARAMS, LSH_SEARCH_PARAMS)
+        self.matcher.add([descriptors])
+        self.matcher.train()
+
+    def detect(self, gray):
+        """
+        Detecta los marcadores de un fotograma.
+
+        Args:
+            gray (np.ndarray): Fotograma en escala de grises.
+
+        Returns:
+            list: Diccionarios con 'atomic_number', 'corners' (4 puntos [x, y] en el fotograma,
+            empezando por la esquina superior izquierda del marcador) y 'score' (inliers o bits).
+        """
+        if self.style == MARKER_STYLE_FAMILY:
+            return self._detect_aruco(gray)
+        return self._detect_templates(gray)
+
+    def _detect_aruco(self, gray):
+        corners, ids, _ = self.aruco.detectMarkers(gray)
+        if ids is None:
+            return []
+        return [
+            {"atomic_number": int(marker_id) + 1, "corners": marker_corners.reshape(4, 2).round(1).tolist(), "score": None}
+            for marker_id, marker_corners in zip(np.ravel(ids), corners)
+        ]
+
+    def _detect_templates(self, gray):
+        keypoints, descriptors = self.orb.detectAndCompute(gray, None)
+        if descriptors is None or len(keypoints) < MIN_INLIERS:
+            return []
+
+        # Votación: emparejamientos que pasan el test de razón, agrupados por plantilla
+        good = [
+            pair[0] for pair in self.matcher.knnMatch(descriptors, k=2)
+            if len(pair) == 2 and pair[0].distance < RATIO_TEST * pair[1].distance
+        ]
+        if len(good) < MIN_INLIERS:
+            return []
+        train_indices = np.array([match.trainIdx for match in good])
+        query_points = np.float32([keypoints[match.queryIdx].pt for match in good])
+        owners = self.owners[train_indices]
+        votes = np.bincount(owners)
+
+        detections = []
+        for atomic_number in np.argsort(votes)[::-1]:
+            if votes[atomic_number] < MIN_INLIERS or len(detections) == MAX_MARKERS_PER_FRAME:
+                break
+            selected = owners == atomic_number
+            homography, inlier_mask = cv2.findHomography(
+                self.points[train_indices[selected]], query_points[selected], cv2.RANSAC, RANSAC_THRESHOLD_PX
+            )
+            if homography is None or int(inlier_mask.sum()) < MIN_INLIERS:
+                continue
+            corners = cv2.perspectiveTransform(self.corners, homography).reshape(4, 2)
+            detections.append({
+                "atomic_number": int(atomic_number),
+                "corners": corners.round(1).tolist(),
+                "score": int(inlier_mask.sum()),
+            })
+        return detections
+
+
+def _recognize_frame(frame, options):
+    """Función de trabajo del pool: detecta los marcadores de un fotograma BGR."""
+    recognizers = getattr(_thread_state, "recognizers", None)
+    if recognizers is None:
+        recognizers = _thread_state.recognizers = {}
+    if options not in recognizers:
+        recognizers[options] = MarkerRecognizer(*options)
+
+    start = time.perf_counter()
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    detections = recognizers[options].detect(gray)
+    finished = time.perf_counter()
+    return detections, finished - start, finished
+
+
+def _percentile_ms(values, percentile):
+    return round(1000 * float(np.percentile(values, percentile)), 2) if values else None
+
+
+def recognize_video(path, style, show_symbol=True, show_atomic_number=True, symbol_size=2,
+                    max_workers=None, max_pending=None, frame_step=1, realtime=False, on_frame=None):
+    """
+    Reconoce los marcadores de un vídeo y calcula estadísticas de rendimiento y fiabilidad.
+
+    Args:
+        path (str): Ruta del vídeo local.
+        style (str): MARKER_STYLE_QR, MARKER_STYLE_TRADITIONAL o MARKER_STYLE_FAMILY.
+        show_symbol (bool): Indica si los marcadores grabados muestran el símbolo.
+        show_atomic_number (bool): Indica si los marcadores grabados muestran el número atómico.
+        symbol_size (int): Tamaño del símbolo en celdas (solo estilo tradicional).
+        max_workers (int): Hilos del pool (por defecto, uno por núcleo).
+        max_pending (int): Fotogramas en proceso como máximo (por defecto, 2 por hilo).
+        frame_step (int): Procesar uno de cada frame_step fotogramas (1 o mayor).
+        realtime (bool): Leer al ritmo del vídeo y descartar fotogramas si el pool está lleno;
+            si es False se espera a que haya hueco y no se descarta ninguno.
+        on_frame (callable): Función opcional llamada en orden con el resultado de cada
+            fotograma procesado (diccionario con 'frame', 'time_s', 'detections',
+            'latency_ms' y 'processing_ms').
+
+    Returns:
+        dict: Resumen con fotogramas leídos/procesados/descartados, rendimiento, latencias y,
+        por elemento, detecciones, primera aparición y tasa de detección.
+    """
+    if int(frame_step) < 1:
+        raise ValueError(f"frame_step debe ser 1 o mayor: {frame_step}")
+    frame_step = int(frame_step)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * max_workers
+    options = (style, bool(show_symbol), bool(show_atomic_number), int(symbol_size))
+    if style != MARKER_STYLE_FAMILY:
+        build_templates(*options)  # Una sola vez, antes de arrancar el reloj
+
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise ValueError(f"No se pudo abrir el vídeo: {path}")
+    fps = capture.get(cv2.CAP_PROP_FPS) or 0.0
+
+    frames_read = frames_dropped = 0
+    latencies, processing_times = [], []
+    elements = {}
+    pending = deque()  # (fotograma, instante de lectura, futuro) en orden de lectura
+
+    def emit_ready(block=False):
+        # Emite los resultados en orden de fotograma a medida que terminan
+        while pending and (block or pending[0][2].done()):
+            frame_index, read_at, future = pending.popleft()
+            detections, processing_s, finished = future.result()
+            time_s = frame_index / fps if fps else None
+            latencies.append(finished - read_at)
+            processing_times.append(processing_s)
+            for detection in detections:
+                stats = elements.setdefault(detection["atomic_number"], {"detections": 0, "first_seen_s": time_s})
+                stats["detections"] += 1
+            if on_frame:
+                on_frame({
+                    "frame": frame_index,
+                    "time_s": None if time_s is None else round(time_s, 3),
+                    "detections": detections,
+                    "latency_ms": round(1000 * (finished - read_at), 2),
+                    "processing_ms": round(1000 * processing_s, 2),
+                })
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            frame_index = frames_read
+            frames_read += 1
+            if realtime and fps:
+                # Simula una cámara en vivo: no leer más rápido que el vídeo original
+                delay = started + frame_index / fps - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if frame_index % frame_step:
+                continue
+
+            emit_ready()
+            in_flight = [future for _, _, future in pending if not future.done()]
+            if len(in_flight) >= max_pending:
+                if realtime:
+                    frames_dropped += 1
+                    continue
+                wait(in_flight, return_when=FIRST_COMPLETED)
+            pending.append((frame_index, time.perf_counter(), executor.submit(_recognize_frame, frame, options)))
+        emit_ready(block=True)
+    elapsed = time.perf_counter() - started
+    capture.release()
+
+    frames_processed = len(latencies)
+    generator = ElementARMarkerGenerator()
+    return {
+        "video": path,
+        "style": style,
+        "generator_version": MARKER_GENERATOR_VERSION,
+        "video_fps": round(fps, 3),
+        "frames_read": frames_read,
+        "frames_processed": frames_processed,
+        "frames_skipped": frames_read - frames_processed - frames_dropped,
+        "frames_dropped": frames_dropped,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_fps": round(frames_processed / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "mean": round(1000 * float(np.mean(latencies)), 2) if latencies else None,
+            "p50": _percentile_ms(latencies, 50),
+            "p95": _percentile_ms(latencies, 95),
+            "max": _percentile_ms(latencies, 100),
+        },
+        "processing_ms_mean": round(1000 * float(np.mean(processing_times)), 2) if processing_times else None,
+        "elements": {
+            atomic_number: {
+                "symbol": generator.get_element_by_atomic_number(atomic_number)[0],
+                "detections": stats["detections"],
+                "first_seen_s": None if stats["first_seen_s"] is None else round(stats["first_seen_s"], 3),
+                "detection_rate": round(stats["detections"] / frames_processed, 3),
+            }
+            for atomic_number, stats in sorted(elements.items())
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconoce marcadores RA de elementos en un vídeo.")
+    parser.add_argument("video")
+    parser.add_argument("--style", choices=MARKER_STYLES, default=MARKER_STYLE_QR)
+    parser.add_argument("--hide-symbol", action="store_true")
+    parser.add_argument("--hide-number", action="store_true")
+    parser.add_argument("--symbol-size", type=int, choices=(2, 3, 4), default=2)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-pending", type=int, default=None)
+    parser.add_argument("--frame-step", type=int, default=1)
+    parser.add_argument("--realtime", action="store_true", help="Leer al ritmo del vídeo y descartar fotogramas bajo carga")
+    parser.add_argument("--output", default=None, help="Archivo JSON Lines con las detecciones por fotograma")
+    args = parser.parse_args()
+    if args.frame_step < 1:
+        parser.error("--frame-step debe ser 1 o mayor")
+
+    output_file = open(args.output, "w", encoding="utf-8") if args.output else None
+    try:
+        summary = recognize_video(
+            args.video, args.style, show_symbol=not args.hide_symbol, show_atomic_number=not args.hide_number,
+            symbol_size=args.symbol_size, max_workers=args.workers, max_pending=args.max_pending,
+            frame_step=args.frame_step, realtime=args.realtime,
+            on_frame=(lambda result: output_file.write(json.dumps(result) + "\n")) if output_file else None
+        )
+    finally:
+        if output_file:
+            output_file.close()
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
@@ -0,0 +1,191 @@
+"""
+Tabla periódica compartida por las aplicaciones de química del repositorio.
+
+Una única tabla inmutable de los 118 elementos, construida una sola vez al importar el módulo
+(cada proceso comparte la misma copia), con índices precalculados:
+
+- Por número atómico, símbolo y nombre normalizado (sin tildes ni mayúsculas), en O(1).
+  Los nombres alternativos que usaban las aplicaciones (p. ej. "Hassio") siguen resolviendo.
+- Pertenencia a categorías como máscaras de bits (bit n = número atómico n).
+- Búsqueda por prefijo de nombre, símbolo o número para los selectores, con bisección sobre
+  una lista ordenada de claves.
+
+Las aplicaciones viven en subdirectorios del repositorio y añaden su raíz a `sys.path` para
+importar este módulo.
+"""
+import operator
+import unicodedata
+from bisect import bisect_left
+from collections import namedtuple
+from types import MappingProxyType
+
+# Elemento de la tabla: se desempaqueta como (símbolo, nombre, número atómico)
+Element = namedtuple("Element", ["symbol", "name", "atomic_number"])
+
+ELEMENTS = tuple(Element(symbol, name, number) for number, (symbol, name) in enumerate((
+    ("H", "Hidrógeno"), ("He", "Helio"), ("Li", "Litio"), ("Be", "Berilio"), ("B", "Boro"),
+    ("C", "Carbono"), ("N", "Nitrógeno"), ("O", "Oxígeno"), ("F", "Flúor"), ("Ne", "Neón"),
+    ("Na", "Sodio"), ("Mg", "Magnesio"), ("Al", "Aluminio"), ("Si", "Silicio"), ("P", "Fósforo"),
+    ("S", "Azufre"), ("Cl", "Cloro"), ("Ar", "Argón"), ("K", "Potasio"), ("Ca", "Calcio"),
+    ("Sc", "Escandio"), ("Ti", "Titanio"), ("V", "Vanadio"), ("Cr", "Cromo"), ("Mn", "Manganeso"),
+    ("Fe", "Hierro"), ("Co", "Cobalto"), ("Ni", "Níquel"), ("Cu", "Cobre"), ("Zn", "Zinc"),
+    ("Ga", "Galio"), ("Ge", "Germanio"), ("As", "Arsénico"), ("Se", "Selenio"), ("Br", "Bromo"),
+    ("Kr", "Kriptón"), ("Rb", "Rubidio"), ("Sr", "Estroncio"), ("Y", "Itrio"), ("Zr", "Zirconio"),
+    ("Nb", "Niobio"), ("Mo", "Molibdeno"), ("Tc", "Tecnecio"), ("Ru", "Rutenio"), ("Rh", "Rodio"),
+    ("Pd", "Paladio"), ("Ag", "Plata"), ("Cd", "Cadmio"), ("In", "Indio"), ("Sn", "Estaño"),
+    ("Sb", "Antimonio"), ("Te", "Telurio"), ("I", "Yodo"), ("Xe", "Xenón"), ("Cs", "Cesio"),
+    ("Ba", "Bario"), ("La", "Lantano"), ("Ce", "Cerio"), ("Pr", "Praseodimio"), ("Nd", "Neodimio"),
+    ("Pm", "Prometio"), ("Sm", "Samario"), ("Eu", "Europio"), ("Gd", "Gadolinio"), ("Tb", "Terbio"),
+    ("Dy", "Disprosio"), ("Ho", "Holmio"), ("Er", "Erbio"), ("Tm", "Tulio"), ("Yb", "Iterbio"),
+    ("Lu", "Lutecio"), ("Hf", "Hafnio"), ("Ta", "Tántalo"), ("W", "Wolframio"), ("Re", "Renio"),
+    ("Os", "Osmio"), ("Ir", "Iridio"), ("Pt", "Platino"), ("Au", "Oro"), ("Hg", "Mercurio"),
+    ("Tl", "Talio"), ("Pb", "Plomo"), ("Bi", "Bismuto"), ("Po", "Polonio"), ("At", "Astato"),
+    ("Rn", "Radón"), ("Fr", "Francio"), ("Ra", "Radio"), ("Ac", "Actinio"), ("Th", "Torio"),
+    ("Pa", "Protactinio"), ("U", "Uranio"), ("Np", "Neptunio"), ("Pu", "Plutonio"), ("Am", "Americio"),
+    ("Cm", "Curio"), ("Bk", "Berkelio"), ("Cf", "Californio"), ("Es", "Einstenio"), ("Fm", "Fermio"),
+    ("Md", "Mendelevio"), ("No", "Nobelio"), ("Lr", "Lawrencio"), ("Rf", "Rutherfordio"), ("Db", "Dubnio"),
+    ("Sg", "Seaborgio"), ("Bh", "Bohrio"), ("Hs", "Hasio"), ("Mt", "Meitnerio"), ("Ds", "Darmstadtio"),
+    ("Rg", "Roentgenio"), ("Cn", "Copernicio"), ("Nh", "Nihonio"), ("Fl", "Flerovio"), ("Mc", "Moscovio"),
+    ("Lv", "Livermorio"), ("Ts", "Teneso"), ("Og", "Oganesón"),
+), start=1))
+
+# Nombres alternativos aceptados en las búsquedas (grafías usadas antes por las aplicaciones)
+NAME_ALIASES = MappingProxyType({
+    "Promecio": 61,
+    "Tantalio": 73,
+    "Hassio": 108,
+    "Tungsteno": 74,
+})
+
+# Clasificación de elementos por categorías (números atómicos)
+CATEGORIES = MappingProxyType({
+    "Metales Alcalinos (6 elementos)": (3, 11, 19, 37, 55, 87),
+    "Metales Alcalinotérreos (6 elementos)": (4, 12, 20, 38, 56, 88),
+    "Metales de Transición (34 elementos)": (
+        21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 39, 40, 41, 42, 43, 44, 45, 46, 47, 48,
+        72, 73, 74, 75, 76, 77, 78, 79, 80, 104, 105, 106, 107, 108,
+    ),
+    "Metales Post-Transición (12 elementos)": (13, 31, 49, 50, 81, 82, 83, 84, 113, 114, 115, 116),
+    "Metaloides (7 elementos)": (5, 14, 32, 33, 51, 52, 85),
+    "No Metales Reactivos (9 elementos)": (1, 6, 7, 8, 9, 15, 16, 17, 34),
+    "Gases Nobles (6 elementos)": (2, 10, 18, 36, 54, 86),
+    "Lantánidos (15 elementos)": tuple(range(57, 72)),
+    "Actínidos (15 elementos)": tuple(range(89, 104)),
+    "Propiedades Químicas Desconocidas (4 elementos)": (112, 113, 114, 118),
+})
+
+
+def normalize_name(text):
+    """Normaliza un nombre para buscarlo: sin tildes, sin espacios en los extremos y en minúsculas."""
+    decomposed = unicodedata.normalize("NFKD", text.strip())
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def numbers_to_mask(atomic_numbers):
+    """Convierte números atómicos en una máscara de bits (bit n = número atómico n)."""
+    mask = 0
+    for atomic_number in atomic_numbers:
+        mask |= 1 << atomic_number
+    return mask
+
+
+def mask_to_numbers(mask):
+    """Retorna los números atómicos de una máscara de bits, en orden creciente."""
+    numbers = []
+    while mask:
+        lowest = mask & -mask
+        numbers.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return tuple(numbers)
+
+
+# Índices precalculados (una sola vez por proceso)
+_BY_SYMBOL = MappingProxyType({element.symbol: element for element in ELEMENTS})
+_BY_SYMBOL_FOLDED = MappingProxyType({element.symbol.casefold(): element for element in ELEMENTS})
+_BY_NAME = MappingProxyType({
+    **{normalize_name(alias): ELEMENTS[number - 1] for alias, number in NAME_ALIASES.items()},
+    **{normalize_name(element.name): element for element in ELEMENTS},
+})
+CATEGORY_MASKS = MappingProxyType({category: numbers_to_mask(numbers) for category, numbers in CATEGORIES.items()})
+
+# Claves de búsqueda ordenadas (nombre, alias, símbolo y número) -> número atómico
+_SEARCH_KEYS = tuple(sorted(
+    {(normalize_name(element.name), element.atomic_number) for element in ELEMENTS}
+    | {(normalize_name(alias), number) for alias, number in NAME_ALIASES.items()}
+    | {(element.symbol.casefold(), element.atomic_number) for element in ELEMENTS}
+    | {(str(element.atomic_number), element.atomic_number) for element in ELEMENTS}
+))
+
+
+def element_by_number(atomic_number):
+    """Retorna el elemento con ese número atómico (int o entero de NumPy), o None si no existe."""
+    try:
+        index = operator.index(atomic_number)
+    except TypeError:
+        return None
+    return ELEMENTS[index - 1] if 1 <= index <= len(ELEMENTS) else None
+
+
+def element_by_symbol(symbol):
+    """Retorna el elemento con ese símbolo (se admite otra capitalización), o None si no existe."""
+    return _BY_SYMBOL.get(symbol) or _BY_SYMBOL_FOLDED.get(symbol.strip().casefold())
+
+
+def element_by_name(name):
+    """Retorna el elemento con ese nombre o alias (sin distinguir tildes ni mayúsculas), o None."""
+    return _BY_NAME.get(normalize_name(name))
+
+
+def lookup(text):
+    """
+    Identifica un elemento escrito como número atómico, símbolo o nombre.
+
+    Args:
+        text (str): Texto introducido por el usuario, p. ej. "26", "Fe" o "hierro".
+
+    Returns:
+        Element: El elemento, o None si el texto no identifica ninguno.
+    """
+    text = text.strip()
+    if text.isdigit():
+        return element_by_number(int(text))
+    return element_by_symbol(text) or element_by_name(text)
+
+
+def category_numbers(category):
+    """Retorna los números atómicos de una categoría, en orden creciente."""
+    return mask_to_numbers(CATEGORY_MASKS[category])
+
+
+def categories_of(atomic_number):
+    """Retorna las categorías a las que pertenece un elemento."""
+    bit = 1 << atomic_number
+    return tuple(category for category, mask in CATEGORY_MASKS.items() if mask & bit)
+
+
+def search(prefix, limit=None, mask=None):
+    """
+    Busca elementos cuyo nombre, alias, símbolo o número atómico empiece por el prefijo.
+
+    Args:
+        prefix (str): Texto escrito en el selector (sin distinguir tildes ni mayúsculas).
+        limit (int): Número máximo de resultados (por defecto, todos).
+        mask (int): Máscara de bits opcional para limitar la búsqueda (p. ej. una categoría).
+
+    Returns:
+        tuple: Elementos encontrados, ordenados por número atómico.
+    """
+    key = normalize_name(prefix)
+    if not key:
+        found = mask_to_numbers(mask) if mask is not None else range(1, len(ELEMENTS) + 1)
+        return tuple(ELEMENTS[number - 1] for number in found)[:limit]
+
+    # Las claves con el prefijo forman un tramo contiguo de la lista ordenada
+    matches = 0
+    for text, number in _SEARCH_KEYS[bisect_left(_SEARCH_KEYS, (key,)):]:
+        if not text.startswith(key):
+            break
+        matches |= 1 << number
+    if mask is not None:
+        matches &= mask
+    return tuple(ELEMENTS[number - 1] for number in mask_to_numbers(matches))[:limit]
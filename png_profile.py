@@ -0,0 +1,204 @@
+"""
+Perfil de codificación PNG compacto compartido por los generadores de imágenes del repositorio.
+
+Los generadores producen imágenes con muy poca información de color: los marcadores RA son
+grises (a menudo solo blanco y negro) y los símbolos químicos son texto negro con bordes
+suavizados sobre fondo transparente. Guardarlas tal cual como RGBA o RGB de 8 bits
+desperdicia bytes en cada descarga y en cada vista previa enviada al navegador.
+
+`encode_png` elige el modo más pequeño que conserva exactamente los píxeles:
+
+- Blanco y negro puro: 1 bit por píxel.
+- Gris opaco: L (8 bits).
+- Hasta 256 colores (incluido el alfa): paleta con transparencia (tRNS), cuya profundidad
+  baja a 1, 2 o 4 bits si hay pocos colores.
+- Gris con alfa y más de 256 combinaciones: LA.
+
+Cuando hay varias opciones fieles se codifican todas con `optimize=True` y se conserva la
+más pequeña. `png_report` compara el resultado con el PNG que se obtenía antes (la imagen
+guardada tal cual) para mostrar el ahorro; `encode_png_with_report` retorna a la vez los bytes
+y el informe.
+"""
+import io
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image
+
+# Colores máximos de una paleta PNG
+MAX_PALETTE_COLORS = 256
+
+# Hasta este número de píxeles se prueban todas las representaciones con alfa; por encima,
+# la paleta se usa directamente cuando cabe
+SMALL_IMAGE_PIXELS = 128 * 128
+
+
+class PngReport(namedtuple("PngReport", ["mode", "size", "baseline_size"])):
+    """Resultado de la codificación compacta: modo elegido, bytes y bytes del PNG sin optimizar."""
+
+    __slots__ = ()
+
+    @property
+    def saved_bytes(self):
+        return self.baseline_size - self.size
+
+    @property
+    def saved_ratio(self):
+        return self.saved_bytes / self.baseline_size if self.baseline_size else 0.0
+
+    def describe(self):
+        """Texto breve para la interfaz, p. ej. "3.9 KB (P, −28 %)"."""
+        return f"{self.size / 1024:.1f} KB ({self.mode}, −{self.saved_ratio:.0%})"
+
+
+def _exact_palette(pixels, has_alpha):
+    """
+    Convierte un arreglo de píxeles en una imagen de paleta sin pérdida.
+
+    Args:
+        pixels (np.ndarray): Arreglo (alto, ancho, canales) de uint8: L, LA, RGB o RGBA.
+        has_alpha (bool): Si el último canal es el alfa.
+
+    Returns:
+        PIL.Image: Imagen en modo P (con transparencia si hay alfa), o None si hay más de 256 colores.
+    """
+    channels = pixels.shape[2]
+    packed = np.zeros(pixels.shape[:2], dtype=np.uint32)
+    for channel in range(channels):
+        packed = (packed << 8) | pixels[..., channel]
+
+    if channels <= 2:
+        # Gris (con o sin alfa): histograma directo en lugar de ordenar los píxeles
+        present = np.bincount(packed.ravel(), minlength=1 << (8 * channels)) > 0
+        colors = np.flatnonzero(present).astype(np.uint32)
+        if len(colors) > MAX_PALETTE_COLORS:
+            return None
+        indices = (np.cumsum(present) - 1)[packed]
+    else:
+        colors, indices = np.unique(packed, return_inverse=True)
+        if len(colors) > MAX_PALETTE_COLORS:
+            return None
+
+    palette = np.stack([(colors >> (8 * (channels - 1 - channel))) & 0xFF for channel in range(channels)], axis=1)
+    palette = palette.astype(np.uint8)
+    color, alpha = (palette[:, :-1], palette[:, -1]) if has_alpha else (palette, None)
+    if color.shape[1] == 1:
+        color = np.repeat(color, 3, axis=1)
+    image = Image.fromarray(indices.reshape(pixels.shape[:2]).astype(np.uint8), "P")
+    image.putpalette(color.tobytes())
+    if alpha is not None:
+        image.info["transparency"] = alpha.tobytes()
+    return image
+
+
+def compact_candidates(image):
+    """
+    Retorna las representaciones sin pérdida más compactas de una imagen.
+
+    Args:
+        image (PIL.Image): Imagen en modo 1, L, LA, RGB, RGBA o P.
+
+    Returns:
+        list: Imágenes candidatas (todas con los mismos píxeles que la original).
+    """
+    if image.mode == "1":
+        return [image]
+    if image.mode == "P":
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    if image.mode not in ("L", "LA", "RGB", "RGBA"):
+        return [image]
+
+    pixels = np.asarray(image)
+    if pixels.ndim == 2:
+        pixels = pixels[..., np.newaxis]
+    has_alpha = image.mode in ("LA", "RGBA")
+    if has_alpha and pixels[..., -1].min() == 255:
+        pixels, has_alpha = pixels[..., :-1], False
+
+    color = pixels[..., :-1] if has_alpha else pixels
+    if color.shape[2] == 3 and (color[..., 0] == color[..., 1]).all() and (color[..., 1] == color[..., 2]).all():
+        pixels = np.concatenate([color[..., :1], pixels[..., 3:]], axis=2)
+    gray = pixels.shape[2] == (2 if has_alpha else 1)
+
+    if gray and not has_alpha:
+        levels = np.flatnonzero(np.bincount(pixels.ravel(), minlength=256))
+        if np.isin(levels, (0, 255)).all():
+            return [Image.fromarray(pixels[..., 0] > 127)]
+        candidates = [Image.fromarray(pixels[..., 0], "L")]
+    elif gray:
+        candidates = [Image.fromarray(pixels, "LA")]
+    else:
+        candidates = [Image.fromarray(pixels, "RGBA" if has_alpha else "RGB")]
+
+    # Con alfa, la paleta (1 byte por píxel frente a 2 o 4) gana salvo en imágenes pequeñas,
+    # donde pesan más las tablas PLTE y tRNS
+    palette_image = _exact_palette(np.ascontiguousarray(pixels), has_alpha)
+    if palette_image is not None:
+        if has_alpha and pixels.shape[0] * pixels.shape[1] > SMALL_IMAGE_PIXELS:
+            return [palette_image]
+        candidates.append(palette_image)
+    return candidates
+
+
+def _save(image, dpi=None, optimize=True):
+    buffer = io.BytesIO()
+    options = {"optimize": optimize}
+    if dpi:
+        options["dpi"] = (dpi, dpi)
+    image.save(buffer, format="PNG", **options)
+    return buffer.getvalue()
+
+
+def _encode(image, dpi=None):
+    """Retorna (modo, bytes) de la candidata más pequeña."""
+    return min(
+        ((candidate.mode, _save(candidate, dpi)) for candidate in compact_candidates(image)),
+        key=lambda encoded: len(encoded[1])
+    )
+
+
+def encode_png(image, dpi=None):
+    """
+    Codifica una imagen como PNG en el modo más pequeño que conserva sus píxeles.
+
+    Args:
+        image (PIL.Image): Imagen a codificar.
+        dpi (int): Resolución a incrustar en el archivo (opcional).
+
+    Returns:
+        bytes: PNG optimizado.
+    """
+    return _encode(image, dpi)[1]
+
+
+def encode_png_with_report(image, dpi=None):
+    """
+    Codifica una imagen con el perfil compacto y la compara con el PNG guardado tal cual.
+
+    Las cachés guardan el informe junto a los bytes para no renderizar ni codificar de nuevo
+    la imagen solo para mostrar el ahorro.
+
+    Args:
+        image (PIL.Image): Imagen a codificar.
+        dpi (int): Resolución a incrustar en el archivo (opcional).
+
+    Returns:
+        tuple: (PNG optimizado, PngReport con el modo elegido, el tamaño compacto y el tamaño
+        del PNG sin optimizar).
+    """
+    mode, data = _encode(image, dpi)
+    return data, PngReport(mode, len(data), len(_save(image, dpi, optimize=False)))
+
+
+def png_report(image, dpi=None):
+    """
+    Codifica una imagen con el perfil compacto y la compara con el PNG guardado tal cual.
+
+    Args:
+        image (PIL.Image): Imagen a codificar.
+        dpi (int): Resolución a incrustar en el archivo (opcional).
+
+    Returns:
+        PngReport: Modo elegido, tamaño compacto y tamaño del PNG sin optimizar.
+    """
+    return encode_png_with_report(image, dpi)[1]
@@ -1,8 +1,25 @@
 import streamlit as st
-from PIL import Image, ImageDraw, ImageFont
 import io
+import os
+import sys
+from functools import partial
 import base64
 
+# Tabla periódica compartida con las demás aplicaciones (en la raíz del repositorio)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from downloads import download_button
+from periodic_table import ELEMENTS, element_by_number
+from renderizado import TAMANO_PREDETERMINADO, informe_png, iniciar_precalentamiento, obtener_png, pixeles_para_impresion
+from exportacion import TAMANOS_ICONOS, construir_zip_iconos
+from vectorial import FORMATOS_VECTORIALES, exportar_vectorial, vectorial_disponible
+
+# Tamaños del PNG: lados en píxeles o resoluciones de impresión
+TAMANOS_PNG = (128, 256, TAMANO_PREDETERMINADO, 512, 1024, 2048)
+DPI_IMPRESION = (150, 300, 600)
+
 # Configuración de la página
 st.set_page_config(
     page_title="Generador de Símbolos Químicos",
@@ -10,235 +27,15 @@ st.set_page_config(
     layout="centered"
 )
 
-# Diccionario de elementos químicos con su símbolo y número atómico
-ELEMENTOS = {
-    "Hidrógeno": {"simbolo": "H", "numero": 1},
-    "Helio": {"simbolo": "He", "numero": 2},
-    "Litio": {"simbolo": "Li", "numero": 3},
-    "Berilio": {"simbolo": "Be", "numero": 4},
-    "Boro": {"simbolo": "B", "numero": 5},
-    "Carbono": {"simbolo": "C", "numero": 6},
-    "Nitrógeno": {"simbolo": "N", "numero": 7},
-    "Oxígeno": {"simbolo": "O", "numero": 8},
-    "Flúor": {"simbolo": "F", "numero": 9},
-    "Neón": {"simbolo": "Ne", "numero": 10},
-    "Sodio": {"simbolo": "Na", "numero": 11},
-    "Magnesio": {"simbolo": "Mg", "numero": 12},
-    "Aluminio": {"simbolo": "Al", "numero": 13},
-    "Silicio": {"simbolo": "Si", "numero": 14},
-    "Fósforo": {"simbolo": "P", "numero": 15},
-    "Azufre": {"simbolo": "S", "numero": 16},
-    "Cloro": {"simbolo": "Cl", "numero": 17},
-    "Argón": {"simbolo": "Ar", "numero": 18},
-    "Potasio": {"simbolo": "K", "numero": 19},
-    "Calcio": {"simbolo": "Ca", "numero": 20},
-    "Escandio": {"simbolo": "Sc", "numero": 21},
-    "Titanio": {"simbolo": "Ti", "numero": 22},
-    "Vanadio": {"simbolo": "V", "numero": 23},
-    "Cromo": {"simbolo": "Cr", "numero": 24},
-    "Manganeso": {"simbolo": "Mn", "numero": 25},
-    "Hierro": {"simbolo": "Fe", "numero": 26},
-    "Cobalto": {"simbolo": "Co", "numero": 27},
-    "Níquel": {"simbolo": "Ni", "numero": 28},
-    "Cobre": {"simbolo": "Cu", "numero": 29},
-    "Zinc": {"simbolo": "Zn", "numero": 30},
-    "Galio": {"simbolo": "Ga", "numero": 31},
-    "Germanio": {"simbolo": "Ge", "numero": 32},
-    "Arsénico": {"simbolo": "As", "numero": 33},
-    "Selenio": {"simbolo": "Se", "numero": 34},
-    "Bromo": {"simbolo": "Br", "numero": 35},
-    "Kriptón": {"simbolo": "Kr", "numero": 36},
-    "Rubidio": {"simbolo": "Rb", "numero": 37},
-    "Estroncio": {"simbolo": "Sr", "numero": 38},
-    "Itrio": {"simbolo": "Y", "numero": 39},
-    "Zirconio": {"simbolo": "Zr", "numero": 40},
-    "Niobio": {"simbolo": "Nb", "numero": 41},
-    "Molibdeno": {"simbolo": "Mo", "numero": 42},
-    "Tecnecio": {"simbolo": "Tc", "numero": 43},
-    "Rutenio": {"simbolo": "Ru", "numero": 44},
-    "Rodio": {"simbolo": "Rh", "numero": 45},
-    "Paladio": {"simbolo": "Pd", "numero": 46},
-    "Plata": {"simbolo": "Ag", "numero": 47},
-    "Cadmio": {"simbolo": "Cd", "numero": 48},
-    "Indio": {"simbolo": "In", "numero": 49},
-    "Estaño": {"simbolo": "Sn", "numero": 50},
-    "Antimonio": {"simbolo": "Sb", "numero": 51},
-    "Telurio": {"simbolo": "Te", "numero": 52},
-    "Yodo": {"simbolo": "I", "numero": 53},
-    "Xenón": {"simbolo": "Xe", "numero": 54},
-    "Cesio": {"simbolo": "Cs", "numero": 55},
-    "Bario": {"simbolo": "Ba", "numero": 56},
-    "Lantano": {"simbolo": "La", "numero": 57},
-    "Cerio": {"simbolo": "Ce", "numero": 58},
-    "Praseodimio": {"simbolo": "Pr", "numero": 59},
-    "Neodimio": {"simbolo": "Nd", "numero": 60},
-    "Promecio": {"simbolo": "Pm", "numero": 61},
-    "Samario": {"simbolo": "Sm", "numero": 62},
-    "Europio": {"simbolo": "Eu", "numero": 63},
-    "Gadolinio": {"simbolo": "Gd", "numero": 64},
-    "Terbio": {"simbolo": "Tb", "numero": 65},
-    "Disprosio": {"simbolo": "Dy", "numero": 66},
-    "Holmio": {"simbolo": "Ho", "numero": 67},
-    "Erbio": {"simbolo": "Er", "numero": 68},
-    "Tulio": {"simbolo": "Tm", "numero": 69},
-    "Iterbio": {"simbolo": "Yb", "numero": 70},
-    "Lutecio": {"simbolo": "Lu", "numero": 71},
-    "Hafnio": {"simbolo": "Hf", "numero": 72},
-    "Tantalio": {"simbolo": "Ta", "numero": 73},
-    "Wolframio": {"simbolo": "W", "numero": 74},
-    "Renio": {"simbolo": "Re", "numero": 75},
-    "Osmio": {"simbolo": "Os", "numero": 76},
-    "Iridio": {"simbolo": "Ir", "numero": 77},
-    "Platino": {"simbolo": "Pt", "numero": 78},
-    "Oro": {"simbolo": "Au", "numero": 79},
-    "Mercurio": {"simbolo": "Hg", "numero": 80},
-    "Talio": {"simbolo": "Tl", "numero": 81},
-    "Plomo": {"simbolo": "Pb", "numero": 82},
-    "Bismuto": {"simbolo": "Bi", "numero": 83},
-    "Polonio": {"simbolo": "Po", "numero": 84},
-    "Astato": {"simbolo": "At", "numero": 85},
-    "Radón": {"simbolo": "Rn", "numero": 86},
-    "Francio": {"simbolo": "Fr", "numero": 87},
-    "Radio": {"simbolo": "Ra", "numero": 88},
-    "Actinio": {"simbolo": "Ac", "numero": 89},
-    "Torio": {"simbolo": "Th", "numero": 90},
-    "Protactinio": {"simbolo": "Pa", "numero": 91},
-    "Uranio": {"simbolo": "U", "numero": 92},
-    "Neptunio": {"simbolo": "Np", "numero": 93},
-    "Plutonio": {"simbolo": "Pu", "numero": 94},
-    "Americio": {"simbolo": "Am", "numero": 95},
-    "Curio": {"simbolo": "Cm", "numero": 96},
-    "Berkelio": {"simbolo": "Bk", "numero": 97},
-    "Californio": {"simbolo": "Cf", "numero": 98},
-    "Einstenio": {"simbolo": "Es", "numero": 99},
-    "Fermio": {"simbolo": "Fm", "numero": 100},
-    "Mendelevio": {"simbolo": "Md", "numero": 101},
-    "Nobelio": {"simbolo": "No", "numero": 102},
-    "Lawrencio": {"simbolo": "Lr", "numero": 103},
-    "Rutherfordio": {"simbolo": "Rf", "numero": 104},
-    "Dubnio": {"simbolo": "Db", "numero": 105},
-    "Seaborgio": {"simbolo": "Sg", "numero": 106},
-    "Bohrio": {"simbolo": "Bh", "numero": 107},
-    "Hassio": {"simbolo": "Hs", "numero": 108},
-    "Meitnerio": {"simbolo": "Mt", "numero": 109},
-    "Darmstadtio": {"simbolo": "Ds", "numero": 110},
-    "Roentgenio": {"simbolo": "Rg", "numero": 111},
-    "Copernicio": {"simbolo": "Cn", "numero": 112},
-    "Nihonio": {"simbolo": "Nh", "numero": 113},
-    "Flerovio": {"simbolo": "Fl", "numero": 114},
-    "Moscovio": {"simbolo": "Mc", "numero": 115},
-    "Livermorio": {"simbolo": "Lv", "numero": 116},
-    "Oganesón": {"simbolo": "Og", "numero": 118}
-}
-
-# Crear diccionario inverso: número atómico -> elemento
-NUMERO_A_ELEMENTO = {datos["numero"]: {"nombre": nombre, "simbolo": datos["simbolo"]} 
-                     for nombre, datos in ELEMENTOS.items()}
-
-def crear_imagen_elemento(simbolo, numero_atomico=None, mostrar_numero=False):
-    """
-    Crea una imagen PNG del símbolo del elemento químico.
-    
-    Args:
-        simbolo (str): Símbolo químico del elemento
-        numero_atomico (int): Número atómico del elemento
-        mostrar_numero (bool): Si mostrar o no el número atómico
-    
-    Returns:
-        PIL.Image: Imagen generada
-    """
-    # Dimensiones de la imagen
-    ancho, alto = 400, 400
-    
-    # Crear imagen con fondo transparente
-    imagen = Image.new('RGBA', (ancho, alto), (255, 255, 255, 0))  # Fondo transparente
-    draw = ImageDraw.Draw(imagen)
-    
-    # Intentar cargar fuentes con diferentes tamaños según la longitud del símbolo
-    longitud_simbolo = len(simbolo)
-    
-    # Ajustar tamaño de fuente según longitud del símbolo para que ocupe casi toda la imagen
-    if longitud_simbolo == 1:
-        tamano_fuente = 280  # Símbolos de una letra (H, C, N, etc.)
-    elif longitud_simbolo == 2:
-        tamano_fuente = 200  # Símbolos de dos letras (He, Li, etc.)
-    else:
-        tamano_fuente = 150  # Símbolos de tres letras (muy raros)
-    
-    try:
-        # Intentar cargar fuentes con el tamaño calculado
-        try:
-            fuente_simbolo = ImageFont.truetype("arial.ttf", tamano_fuente)
-        except:
-            try:
-                fuente_simbolo = ImageFont.truetype("DejaVuSans-Bold.ttf", tamano_fuente)
-            except:
-                # Crear una fuente por defecto más grande
-                fuente_simbolo = ImageFont.load_default()
-        
-        # Fuente para el número atómico
-        try:
-            fuente_numero = ImageFont.truetype("arial.ttf", 60)
-        except:
-            try:
-                fuente_numero = ImageFont.truetype("DejaVuSans.ttf", 60)
-            except:
-                fuente_numero = ImageFont.load_default()
-    except:
-        # Usar fuente por defecto si no se encuentran otras
-        fuente_simbolo = ImageFont.load_default()
-        fuente_numero = ImageFont.load_default()
-    
-    # Obtener dimensiones del texto del símbolo usando textbbox
-    bbox_simbolo = draw.textbbox((0, 0), simbolo, font=fuente_simbolo)
-    ancho_simbolo = bbox_simbolo[2] - bbox_simbolo[0]
-    alto_simbolo = bbox_simbolo[3] - bbox_simbolo[1]
-    
-    # Obtener el offset del texto (importante para centrado perfecto)
-    offset_x = bbox_simbolo[0]
-    offset_y = bbox_simbolo[1]
-    
-    # Calcular posición para centrar el símbolo PERFECTAMENTE
-    if mostrar_numero and numero_atomico:
-        # Si se muestra el número, centrar el símbolo
-        x_simbolo = (ancho - ancho_simbolo) // 2 - offset_x
-        y_simbolo = (alto - alto_simbolo) // 2 - offset_y
-        
-        # Dibujar el número atómico en la esquina superior derecha
-        numero_str = str(numero_atomico)
-        bbox_numero = draw.textbbox((0, 0), numero_str, font=fuente_numero)
-        ancho_numero = bbox_numero[2] - bbox_numero[0]
-        
-        # Posicionar el número en la esquina superior derecha con margen
-        x_numero = ancho - ancho_numero - 20
-        y_numero = 20
-        
-        draw.text((x_numero, y_numero), numero_str, fill='black', font=fuente_numero)
-    else:
-        # Solo símbolo, PERFECTAMENTE centrado compensando el offset
-        x_simbolo = (ancho - ancho_simbolo) // 2 - offset_x
-        y_simbolo = (alto - alto_simbolo) // 2 - offset_y
-    
-    # Dibujar el símbolo
-    draw.text((x_simbolo, y_simbolo), simbolo, fill='black', font=fuente_simbolo)
-    
-    return imagen
-
-def imagen_a_bytes(imagen):
-    """
-    Convierte una imagen PIL a bytes para descarga.
-    
-    Args:
-        imagen (PIL.Image): Imagen a convertir
-    
-    Returns:
-        bytes: Imagen en formato bytes
-    """
-    buffer = io.BytesIO()
-    imagen.save(buffer, format='PNG')
-    return buffer.getvalue()
+@st.cache_resource
+def precalentar_imagenes():
+    """Precalienta en segundo plano la caché de imágenes (una sola vez por servidor)."""
+    return iniciar_precalentamiento()
 
 def main():
+    # Las 236 imágenes del tamaño por defecto quedan listas sin bloquear la primera carga
+    precalentar_imagenes()
+
     # Título de la aplicación
     st.title("⚛️ Generador de Símbolos de Elementos Químicos")
     st.markdown("---")
@@ -265,16 +62,15 @@ def main():
         
         if modo_seleccion == "Por elemento químico":
             # Selector de elemento
-            elemento_seleccionado = st.selectbox(
+            elemento = st.selectbox(
                 "Selecciona un elemento químico:",
-                options=list(ELEMENTOS.keys()),
-                index=0
+                options=ELEMENTS,
+                index=0,
+                format_func=lambda elemento: elemento.name
             )
             
             # Obtener datos del elemento seleccionado
-            datos_elemento = ELEMENTOS[elemento_seleccionado]
-            simbolo_final = datos_elemento["simbolo"]
-            numero_final = datos_elemento["numero"]
+            simbolo_final, elemento_seleccionado, numero_final = elemento
             
         else:  # Por número atómico
             # Selector de número atómico
@@ -288,11 +84,9 @@ def main():
             )
             
             # Obtener datos del número seleccionado
-            if numero_seleccionado in NUMERO_A_ELEMENTO:
-                elemento_info = NUMERO_A_ELEMENTO[numero_seleccionado]
-                simbolo_final = elemento_info["simbolo"]
-                numero_final = numero_seleccionado
-                elemento_seleccionado = elemento_info["nombre"]
+            elemento = element_by_number(numero_seleccionado)
+            if elemento:
+                simbolo_final, elemento_seleccionado, numero_final = elemento
             else:
                 # Fallback (aunque no debería ocurrir)
                 simbolo_final = "X"
@@ -306,6 +100,28 @@ def main():
             index=0
         )
         
+        # Tamaño del PNG: en píxeles o como tamaño impreso a una resolución
+        modo_tamano = st.radio(
+            "📐 Tamaño del PNG:",
+            options=["En píxeles", "Para impresión (mm y DPI)"],
+            index=0,
+            horizontal=True
+        )
+        if modo_tamano == "En píxeles":
+            tamano_png = st.selectbox("Lado de la imagen (px):", options=TAMANOS_PNG, index=TAMANOS_PNG.index(TAMANO_PREDETERMINADO))
+            dpi_png = None
+        else:
+            tamano_mm = st.number_input("Lado impreso (mm):", min_value=5.0, max_value=300.0, value=50.0, step=5.0)
+            dpi_png = st.selectbox("Resolución (DPI):", options=DPI_IMPRESION, index=1)
+            tamano_png = pixeles_para_impresion(tamano_mm, dpi_png)
+            if tamano_png > max(TAMANOS_PNG):
+                # Se registra la resolución efectiva para que el PNG se imprima al tamaño elegido
+                tamano_png = max(TAMANOS_PNG)
+                dpi_png = round(tamano_png / tamano_mm * 25.4, 1)
+                st.warning(f"El PNG se limita a {tamano_png} px, es decir, {dpi_png:g} DPI a {tamano_mm:g} mm; "
+                           "para más resolución usa la descarga SVG o PDF.")
+            st.caption(f"PNG de {tamano_png} × {tamano_png} px a {dpi_png:g} DPI")
+        
         # Mostrar información del elemento seleccionado
         st.info(f"**Elemento:** {elemento_seleccionado}  \n**Símbolo:** {simbolo_final}  \n**Número atómico:** {numero_final}")
         
@@ -315,12 +131,14 @@ def main():
             incluir_numero = mostrar_numero == "Símbolo y número atómico"
             numero_a_usar = numero_final if incluir_numero else None
             
-            # Generar imagen
+            # Generar imagen (PNG ya codificado, desde la caché si estaba renderizado)
             with st.spinner("Generando imagen..."):
-                imagen = crear_imagen_elemento(
+                imagen = obtener_png(
                     simbolo=simbolo_final,
                     numero_atomico=numero_a_usar,
-                    mostrar_numero=incluir_numero
+                    mostrar_numero=incluir_numero,
+                    tamano=tamano_png,
+                    dpi=dpi_png
                 )
                 
                 # Guardar en session state
@@ -328,6 +146,9 @@ def main():
                 st.session_state.elemento_actual = elemento_seleccionado
                 st.session_state.simbolo_actual = simbolo_final
                 st.session_state.numero_usado = numero_a_usar if incluir_numero else None
+                st.session_state.informe_png = informe_png(
+                    simbolo_final, numero_a_usar, incluir_numero, tamano_png, dpi=dpi_png
+                )
     
     with col2:
         st.subheader("🖼️ Vista Previa")
@@ -340,30 +161,82 @@ def main():
                 use_container_width=True
             )
             
-            # Botón de descarga
-            imagen_bytes = imagen_a_bytes(st.session_state.imagen_generada)
-            
             # Crear nombre de archivo dinámico con el símbolo
             nombre_archivo = f"{st.session_state.simbolo_actual}.png"
             
-            st.download_button(
-                label="⬇️ Descargar PNG",
-                data=imagen_bytes,
-                file_name=nombre_archivo,
-                mime="image/png",
-                type="secondary"
+            download_button(
+                "⬇️ Descargar PNG", st.session_state.imagen_generada, nombre_archivo, type="secondary"
             )
             
+            # Descargas vectoriales (contornos de la fuente, escalables sin pérdida para pósteres);
+            # la fuente por defecto de Pillow no tiene contornos que exportar
+            if vectorial_disponible():
+                columnas_vectoriales = st.columns(len(FORMATOS_VECTORIALES))
+                for columna, formato in zip(columnas_vectoriales, FORMATOS_VECTORIALES):
+                    with columna:
+                        download_button(
+                            f"⬇️ Descargar {formato.upper()}",
+                            partial(
+                                exportar_vectorial,
+                                formato,
+                                st.session_state.simbolo_actual,
+                                st.session_state.numero_usado,
+                                bool(st.session_state.numero_usado)
+                            ),
+                            f"{st.session_state.simbolo_actual}.{formato}",
+                            type="secondary"
+                        )
+            else:
+                st.caption("Las descargas SVG y PDF necesitan una fuente TrueType (Arial o DejaVu Sans) instalada")
+            
             # Información adicional
             info_texto = f"**Elemento:** {st.session_state.elemento_actual}"
             if hasattr(st.session_state, 'numero_usado') and st.session_state.numero_usado:
                 info_texto += f" | **Número atómico:** {st.session_state.numero_usado}"
             
             st.info(info_texto)
+            st.caption(f"PNG compacto: {st.session_state.informe_png.describe()} frente al PNG RGBA sin optimizar")
             
         else:
             st.info("Haz clic en 'Generar Imagen' para crear tu símbolo químico.")
     
+    # Exportación masiva de todos los símbolos como iconos
+    with st.expander("📦 Exportar todos los símbolos (juego de iconos)", expanded=False):
+        st.markdown(
+            "Genera un ZIP con los 118 símbolos en varios tamaños. Cada símbolo se dibuja una vez "
+            "a la mayor resolución y los demás tamaños se obtienen reduciéndolo."
+        )
+        tamanos_iconos = st.multiselect(
+            "Tamaños (px):",
+            options=TAMANOS_ICONOS,
+            default=list(TAMANOS_ICONOS)
+        )
+        variantes_iconos = st.multiselect(
+            "Variantes:",
+            options=[False, True],
+            default=[False, True],
+            format_func=lambda mostrar: "Símbolo y número atómico" if mostrar else "Solo símbolo"
+        )
+        
+        if st.button("📦 Generar ZIP de iconos", disabled=not (tamanos_iconos and variantes_iconos)):
+            barra_progreso = st.progress(0)
+            buffer_zip = io.BytesIO()
+            total_iconos = construir_zip_iconos(
+                buffer_zip,
+                tamanos=tamanos_iconos,
+                variantes=variantes_iconos,
+                progreso=lambda hechos, total: barra_progreso.progress(hechos / total)
+            )
+            barra_progreso.empty()
+            st.session_state.zip_iconos = buffer_zip.getvalue()
+            st.success(f"✅ Se generaron {total_iconos} iconos")
+        
+        if "zip_iconos" in st.session_state:
+            download_button(
+                "⬇️ Descargar ZIP de iconos", st.session_state.zip_iconos, "simbolos_quimicos_iconos.zip",
+                type="secondary"
+            )
+    
     # Footer
     st.markdown("---")
     st.markdown(
@@ -0,0 +1,159 @@
+"""
+Exportación masiva de los símbolos químicos como juegos de iconos en varios tamaños.
+
+Cada símbolo se renderiza una sola vez al tamaño mayor y los tamaños menores se obtienen
+por reducciones sucesivas (cada uno a partir del anterior, con el alfa premultiplicado para
+que los bordes no se aclaren). Los elementos se reparten en un pool de procesos y los PNG
+se escriben en el ZIP a medida que llegan, con nombres predecibles:
+
+    con_numero/128px/026_Fe.png
+    solo_simbolo/32px/001_H.png
+"""
+import argparse
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+# La tabla periódica y el perfil PNG se comparten con las demás aplicaciones desde la raíz del repositorio
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from renderizado import ESTILO_PREDETERMINADO, ESTILOS, crear_imagen_elemento
+from periodic_table import ELEMENTS, element_by_number
+from png_profile import encode_png
+
+TAMANOS_ICONOS = (32, 64, 128, 256, 512, 1024)
+
+# Variantes exportadas: mostrar número atómico -> carpeta del ZIP
+CARPETAS_VARIANTE = {
+    False: "solo_simbolo",
+    True: "con_numero",
+}
+
+
+def nombre_icono(simbolo, numero_atomico, tamano, mostrar_numero):
+    """
+    Retorna la ruta predecible del icono dentro del ZIP.
+
+    Args:
+        simbolo (str): Símbolo químico del elemento
+        numero_atomico (int): Número atómico del elemento
+        tamano (int): Lado del icono en píxeles
+        mostrar_numero (bool): Si el icono muestra el número atómico
+
+    Returns:
+        str: Ruta del archivo PNG, p. ej. "con_numero/128px/026_Fe.png"
+    """
+    return f"{CARPETAS_VARIANTE[mostrar_numero]}/{tamano}px/{numero_atomico:03d}_{simbolo}.png"
+
+
+def reducir_sucesivamente(imagen, tamanos):
+    """
+    Obtiene varios tamaños de una imagen cuadrada reduciendo cada uno desde el anterior.
+
+    Las reducciones por un factor entero usan un promedio por bloques (`Image.reduce`), y el
+    resto un filtro Lanczos. Se trabaja con alfa premultiplicado para que el color del fondo
+    transparente no se mezcle con los bordes del texto.
+
+    Args:
+        imagen (PIL.Image): Imagen RGBA al tamaño mayor.
+        tamanos (iterable): Lados en píxeles, no mayores que el de la imagen.
+
+    Returns:
+        dict: Tamaño -> imagen RGBA.
+    """
+    actual = imagen.convert("RGBa")
+    resultado = {}
+    for tamano in sorted(set(tamanos), reverse=True):
+        if tamano != actual.width:
+            if actual.width % tamano == 0:
+                actual = actual.reduce(actual.width // tamano)
+            else:
+                actual = actual.resize((tamano, tamano), Image.LANCZOS)
+        resultado[tamano] = actual.convert("RGBA")
+    return resultado
+
+
+def renderizar_iconos(tarea):
+    """
+    Renderiza un símbolo una vez y lo codifica en todos los tamaños (función de trabajo del pool).
+
+    Args:
+        tarea (tuple): (símbolo, número atómico, mostrar número, tamaños, estilo).
+
+    Returns:
+        list: Pares (tamaño, bytes del PNG), de mayor a menor.
+    """
+    simbolo, numero_atomico, mostrar_numero, tamanos, estilo = tarea
+    imagen = crear_imagen_elemento(simbolo, numero_atomico, mostrar_numero, max(tamanos), estilo)
+    return [(tamano, encode_png(icono)) for tamano, icono in reducir_sucesivamente(imagen, tamanos).items()]
+
+
+def construir_zip_iconos(salida, numeros_atomicos=None, tamanos=TAMANOS_ICONOS, variantes=(False, True),
+                         estilo=ESTILO_PREDETERMINADO, max_workers=None, progreso=None):
+    """
+    Genera los iconos de varios elementos y los escribe en un ZIP a medida que se renderizan.
+
+    Args:
+        salida: Ruta o archivo binario donde escribir el ZIP.
+        numeros_atomicos (list): Números atómicos a exportar (por defecto, los 118).
+        tamanos (tuple): Lados de los iconos en píxeles.
+        variantes (tuple): Valores de "mostrar número" a exportar.
+        estilo (str): Clave de ESTILOS.
+        max_workers (int): Procesos del pool (por defecto, uno por núcleo).
+        progreso (callable): Función opcional llamada con (generados, total).
+
+    Returns:
+        int: Número de archivos PNG escritos.
+
+    Raises:
+        ValueError: Si el estilo, algún tamaño o algún número atómico no son válidos.
+    """
+    if estilo not in ESTILOS:
+        raise ValueError(f"Estilo desconocido: {estilo}")
+    if not tamanos or min(tamanos) < 1:
+        raise ValueError("Los tamaños deben ser enteros positivos")
+    if numeros_atomicos is not None:
+        invalidos = [numero for numero in numeros_atomicos if not 1 <= numero <= len(ELEMENTS)]
+        if invalidos:
+            raise ValueError(f"Número atómico fuera de rango (1-{len(ELEMENTS)}): {invalidos[0]}")
+    elementos = ELEMENTS if numeros_atomicos is None else [element_by_number(numero) for numero in numeros_atomicos]
+    tamanos = tuple(sorted(set(int(tamano) for tamano in tamanos), reverse=True))
+    tareas = [
+        (simbolo, numero, mostrar_numero, tamanos, estilo)
+        for simbolo, _, numero in elementos
+        for mostrar_numero in variantes
+    ]
+
+    escritos = 0
+    with zipfile.ZipFile(salida, "w") as zip_file, ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chunksize = max(1, len(tareas) // (4 * (max_workers or os.cpu_count() or 1)))
+        # Los PNG ya están comprimidos: se guardan sin volver a comprimir
+        for indice, iconos in enumerate(executor.map(renderizar_iconos, tareas, chunksize=chunksize)):
+            simbolo, numero, mostrar_numero, _, _ = tareas[indice]
+            for tamano, png_bytes in iconos:
+                zip_file.writestr(nombre_icono(simbolo, numero, tamano, mostrar_numero), png_bytes,
+                                  compress_type=zipfile.ZIP_STORED)
+                escritos += 1
+            if progreso:
+                progreso(indice + 1, len(tareas))
+    return escritos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta los símbolos químicos como iconos PNG en varios tamaños.")
+    parser.add_argument("salida", help="Archivo ZIP de salida")
+    parser.add_argument("--elementos", type=int, nargs="*", help="Números atómicos (por defecto, los 118)")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS_ICONOS), help="Lados en píxeles")
+    parser.add_argument("--estilo", choices=sorted(ESTILOS), default=ESTILO_PREDETERMINADO)
+    args = parser.parse_args()
+
+    try:
+        escritos = construir_zip_iconos(args.salida, args.elementos or None, args.tamanos, estilo=args.estilo)
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"{args.salida}: {escritos} iconos")
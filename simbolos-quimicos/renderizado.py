@@ -0,0 +1,275 @@
+"""
+Renderizado y caché de las imágenes de símbolos químicos.
+
+La disposición de cada símbolo (tamaños de fuente y posiciones, centrado con `textbbox`)
+se calcula una sola vez en unidades del lado de la imagen, así que se puede renderizar a
+cualquier tamaño en píxeles o resolución de impresión. El suavizado sale de dibujar los
+glifos con supermuestreo y reducirlos por bloques; las últimas máscaras se guardan por
+tamaño (TAMANO_CACHE_MASCARAS), de modo que cambiar de estilo solo cambia la composición.
+
+Cada imagen se guarda ya codificada como PNG compacto (`png_profile`) en una caché LRU
+compartida por todas las sesiones, con la clave (símbolo, número atómico, mostrar número,
+tamaño, estilo, dpi) y junto a su informe de ahorro. La caché se puede precalentar con los 118 elementos al arrancar para
+servir la vista previa y la descarga sin renderizar.
+"""
+import os
+import sys
+import threading
+from functools import lru_cache
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+# La tabla periódica se comparte con las demás aplicaciones desde la raíz del repositorio
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from periodic_table import ELEMENTS
+from png_profile import encode_png_with_report
+
+# Versión del renderizado (imágenes y exportaciones vectoriales): cambiarla invalida las URL
+# versionadas del servicio de imágenes
+VERSION_RENDERIZADO = 1
+
+TAMANO_PREDETERMINADO = 400  # Lado de la imagen en píxeles (las medidas de diseño son para este tamaño)
+TAMANO_CACHE = 2048
+# Las máscaras ocupan hasta LADO_MAXIMO_SUPERMUESTREO² bytes (4 MiB) y el tamaño lo elige el
+# usuario: se guardan solo las últimas (como mucho 64 MiB); las imágenes ya están en la caché de PNG
+TAMANO_CACHE_MASCARAS = 16
+
+# Supermuestreo del suavizado: los glifos se dibujan a este factor y se reducen por bloques,
+# sin que el lienzo supere LADO_MAXIMO_SUPERMUESTREO (a partir de ahí el factor baja)
+FACTOR_SUPERMUESTREO = 4
+LADO_MAXIMO_SUPERMUESTREO = 2048
+
+# Fuentes candidatas por orden de preferencia (si ninguna existe, la fuente por defecto)
+FUENTES_SIMBOLO = ("arial.ttf", "DejaVuSans-Bold.ttf")
+FUENTES_NUMERO = ("arial.ttf", "DejaVuSans.ttf")
+
+# Estilos: (color de fondo RGBA, color del texto)
+ESTILOS = {
+    "transparente": ((255, 255, 255, 0), "black"),
+    "fondo_blanco": ((255, 255, 255, 255), "black"),
+}
+ESTILO_PREDETERMINADO = "transparente"
+
+# Lienzo mínimo para medir textos con `textbbox` igual que al dibujar
+_DIBUJO_MEDIDAS = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+
+
+@lru_cache(maxsize=None)
+def cargar_fuente(candidatas, tamano):
+    """
+    Carga la primera fuente disponible de la lista, una sola vez por proceso y tamaño.
+
+    Args:
+        candidatas (tuple): Nombres de archivo de fuente por orden de preferencia.
+        tamano (int): Tamaño de la fuente en píxeles.
+
+    Returns:
+        ImageFont: Fuente TrueType encontrada o la fuente por defecto.
+    """
+    for archivo in candidatas:
+        try:
+            return ImageFont.truetype(archivo, tamano)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def disponer_textos(simbolo, numero_atomico=None, mostrar_numero=False, tamano=TAMANO_PREDETERMINADO):
+    """
+    Calcula la fuente y la posición de cada texto de la imagen (común al raster y al vectorial).
+
+    Args:
+        simbolo (str): Símbolo químico del elemento
+        numero_atomico (int): Número atómico del elemento
+        mostrar_numero (bool): Si mostrar o no el número atómico
+        tamano (int): Lado de la imagen en píxeles
+
+    Returns:
+        list: Tuplas (texto, fuente, (x, y)) en orden de dibujo, con la posición tal como la recibe `draw.text`
+    """
+    # Dimensiones de la imagen; las medidas del diseño se escalan desde 400 px
+    ancho, alto = tamano, tamano
+    escala = tamano / TAMANO_PREDETERMINADO
+
+    # Ajustar tamaño de fuente según longitud del símbolo para que ocupe casi toda la imagen
+    longitud_simbolo = len(simbolo)
+    if longitud_simbolo == 1:
+        tamano_fuente = 280  # Símbolos de una letra (H, C, N, etc.)
+    elif longitud_simbolo == 2:
+        tamano_fuente = 200  # Símbolos de dos letras (He, Li, etc.)
+    else:
+        tamano_fuente = 150  # Símbolos de tres letras (muy raros)
+
+    fuente_simbolo = cargar_fuente(FUENTES_SIMBOLO, round(tamano_fuente * escala))
+    fuente_numero = cargar_fuente(FUENTES_NUMERO, round(60 * escala))
+
+    # Obtener dimensiones del texto del símbolo usando textbbox
+    bbox_simbolo = _DIBUJO_MEDIDAS.textbbox((0, 0), simbolo, font=fuente_simbolo)
+    ancho_simbolo = bbox_simbolo[2] - bbox_simbolo[0]
+    alto_simbolo = bbox_simbolo[3] - bbox_simbolo[1]
+
+    # Centrar el símbolo compensando el offset del texto
+    x_simbolo = (ancho - ancho_simbolo) // 2 - bbox_simbolo[0]
+    y_simbolo = (alto - alto_simbolo) // 2 - bbox_simbolo[1]
+
+    textos = []
+    if mostrar_numero and numero_atomico:
+        # Número atómico en la esquina superior derecha con margen
+        margen = round(20 * escala)
+        numero_str = str(numero_atomico)
+        bbox_numero = _DIBUJO_MEDIDAS.textbbox((0, 0), numero_str, font=fuente_numero)
+        ancho_numero = bbox_numero[2] - bbox_numero[0]
+        textos.append((numero_str, fuente_numero, (ancho - ancho_numero - margen, margen)))
+
+    textos.append((simbolo, fuente_simbolo, (x_simbolo, y_simbolo)))
+    return textos
+
+
+@lru_cache(maxsize=1024)
+def disposicion_normalizada(simbolo, numero_atomico=None, mostrar_numero=False):
+    """
+    Calcula una sola vez la disposición del diseño en unidades del lado de la imagen (de 0 a 1).
+
+    Returns:
+        tuple: Tuplas (texto, fuente del diseño, tamaño de fuente, x, y) en orden de dibujo
+    """
+    return tuple(
+        (texto, fuente, fuente.size / TAMANO_PREDETERMINADO, x / TAMANO_PREDETERMINADO, y / TAMANO_PREDETERMINADO)
+        for texto, fuente, (x, y) in disponer_textos(simbolo, numero_atomico, mostrar_numero)
+    )
+
+
+@lru_cache(maxsize=None)
+def _fuente_escalada(fuente, tamano):
+    return fuente.font_variant(size=tamano)
+
+
+def pixeles_para_impresion(tamano_mm, dpi):
+    """Retorna el lado en píxeles de una imagen de `tamano_mm` milímetros impresa a `dpi`."""
+    return max(1, round(tamano_mm / 25.4 * dpi))
+
+
+def factor_supermuestreo(tamano):
+    """Factor de supermuestreo para un lado: el máximo sin pasar de LADO_MAXIMO_SUPERMUESTREO."""
+    return max(1, min(FACTOR_SUPERMUESTREO, LADO_MAXIMO_SUPERMUESTREO // tamano))
+
+
+@lru_cache(maxsize=TAMANO_CACHE_MASCARAS)
+def mascara_elemento(simbolo, numero_atomico=None, mostrar_numero=False, tamano=TAMANO_PREDETERMINADO):
+    """
+    Rasteriza los textos del símbolo como máscara de cobertura (en caché las más recientes).
+
+    Los glifos se dibujan a `factor_supermuestreo(tamano)` veces el tamaño y se reducen con
+    un promedio por bloques, que da el suavizado de los bordes.
+
+    Returns:
+        PIL.Image: Máscara en modo L (255 = texto); no se debe modificar, está en caché
+    """
+    supermuestreo = factor_supermuestreo(tamano)
+    lado = tamano * supermuestreo
+    mascara = Image.new('L', (lado, lado), 0)
+    draw = ImageDraw.Draw(mascara)
+    for texto, fuente, tamano_fuente, x, y in disposicion_normalizada(simbolo, numero_atomico, mostrar_numero):
+        fuente_lado = _fuente_escalada(fuente, max(1, round(tamano_fuente * lado)))
+        draw.text((x * lado, y * lado), texto, fill=255, font=fuente_lado)
+    return mascara.reduce(supermuestreo) if supermuestreo > 1 else mascara
+
+
+def crear_imagen_elemento(simbolo, numero_atomico=None, mostrar_numero=False,
+                          tamano=TAMANO_PREDETERMINADO, estilo=ESTILO_PREDETERMINADO, dpi=None):
+    """
+    Crea una imagen PNG del símbolo del elemento químico.
+
+    Args:
+        simbolo (str): Símbolo químico del elemento
+        numero_atomico (int): Número atómico del elemento
+        mostrar_numero (bool): Si mostrar o no el número atómico
+        tamano (int): Lado de la imagen en píxeles (ver `pixeles_para_impresion`)
+        estilo (str): Clave de ESTILOS
+        dpi (int): Resolución a registrar en la imagen (opcional)
+
+    Returns:
+        PIL.Image: Imagen generada
+    """
+    color_fondo, color_texto = ESTILOS[estilo]
+    texto = Image.new('RGBA', (tamano, tamano), ImageColor.getrgb(color_texto))
+    texto.putalpha(mascara_elemento(simbolo, numero_atomico, mostrar_numero, tamano))
+    imagen = Image.alpha_composite(Image.new('RGBA', (tamano, tamano), color_fondo), texto)
+    if dpi:
+        imagen.info['dpi'] = (dpi, dpi)
+    return imagen
+
+
+@lru_cache(maxsize=TAMANO_CACHE)
+def _png_en_cache(simbolo, numero_atomico, mostrar_numero, tamano, estilo, dpi):
+    # Bytes e informe del PNG compacto, para que `informe_png` no vuelva a renderizar
+    imagen = crear_imagen_elemento(simbolo, numero_atomico, mostrar_numero, tamano, estilo)
+    return encode_png_with_report(imagen, dpi=dpi)
+
+
+def _entrada_en_cache(simbolo, numero_atomico, mostrar_numero, tamano, estilo, dpi):
+    # Sin número visible, el número atómico no cambia la imagen
+    if not (mostrar_numero and numero_atomico):
+        numero_atomico, mostrar_numero = None, False
+    return _png_en_cache(simbolo, numero_atomico, mostrar_numero, int(tamano), estilo, dpi or None)
+
+
+def obtener_png(simbolo, numero_atomico=None, mostrar_numero=False,
+                tamano=TAMANO_PREDETERMINADO, estilo=ESTILO_PREDETERMINADO, dpi=None):
+    """
+    Retorna la imagen del símbolo codificada como PNG, renderizándola solo la primera vez.
+
+    Args:
+        simbolo (str): Símbolo químico del elemento
+        numero_atomico (int): Número atómico del elemento
+        mostrar_numero (bool): Si mostrar o no el número atómico
+        tamano (int): Lado de la imagen en píxeles
+        estilo (str): Clave de ESTILOS
+        dpi (int): Resolución a incrustar en el PNG (opcional)
+
+    Returns:
+        bytes: PNG de la imagen
+    """
+    return _entrada_en_cache(simbolo, numero_atomico, mostrar_numero, tamano, estilo, dpi)[0]
+
+
+def informe_png(simbolo, numero_atomico=None, mostrar_numero=False,
+                tamano=TAMANO_PREDETERMINADO, estilo=ESTILO_PREDETERMINADO, dpi=None):
+    """
+    Retorna el ahorro del PNG compacto de la imagen frente al PNG RGBA sin optimizar.
+
+    Sale de la misma entrada de caché que `obtener_png` con los mismos argumentos, así que
+    no vuelve a renderizar la imagen.
+
+    Returns:
+        PngReport: Modo elegido, tamaño compacto y tamaño del PNG sin optimizar
+    """
+    return _entrada_en_cache(simbolo, numero_atomico, mostrar_numero, tamano, estilo, dpi)[1]
+
+
+def precalentar_cache(tamano=TAMANO_PREDETERMINADO, estilos=(ESTILO_PREDETERMINADO,)):
+    """
+    Renderiza los 118 elementos con y sin número atómico para que queden en la caché.
+
+    Args:
+        tamano (int): Lado de las imágenes en píxeles
+        estilos (tuple): Estilos a precalentar
+
+    Returns:
+        int: Número de imágenes en la caché tras precalentar
+    """
+    for estilo in estilos:
+        for simbolo, _, numero in ELEMENTS:
+            obtener_png(simbolo, None, False, tamano, estilo)
+            obtener_png(simbolo, numero, True, tamano, estilo)
+    return _png_en_cache.cache_info().currsize
+
+
+def iniciar_precalentamiento():
+    """Lanza `precalentar_cache` en un hilo de fondo y lo retorna."""
+    hilo = threading.Thread(target=precalentar_cache, name="precalentar-simbolos", daemon=True)
+    hilo.start()
+    return hilo
@@ -0,0 +1,97 @@
+"""
+Pruebas del lector de contornos TrueType y de la exportación vectorial de los símbolos.
+
+Los contornos leídos de la tabla `glyf` deben ocupar el mismo recuadro que la máscara que
+rasteriza Pillow con la misma fuente, los glifos compuestos deben resolverse a sus
+componentes y, sin una fuente TrueType, la exportación debe declararse no disponible.
+
+Uso:
+    python -m pytest test_vectorial.py
+"""
+import xml.etree.ElementTree as ET
+
+import pytest
+from PIL import ImageFont
+
+import renderizado
+from renderizado import FUENTES_SIMBOLO, cargar_fuente, mascara_elemento
+from vectorial import (
+    FuenteTrueType, exportar_vectorial, fuente_truetype, geometria_simbolo, vectorial_disponible,
+)
+
+# Casos (símbolo, número atómico, mostrar número): una, dos y tres letras, con y sin número
+CASOS = [("H", None, False), ("Fe", 26, True), ("Og", 118, True), ("Uue", None, False), ("W", 74, True)]
+
+# Diferencia máxima, en píxeles del diseño de 400 px, entre el recuadro vectorial y el raster
+TOLERANCIA_PX = 1.5
+
+requiere_truetype = pytest.mark.skipif(
+    not vectorial_disponible(), reason="No hay ninguna fuente TrueType candidata instalada"
+)
+
+
+def recuadro_contornos(contornos):
+    puntos = []
+    for inicio, segmentos in contornos:
+        puntos.append(inicio)
+        for segmento in segmentos:
+            puntos.extend(segmento[1:])
+    xs = [x for x, _ in puntos]
+    ys = [y for _, y in puntos]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+@requiere_truetype
+@pytest.mark.parametrize("simbolo, numero_atomico, mostrar_numero", CASOS)
+def test_contornos_coinciden_con_el_raster(simbolo, numero_atomico, mostrar_numero):
+    mascara = mascara_elemento(simbolo, numero_atomico, mostrar_numero, renderizado.TAMANO_PREDETERMINADO)
+    esperado = mascara.point(lambda cobertura: 255 if cobertura > 127 else 0).getbbox()
+    obtenido = recuadro_contornos(geometria_simbolo(simbolo, numero_atomico, mostrar_numero))
+    assert all(abs(a - b) <= TOLERANCIA_PX for a, b in zip(obtenido, esperado)), (obtenido, esperado)
+
+
+@requiere_truetype
+def test_contornos_cerrados_y_con_cmap():
+    lector = fuente_truetype(cargar_fuente(FUENTES_SIMBOLO, 100))
+    for caracter in "HOgUue0123456789":
+        glifo = lector.cmap.get(ord(caracter), 0)
+        assert glifo != 0, caracter
+        contornos = lector.contornos(glifo)
+        assert contornos and all(len(contorno) >= 3 for contorno in contornos), caracter
+
+
+@requiere_truetype
+def test_glifo_compuesto_incluye_sus_componentes():
+    lector = fuente_truetype(cargar_fuente(FUENTES_SIMBOLO, 100))
+    base = lector.contornos(lector.cmap[ord("E")])
+    acentuado = lector.contornos(lector.cmap[ord("É")])
+    # La É tiene los contornos de la E más los del acento, que queda por encima de la letra
+    assert len(acentuado) > len(base)
+    alto_base = max(y for contorno in base for _, y, _ in contorno)
+    acento = [contorno for contorno in acentuado if contorno not in base]
+    assert acento and all(min(y for _, y, _ in contorno) > alto_base for contorno in acento)
+
+
+@requiere_truetype
+def test_exportaciones_bien_formadas():
+    svg = exportar_vectorial("svg", "Fe", 26, True)
+    raiz = ET.fromstring(svg)
+    assert raiz.tag.endswith("svg") and any(elemento.tag.endswith("path") for elemento in raiz.iter())
+    pdf = exportar_vectorial("pdf", "Fe", 26, True)
+    assert pdf.startswith(b"%PDF") and pdf.rstrip().endswith(b"%%EOF")
+    with pytest.raises(ValueError):
+        exportar_vectorial("eps", "Fe")
+
+
+def test_fuente_sin_tabla_glyf():
+    with pytest.raises(ValueError):
+        FuenteTrueType(b"\x00\x01\x00\x00" + b"\x00" * 8)
+
+
+def test_fuente_por_defecto_no_es_vectorizable(monkeypatch):
+    with pytest.raises(ValueError):
+        fuente_truetype(ImageFont.load_default())
+    # Sin ninguna fuente candidata, disponer_textos cae en la fuente por defecto de Pillow
+    monkeypatch.setattr(renderizado, "FUENTES_SIMBOLO", ("no-existe.ttf",))
+    monkeypatch.setattr(renderizado, "FUENTES_NUMERO", ("no-existe.ttf",))
+    assert vectorial_disponible.__wrapped__() is False
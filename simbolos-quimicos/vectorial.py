@@ -0,0 +1,439 @@
+"""
+Exportación vectorial (SVG y PDF) de los símbolos químicos.
+
+Los textos se convierten en contornos leídos directamente de la tabla `glyf` de la misma
+fuente TrueType que usa el raster, así que el archivo no depende de las fuentes instaladas
+y se escala sin pérdida a cualquier tamaño. La disposición es la de `disponer_textos`
+(centrado con los offsets de `textbbox`) y el avance de cada glifo el que calcula Pillow,
+de modo que el vectorial coincide con la imagen PNG.
+
+Los contornos de cada glifo se leen una sola vez por proceso: exportar los 118 símbolos
+cuesta unos milisegundos por elemento y cada archivo ocupa pocos KB.
+"""
+import io
+import struct
+import zlib
+from functools import lru_cache
+
+from renderizado import ESTILO_PREDETERMINADO, ESTILOS, TAMANO_PREDETERMINADO, disponer_textos
+
+FORMATOS_VECTORIALES = ("svg", "pdf")
+
+# Decimales de las coordenadas (en píxeles del diseño de 400 px)
+DECIMALES = 2
+
+# Colores de ESTILOS en notación hexadecimal y RGB de 0 a 1
+COLORES = {
+    "black": ("#000000", (0, 0, 0)),
+    "white": ("#ffffff", (1, 1, 1)),
+}
+
+# Banderas de la tabla glyf
+_ON_CURVE = 0x01
+_X_SHORT = 0x02
+_Y_SHORT = 0x04
+_REPEAT = 0x08
+_X_SAME = 0x10
+_Y_SAME = 0x20
+_ARG_WORDS = 0x0001
+_ARGS_XY = 0x0002
+_SCALE = 0x0008
+_MORE_COMPONENTS = 0x0020
+_XY_SCALE = 0x0040
+_TWO_BY_TWO = 0x0080
+
+
+class FuenteTrueType:
+    """Lector mínimo de contornos de una fuente TrueType (tablas cmap, head, loca y glyf)."""
+
+    def __init__(self, datos):
+        self.datos = datos
+        inicio = 0
+        if datos[:4] == b"ttcf":
+            # Colección de fuentes: se usa la primera, como Pillow con index=0
+            inicio = struct.unpack_from(">I", datos, 12)[0]
+        num_tablas = struct.unpack_from(">H", datos, inicio + 4)[0]
+        self.tablas = {}
+        for indice in range(num_tablas):
+            etiqueta, _, desplazamiento, longitud = struct.unpack_from(">4sIII", datos, inicio + 12 + 16 * indice)
+            self.tablas[etiqueta.decode("latin-1")] = (desplazamiento, longitud)
+        if "glyf" not in self.tablas:
+            raise ValueError("La fuente no tiene contornos TrueType (tabla glyf)")
+
+        head = self.tablas["head"][0]
+        self.unidades_por_em = struct.unpack_from(">H", datos, head + 18)[0]
+        formato_loca = struct.unpack_from(">h", datos, head + 50)[0]
+        num_glifos = struct.unpack_from(">H", datos, self.tablas["maxp"][0] + 4)[0]
+        loca = self.tablas["loca"][0]
+        if formato_loca == 0:
+            self.loca = [2 * valor for valor in struct.unpack_from(f">{num_glifos + 1}H", datos, loca)]
+        else:
+            self.loca = list(struct.unpack_from(f">{num_glifos + 1}I", datos, loca))
+        self.cmap = self._leer_cmap()
+
+    def _leer_cmap(self):
+        """Lee la subtabla Unicode de la cmap (formato 4 o 12) como {código: glifo}."""
+        cmap = self.tablas["cmap"][0]
+        num_subtablas = struct.unpack_from(">H", self.datos, cmap + 2)[0]
+        subtablas = {}
+        for indice in range(num_subtablas):
+            plataforma, codificacion, desplazamiento = struct.unpack_from(">HHI", self.datos, cmap + 4 + 8 * indice)
+            subtablas[(plataforma, codificacion)] = cmap + desplazamiento
+        for clave in ((3, 10), (0, 4), (3, 1), (0, 3)):
+            if clave in subtablas:
+                inicio = subtablas[clave]
+                formato = struct.unpack_from(">H", self.datos, inicio)[0]
+                if formato == 4:
+                    return self._cmap_formato_4(inicio)
+                if formato == 12:
+                    return self._cmap_formato_12(inicio)
+        raise ValueError("La fuente no tiene una tabla cmap Unicode compatible")
+
+    def _cmap_formato_4(self, inicio):
+        segmentos = struct.unpack_from(">H", self.datos, inicio + 6)[0] // 2
+        finales = struct.unpack_from(f">{segmentos}H", self.datos, inicio + 14)
+        iniciales = struct.unpack_from(f">{segmentos}H", self.datos, inicio + 16 + 2 * segmentos)
+        deltas = struct.unpack_from(f">{segmentos}h", self.datos, inicio + 16 + 4 * segmentos)
+        rangos = inicio + 16 + 6 * segmentos
+        desplazamientos = struct.unpack_from(f">{segmentos}H", self.datos, rangos)
+        cmap = {}
+        for segmento in range(segmentos):
+            for codigo in range(iniciales[segmento], finales[segmento] + 1):
+                if codigo == 0xFFFF:
+                    continue
+                if desplazamientos[segmento] == 0:
+                    glifo = (codigo + deltas[segmento]) & 0xFFFF
+                else:
+                    posicion = (rangos + 2 * segmento + desplazamientos[segmento]
+                                + 2 * (codigo - iniciales[segmento]))
+                    glifo = struct.unpack_from(">H", self.datos, posicion)[0]
+                    if glifo:
+                        glifo = (glifo + deltas[segmento]) & 0xFFFF
+                cmap[codigo] = glifo
+        return cmap
+
+    def _cmap_formato_12(self, inicio):
+        grupos = struct.unpack_from(">I", self.datos, inicio + 12)[0]
+        cmap = {}
+        for grupo in range(grupos):
+            primero, ultimo, glifo = struct.unpack_from(">III", self.datos, inicio + 16 + 12 * grupo)
+            for desplazamiento in range(ultimo - primero + 1):
+                cmap[primero + desplazamiento] = glifo + desplazamiento
+        return cmap
+
+    def contornos(self, glifo):
+        """
+        Retorna los contornos de un glifo en unidades de la fuente (y hacia arriba).
+
+        Returns:
+            list: Contornos, cada uno una lista de puntos (x, y, sobre la curva).
+        """
+        inicio, fin = self.loca[glifo], self.loca[glifo + 1]
+        if inicio == fin:
+            return []
+        base = self.tablas["glyf"][0] + inicio
+        num_contornos = struct.unpack_from(">h", self.datos, base)[0]
+        if num_contornos < 0:
+            return self._contornos_compuestos(base + 10)
+
+        finales = struct.unpack_from(f">{num_contornos}H", self.datos, base + 10)
+        num_puntos = finales[-1] + 1 if num_contornos else 0
+        posicion = base + 10 + 2 * num_contornos
+        longitud_instrucciones = struct.unpack_from(">H", self.datos, posicion)[0]
+        posicion += 2 + longitud_instrucciones
+
+        banderas = []
+        while len(banderas) < num_puntos:
+            bandera = self.datos[posicion]
+            posicion += 1
+            banderas.append(bandera)
+            if bandera & _REPEAT:
+                banderas.extend([bandera] * self.datos[posicion])
+                posicion += 1
+
+        coordenadas = []
+        for corta, igual in ((_X_SHORT, _X_SAME), (_Y_SHORT, _Y_SAME)):
+            valor, valores = 0, []
+            for bandera in banderas[:num_puntos]:
+                if bandera & corta:
+                    delta = self.datos[posicion]
+                    posicion += 1
+                    valor += delta if bandera & igual else -delta
+                elif not bandera & igual:
+                    valor += struct.unpack_from(">h", self.datos, posicion)[0]
+                    posicion += 2
+                valores.append(valor)
+            coordenadas.append(valores)
+
+        puntos = [(x, y, bool(bandera & _ON_CURVE)) for x, y, bandera in zip(*coordenadas, banderas)]
+        contornos, anterior = [], 0
+        for final in finales:
+            contornos.append(puntos[anterior:final + 1])
+            anterior = final + 1
+        return contornos
+
+    def _contornos_compuestos(self, posicion):
+        """Combina los componentes de un glifo compuesto (desplazados y escalados)."""
+        contornos = []
+        while True:
+            banderas, glifo = struct.unpack_from(">HH", self.datos, posicion)
+            posicion += 4
+            if banderas & _ARG_WORDS:
+                dx, dy = struct.unpack_from(">hh", self.datos, posicion)
+                posicion += 4
+            else:
+                dx, dy = struct.unpack_from(">bb", self.datos, posicion)
+                posicion += 2
+            if not banderas & _ARGS_XY:
+                dx = dy = 0  # Alineación por puntos: poco habitual en letras y cifras
+            a, b, c, d = 1.0, 0.0, 0.0, 1.0
+            if banderas & _SCALE:
+                a = d = struct.unpack_from(">h", self.datos, posicion)[0] / 16384
+                posicion += 2
+            elif banderas & _XY_SCALE:
+                a, d = (valor / 16384 for valor in struct.unpack_from(">hh", self.datos, posicion))
+                posicion += 4
+            elif banderas & _TWO_BY_TWO:
+                a, b, c, d = (valor / 16384 for valor in struct.unpack_from(">hhhh", self.datos, posicion))
+                posicion += 8
+            for contorno in self.contornos(glifo):
+                contornos.append([(a * x + c * y + dx, b * x + d * y + dy, sobre) for x, y, sobre in contorno])
+            if not banderas & _MORE_COMPONENTS:
+                return contornos
+
+
+@lru_cache(maxsize=None)
+def _fuente_truetype(ruta):
+    with open(ruta, "rb") as archivo:
+        return FuenteTrueType(archivo.read())
+
+
+def fuente_truetype(fuente):
+    """Retorna el lector de contornos de una fuente de Pillow (uno por archivo y proceso)."""
+    ruta = getattr(fuente, "path", None)
+    if not isinstance(ruta, str):
+        raise ValueError("La fuente no tiene un archivo TrueType del que leer los contornos")
+    return _fuente_truetype(ruta)
+
+
+@lru_cache(maxsize=1)
+def vectorial_disponible():
+    """
+    Indica si las fuentes del diseño tienen contornos TrueType de los que exportar.
+
+    Si no se encuentra ninguna fuente candidata, Pillow usa su fuente por defecto, que no
+    tiene archivo ni tabla glyf; la aplicación oculta entonces las descargas vectoriales.
+
+    Returns:
+        bool: True si la exportación SVG y PDF es posible.
+    """
+    try:
+        for _, fuente, _ in disponer_textos("H", 1, True):
+            fuente_truetype(fuente)
+    except (ValueError, OSError):
+        return False
+    return True
+
+
+def _formatear(valor):
+    texto = f"{valor:.{DECIMALES}f}".rstrip("0").rstrip(".")
+    return "0" if texto == "-0" else texto
+
+
+def _segmentos_contorno(contorno):
+    """
+    Convierte los puntos de un contorno TrueType en segmentos rectos y cuadráticos.
+
+    Returns:
+        tuple: (punto inicial, lista de ("L", p) o ("Q", control, p)).
+    """
+    # Entre dos puntos de control consecutivos hay un punto implícito sobre la curva
+    puntos = []
+    for indice, (x, y, sobre) in enumerate(contorno):
+        siguiente_x, siguiente_y, siguiente_sobre = contorno[(indice + 1) % len(contorno)]
+        puntos.append(((x, y), sobre))
+        if not sobre and not siguiente_sobre:
+            puntos.append((((x + siguiente_x) / 2, (y + siguiente_y) / 2), True))
+
+    primero = next(indice for indice, (_, sobre) in enumerate(puntos) if sobre)
+    puntos = puntos[primero:] + puntos[:primero]
+    inicio = puntos[0][0]
+    segmentos, control = [], None
+    for punto, sobre in puntos[1:] + puntos[:1]:
+        if not sobre:
+            control = punto
+        elif control is not None:
+            segmentos.append(("Q", control, punto))
+            control = None
+        else:
+            segmentos.append(("L", punto))
+    return inicio, segmentos
+
+
+@lru_cache(maxsize=1024)
+def geometria_simbolo(simbolo, numero_atomico=None, mostrar_numero=False):
+    """
+    Calcula los contornos de la imagen del símbolo en píxeles del diseño de 400 px (y hacia abajo).
+
+    Args:
+        simbolo (str): Símbolo químico del elemento
+        numero_atomico (int): Número atómico del elemento
+        mostrar_numero (bool): Si mostrar o no el número atómico
+
+    Returns:
+        tuple: Contornos, cada uno (punto inicial, segmentos) como en `_segmentos_contorno`.
+    """
+    contornos = []
+    for texto, fuente, (x, y) in disponer_textos(simbolo, numero_atomico, mostrar_numero):
+        lector = fuente_truetype(fuente)
+        escala = fuente.size / lector.unidades_por_em
+        # draw.text coloca la línea de ascendentes en y: la línea base queda un ascendente más abajo
+        linea_base = y + fuente.getmetrics()[0]
+        for indice, caracter in enumerate(texto):
+            origen = x + fuente.getlength(texto[:indice])
+            for contorno in lector.contornos(lector.cmap.get(ord(caracter), 0)):
+                if len(contorno) < 2:
+                    continue
+                transformado = [(origen + px * escala, linea_base - py * escala, sobre) for px, py, sobre in contorno]
+                contornos.append(_segmentos_contorno(transformado))
+    return tuple(contornos)
+
+
+def _ruta_svg(contornos):
+    partes = []
+    for (x, y), segmentos in contornos:
+        partes.append(f"M{_formatear(x)} {_formatear(y)}")
+        for segmento in segmentos:
+            if segmento[0] == "Q":
+                (cx, cy), (px, py) = segmento[1:]
+                partes.append(f"Q{_formatear(cx)} {_formatear(cy)} {_formatear(px)} {_formatear(py)}")
+            else:
+                px, py = segmento[1]
+                partes.append(f"L{_formatear(px)} {_formatear(py)}")
+        partes.append("Z")
+    return "".join(partes)
+
+
+def _operadores_pdf(contornos):
+    """Operadores de trazado PDF; las cuadráticas se elevan a cúbicas (PDF no tiene cuadráticas)."""
+    lineas = []
+    for (x, y), segmentos in contornos:
+        lineas.append(f"{_formatear(x)} {_formatear(y)} m")
+        actual = (x, y)
+        for segmento in segmentos:
+            if segmento[0] == "Q":
+                (cx, cy), (px, py) = segmento[1:]
+                c1 = (actual[0] + 2 / 3 * (cx - actual[0]), actual[1] + 2 / 3 * (cy - actual[1]))
+                c2 = (px + 2 / 3 * (cx - px), py + 2 / 3 * (cy - py))
+                lineas.append(" ".join(_formatear(valor) for valor in (*c1, *c2, px, py)) + " c")
+            else:
+                px, py = segmento[1]
+                lineas.append(f"{_formatear(px)} {_formatear(py)} l")
+            actual = (px, py)
+        lineas.append("h")
+    return "\n".join(lineas)
+
+
+def simbolo_a_svg(simbolo, numero_atomico=None, mostrar_numero=False, estilo=ESTILO_PREDETERMINADO,
+                  tamano_mm=100.0):
+    """
+    Genera el SVG del símbolo con los textos como contornos.
+
+    Args:
+        simbolo (str): Símbolo químico del elemento
+        numero_atomico (int): Número atómico del elemento
+        mostrar_numero (bool): Si mostrar o no el número atómico
+        estilo (str): Clave de ESTILOS
+        tamano_mm (float): Lado de la imagen en milímetros
+
+    Returns:
+        bytes: Documento SVG
+    """
+    color_fondo, color_texto = ESTILOS[estilo]
+    lado = _formatear(tamano_mm)
+    partes = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{lado}mm" height="{lado}mm" '
+        f'viewBox="0 0 {TAMANO_PREDETERMINADO} {TAMANO_PREDETERMINADO}">\n',
+    ]
+    if color_fondo[3]:
+        partes.append(f'<rect width="100%" height="100%" fill="#{bytes(color_fondo[:3]).hex()}"/>\n')
+    partes.append(f'<path fill="{COLORES[color_texto][0]}" d="{_ruta_svg(geometria_simbolo(simbolo, numero_atomico, mostrar_numero))}"/>\n')
+    partes.append('</svg>\n')
+    return "".join(partes).encode("utf-8")
+
+
+def simbolo_a_pdf(simbolo, numero_atomico=None, mostrar_numero=False, estilo=ESTILO_PREDETERMINADO,
+                  tamano_mm=100.0):
+    """
+    Genera un PDF de una página con el símbolo como contornos.
+
+    Args:
+        simbolo (str): Símbolo químico del elemento
+        numero_atomico (int): Número atómico del elemento
+        mostrar_numero (bool): Si mostrar o no el número atómico
+        estilo (str): Clave de ESTILOS
+        tamano_mm (float): Lado de la página en milímetros
+
+    Returns:
+        bytes: Documento PDF
+    """
+    color_fondo, color_texto = ESTILOS[estilo]
+    lado_pt = tamano_mm / 25.4 * 72
+    escala = lado_pt / TAMANO_PREDETERMINADO
+
+    # Las coordenadas del diseño tienen la y hacia abajo: se invierten con la matriz cm
+    contenido = []
+    if color_fondo[3]:
+        r, g, b = (_formatear(canal / 255) for canal in color_fondo[:3])
+        contenido.append(f"{r} {g} {b} rg 0 0 {_formatear(lado_pt)} {_formatear(lado_pt)} re f")
+    contenido.append(f"{' '.join(_formatear(canal) for canal in COLORES[color_texto][1])} rg")
+    contenido.append(f"{escala:.6f} 0 0 {-escala:.6f} 0 {_formatear(lado_pt)} cm")
+    contenido.append(_operadores_pdf(geometria_simbolo(simbolo, numero_atomico, mostrar_numero)))
+    contenido.append("f")
+    flujo = zlib.compress("\n".join(contenido).encode("latin-1"), 9)
+
+    lado = _formatear(lado_pt)
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {lado} {lado}] /Contents 4 0 R /Resources << >> >>".encode(),
+        f"<< /Length {len(flujo)} /Filter /FlateDecode >>\nstream\n".encode() + flujo + b"\nendstream",
+    ]
+    salida = io.BytesIO()
+    salida.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    posiciones = []
+    for numero, cuerpo in enumerate(objetos, start=1):
+        posiciones.append(salida.tell())
+        salida.write(f"{numero} 0 obj\n".encode() + cuerpo + b"\nendobj\n")
+    inicio_xref = salida.tell()
+    salida.write(f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n".encode())
+    for posicion in posiciones:
+        salida.write(f"{posicion:010d} 00000 n \n".encode())
+    salida.write(f"trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{inicio_xref}\n%%EOF\n".encode())
+    return salida.getvalue()
+
+
+def exportar_vectorial(formato, simbolo, numero_atomico=None, mostrar_numero=False,
+                       estilo=ESTILO_PREDETERMINADO, tamano_mm=100.0):
+    """
+    Exporta el símbolo en formato vectorial.
+
+    Args:
+        formato (str): "svg" o "pdf"
+        simbolo (str): Símbolo químico del elemento
+        numero_atomico (int): Número atómico del elemento
+        mostrar_numero (bool): Si mostrar o no el número atómico
+        estilo (str): Clave de ESTILOS
+        tamano_mm (float): Lado de la imagen en milímetros
+
+    Returns:
+        bytes: Archivo exportado
+    """
+    if not (mostrar_numero and numero_atomico):
+        numero_atomico, mostrar_numero = None, False
+    if formato == "svg":
+        return simbolo_a_svg(simbolo, numero_atomico, mostrar_numero, estilo, tamano_mm)
+    if formato == "pdf":
+        return simbolo_a_pdf(simbolo, numero_atomico, mostrar_numero, estilo, tamano_mm)
+    raise ValueError(f"Formato vectorial no soportado: {formato}")
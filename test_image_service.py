@@ -0,0 +1,117 @@
+"""
+Pruebas del servicio HTTP de imágenes: rutas, errores, versiones y ETag.
+
+Uso:
+    python -m pytest test_image_service.py
+"""
+import hashlib
+import threading
+from http import HTTPStatus
+from http.client import HTTPConnection
+from urllib.parse import parse_qs
+
+import pytest
+
+from image_service import (
+    CACHE_CONTROL, MARKER_GENERATOR_VERSION, VERSION_RENDERIZADO, RequestError, make_server, resolve,
+)
+
+
+def symbol(path, query=""):
+    return resolve(path, parse_qs(f"v={VERSION_RENDERIZADO}&{query}"))
+
+
+def marker(path, query=""):
+    return resolve(path, parse_qs(f"v={MARKER_GENERATOR_VERSION}&{query}"))
+
+
+def test_symbol_routes():
+    png = symbol("/symbol/Fe.png")
+    assert png.content_type == "image/png" and png.body.startswith(b"\x89PNG")
+    # Símbolo, número atómico y nombre (con tilde) resuelven al mismo elemento
+    assert symbol("/symbol/26.png") == png
+    assert symbol("/symbol/hierro.png") == png
+    assert symbol("/symbol/Hidrógeno.png") == symbol("/symbol/H.png")
+    assert symbol("/symbol/Fe.svg").content_type == "image/svg+xml"
+    assert symbol("/symbol/Fe.pdf").body.startswith(b"%PDF")
+
+
+def test_marker_routes():
+    for style in ("qr", "tradicional", "familia"):
+        response = marker(f"/marker/{style}/26.png")
+        assert response.content_type == "image/png" and response.body.startswith(b"\x89PNG"), style
+    assert marker("/marker/qr/Fe.png", "symbol=0") != marker("/marker/qr/Fe.png")
+
+
+@pytest.mark.parametrize("path", [
+    "/", "/symbol", "/symbol/Fe", "/symbol/Fe.gif", "/symbol/Xx.png", "/symbol/119.png",
+    "/marker/qr/Fe.svg", "/marker/otro/26.png", "/marker/qr/Xx.png", "/otra/Fe.png",
+])
+def test_unknown_paths_are_not_found(path):
+    query = parse_qs(f"v={MARKER_GENERATOR_VERSION if path.startswith('/marker') else VERSION_RENDERIZADO}")
+    with pytest.raises(RequestError) as error:
+        resolve(path, query)
+    assert error.value.status == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize("path, query", [
+    ("/symbol/Fe.png", "size=8"),
+    ("/symbol/Fe.png", "size=grande"),
+    ("/symbol/Fe.svg", "mm=0"),
+    ("/symbol/Fe.png", "number=quizas"),
+    ("/symbol/Fe.png", "style=rosa"),
+    ("/marker/tradicional/Fe.png", "symbol_size=9"),
+])
+def test_invalid_parameters_are_bad_requests(path, query):
+    with pytest.raises(RequestError) as error:
+        (marker if path.startswith("/marker") else symbol)(path, query)
+    assert error.value.status == HTTPStatus.BAD_REQUEST
+
+
+def test_version_is_required_and_checked():
+    for path, current in (("/symbol/Fe.png", VERSION_RENDERIZADO), ("/marker/qr/26.png", MARKER_GENERATOR_VERSION)):
+        with pytest.raises(RequestError) as error:
+            resolve(path, {})
+        assert error.value.status == HTTPStatus.BAD_REQUEST
+        with pytest.raises(RequestError) as error:
+            resolve(path, parse_qs(f"v={current - 1}"))
+        assert error.value.status == HTTPStatus.NOT_FOUND
+
+
+def test_etag_is_stable_and_follows_the_content():
+    png = symbol("/symbol/Fe.png", "size=256&number=1")
+    assert png.etag == '"' + hashlib.sha256(png.body).hexdigest()[:32] + '"'
+    assert symbol("/symbol/Fe.png", "number=1&size=256").etag == png.etag
+    assert symbol("/symbol/Fe.png", "size=256").etag != png.etag
+    # Los parámetros que no afectan al formato no cambian la respuesta
+    assert symbol("/symbol/Fe.svg", "size=256").etag == symbol("/symbol/Fe.svg").etag
+    assert marker("/marker/familia/26.png", "symbol_size=4").etag == marker("/marker/familia/26.png").etag
+    assert marker("/marker/tradicional/26.png", "symbol_size=4").etag != marker("/marker/tradicional/26.png").etag
+
+
+def test_http_responses():
+    server = make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = HTTPConnection(*server.server_address)
+        connection.request("GET", f"/symbol/Hidr%C3%B3geno.png?v={VERSION_RENDERIZADO}")
+        response = connection.getresponse()
+        body = response.read()
+        assert response.status == HTTPStatus.OK and body.startswith(b"\x89PNG")
+        assert response.getheader("Cache-Control") == CACHE_CONTROL
+        etag = response.getheader("ETag")
+
+        connection.request("GET", f"/symbol/H.png?v={VERSION_RENDERIZADO}", headers={"If-None-Match": etag})
+        response = connection.getresponse()
+        assert response.status == HTTPStatus.NOT_MODIFIED and response.read() == b""
+
+        connection.request("GET", "/symbol/H.png")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == HTTPStatus.BAD_REQUEST
+        assert response.getheader("Cache-Control") == "no-store"
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
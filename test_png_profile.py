@@ -0,0 +1,87 @@
+"""
+Pruebas del perfil PNG compacto: cada representación candidata debe conservar los píxeles.
+
+Uso:
+    python -m pytest test_png_profile.py
+"""
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from png_profile import SMALL_IMAGE_PIXELS, compact_candidates, encode_png, encode_png_with_report, png_report
+
+
+def rgba(image):
+    return np.asarray(image.convert("RGBA"))
+
+
+def make_image(kind, side=64, seed=0):
+    """Imagen de prueba de cada clase de contenido que distingue `compact_candidates`."""
+    rng = np.random.default_rng(seed)
+    shape = (side, side)
+    if kind == "bw":
+        return Image.fromarray(np.where(rng.random(shape) > 0.5, 255, 0).astype(np.uint8), "L")
+    if kind == "bw_rgba":
+        gray = np.where(rng.random(shape) > 0.5, 255, 0).astype(np.uint8)
+        return Image.fromarray(np.dstack([gray, gray, gray, np.full(shape, 255, np.uint8)]), "RGBA")
+    if kind == "gray":
+        return Image.fromarray(rng.integers(0, 256, shape, dtype=np.uint8), "L")
+    if kind == "gray_alpha_few":
+        gray = rng.choice([0, 128, 255], shape).astype(np.uint8)
+        return Image.fromarray(np.dstack([gray, rng.choice([0, 255], shape).astype(np.uint8)]), "LA")
+    if kind == "gray_alpha_many":
+        return Image.fromarray(rng.integers(0, 256, shape + (2,), dtype=np.uint8), "LA")
+    if kind == "palette_rgba":
+        colors = rng.integers(0, 256, (40, 4), dtype=np.uint8)
+        return Image.fromarray(colors[rng.integers(0, 40, shape)], "RGBA")
+    if kind == "rgb":
+        return Image.fromarray(rng.integers(0, 256, shape + (3,), dtype=np.uint8), "RGB")
+    if kind == "rgba":
+        return Image.fromarray(rng.integers(0, 256, shape + (4,), dtype=np.uint8), "RGBA")
+    if kind == "p_transparency":
+        image = Image.fromarray(rng.integers(0, 4, shape, dtype=np.uint8), "P")
+        image.putpalette([0, 0, 0, 255, 0, 0, 0, 255, 0, 0, 0, 255])
+        image.info["transparency"] = bytes([0, 255, 128, 255])
+        return image
+    raise ValueError(kind)
+
+
+KINDS = ["bw", "bw_rgba", "gray", "gray_alpha_few", "gray_alpha_many", "palette_rgba", "rgb", "rgba", "p_transparency"]
+
+
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.parametrize("side", [16, int(SMALL_IMAGE_PIXELS ** 0.5) + 8])
+def test_every_candidate_round_trips(kind, side):
+    image = make_image(kind, side)
+    expected = rgba(image)
+    candidates = compact_candidates(image)
+    assert candidates
+    for candidate in candidates:
+        assert np.array_equal(rgba(candidate), expected), (kind, candidate.mode)
+        decoded = Image.open(io.BytesIO(encode_png(candidate)))
+        assert np.array_equal(rgba(decoded), expected), (kind, candidate.mode)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_encode_png_round_trips(kind):
+    image = make_image(kind)
+    decoded = Image.open(io.BytesIO(encode_png(image)))
+    assert np.array_equal(rgba(decoded), rgba(image))
+
+
+@pytest.mark.parametrize("kind, mode", [
+    ("bw", "1"), ("bw_rgba", "1"), ("gray", "L"), ("gray_alpha_few", "P"), ("gray_alpha_many", "LA"),
+])
+def test_smallest_faithful_mode(kind, mode):
+    assert png_report(make_image(kind)).mode == mode
+
+
+def test_report_matches_encoded_bytes():
+    image = make_image("palette_rgba")
+    data, report = encode_png_with_report(image, dpi=300)
+    assert data == encode_png(image, dpi=300)
+    assert report == png_report(image, dpi=300) and report.size == len(data)
+    assert report.baseline_size > 0 and report.saved_bytes == report.baseline_size - report.size
+    assert Image.open(io.BytesIO(data)).info["dpi"] == pytest.approx((300, 300), abs=0.01)